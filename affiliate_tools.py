@@ -0,0 +1,250 @@
+# Affiliate Code ট্যাবের টেমপ্লেট রেজিস্ট্রি আর প্রোডাক্ট feed।
+# Streamlit ছাড়া (CLI / cron থেকেও) ব্যবহার করা যায়, তাই app.py র বাইরে আলাদা মডিউলে।
+import re
+import json
+import os
+import io
+import zipfile
+import time
+import functools
+import pandas as pd
+import numpy as np
+
+# [NEW] Affiliate Template Registry
+AFFILIATE_TEMPLATE_DIR = os.environ.get("AFFILIATE_TEMPLATE_DIR", "affiliate_templates")
+AFFILIATE_FIELDS = ("title", "link", "image", "rating", "description", "badge_text", "badge_color", "deal_color", "stars", "pros_list", "cons_list", "features_list")
+AFFILIATE_DISCLOSURE = '<div style="font-size: 11px; color: #888; margin-top: 15px; font-style: italic; text-align: right; clear: both;">As an Amazon Associate I earn from qualifying purchases.</div>'
+AFFILIATE_DEFAULTS = {
+    'title': 'Sample Product',
+    'link': '#',
+    'image': 'https://via.placeholder.com/150',
+    'rating': 4.5,
+    'description': 'Great product description here.',
+    'badge_text': 'Best Choice',
+    'badge_color': '#000000',
+    'pros': '',
+    'cons': ''
+}
+TEMPLATE_PLACEHOLDER_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+# বিল্ট-ইন ডিজাইন: {{field}} placeholder সহ HTML (ইউজারের টেমপ্লেট ফাইলও একই ফরম্যাটে)
+DETAILED_REVIEW_TEMPLATE = """<div style="margin-bottom: 25px;">    <a href="{{link}}" target="_blank" rel="nofollow sponsored"         style="text-decoration: none; color: inherit; display: block; border: 1px solid #ddd; border-radius: 10px; padding: 20px; background: #fff; box-shadow: 0 4px 12px rgba(0,0,0,0.08);">                <div style="display: flex; align-items: center; gap: 20px; border-bottom: 1px solid #eee; padding-bottom: 15px; margin-bottom: 15px;">            <img src="{{image}}" style="width: 80px; height: 80px; object-fit: contain; flex-shrink: 0;" alt="{{title}}">            <div style="flex: 1;">                <h4 style="margin: 0; color: #2c3e50; font-size: 18px;">{{title}}</h4>                {{stars}}                <p style="margin: 5px 0 0 0; font-size: 13px; color: #555;">{{description}}</p>            </div>            <div style="min-width: 140px; text-align: right;">                <span style="background: #e67e22; color: white; padding: 10px 20px; border-radius: 5px; font-size: 14px; font-weight: bold; display: inline-block;">Check Price &rarr;</span>            </div>        </div>                <div style="display: flex; flex-wrap: wrap; gap: 20px;">            <div style="flex: 1; min-width: 45%; padding: 10px; border-left: 3px solid #2ecc71; background: #f7fff7;">                <h5 style="margin: 0 0 5px 0; color: #27ae60; font-size: 15px;">PROS:</h5>                <ul style="list-style: none; padding: 0; margin: 0; font-size: 13px; color: #333;">{{pros_list}}</ul>            </div>            <div style="flex: 1; min-width: 45%; padding: 10px; border-left: 3px solid #e74c3c; background: #fff7f7;">                <h5 style="margin: 0 0 5px 0; color: #c0392b; font-size: 15px;">CONS:</h5>                <ul style="list-style: none; padding: 0; margin: 0; font-size: 13px; color: #333;">{{cons_list}}</ul>            </div>        </div>    </a></div>"""
+BENEFIT_BADGE_TEMPLATE = """<div style="margin-bottom: 25px;">    <a href="{{link}}" target="_blank" rel="nofollow sponsored"         style="text-decoration: none; color: inherit; display: block; position: relative; border: 2px solid {{badge_color}}; border-radius: 8px; padding: 20px; background: #fff; box-shadow: 0 4px 10px rgba(0,0,0,0.05);">        <div style="position: absolute; top: -12px; left: 20px; background: {{badge_color}}; color: white; padding: 2px 12px; font-size: 12px; font-weight: bold; border-radius: 4px; text-transform: uppercase;">            {{badge_text}}        </div>        <div style="display: flex; align-items: center; gap: 20px; flex-wrap: wrap;">            <img src="{{image}}" style="width: 80px; height: 80px; object-fit: contain; flex-shrink: 0;" alt="{{title}}">            <div style="flex: 1;">                <h4 style="margin: 0; color: #333;">{{title}}</h4>                {{stars}}                <p style="margin: 5px 0 0 0; font-size: 13px; color: #666;">{{description}}</p>            </div>            <div style="text-align: right; min-width: 120px;">                <span style="background: {{badge_color}}; color: white; padding: 10px 15px; border-radius: 4px; font-size: 13px; font-weight: bold; display: inline-block;">Check Price &rarr;</span>            </div>        </div>    </a></div>"""
+FEATURED_DEAL_TEMPLATE = """<div style="margin-bottom: 30px;">    <a href="{{link}}" target="_blank" rel="nofollow sponsored"         style="text-decoration: none; color: inherit; display: block; position: relative; border-radius: 12px; padding: 20px; background: linear-gradient(145deg, #f0f0f0, #ffffff); box-shadow: 0 8px 20px rgba(0,0,0,0.15);">        <div style="position: absolute; top: 0; right: 0; background: {{deal_color}}; color: white; padding: 6px 15px; font-size: 14px; font-weight: bold; border-bottom-left-radius: 10px;">            {{badge_text}}        </div>        <div style="display: flex; align-items: center; gap: 20px; flex-wrap: wrap; padding-top: 15px;">            <img src="{{image}}" style="width: 100px; height: 100px; object-fit: contain; flex-shrink: 0;" alt="{{title}}">            <div style="flex: 1;">                <h4 style="margin: 0; color: #333; font-size: 18px;">{{title}}</h4>                {{stars}}                <p style="margin: 5px 0 15px 0; font-size: 14px; color: #555; border-bottom: 1px dashed #ddd; padding-bottom: 10px;">{{description}}</p>                <div style="text-align: left;">                    <span style="background: #c0392b; color: white; padding: 12px 25px; border-radius: 8px; font-size: 15px; font-weight: bold; display: inline-block;">See Deal on Amazon &rarr;</span>                </div>            </div>        </div>    </a></div>"""
+FEATURE_CALLOUT_TEMPLATE = """<div style="margin-bottom: 25px;">    <a href="{{link}}" target="_blank" rel="nofollow sponsored"         style="text-decoration: none; color: inherit; display: block; border: 1px solid #ddd; border-left: 8px solid #3498db; border-radius: 10px; padding: 20px; background: #f7f7f7; box-shadow: 0 4px 8px rgba(0,0,0,0.05);">        <div style="display: flex; gap: 20px; flex-wrap: wrap;">            <div style="flex-shrink: 0; text-align: center;">                <img src="{{image}}" style="width: 80px; height: 80px; object-fit: contain; margin-bottom: 5px;" alt="{{title}}">                <div style="color: #ffa41c; font-size: 12px; font-weight: bold;">{{rating}} Stars</div>            </div>            <div style="flex: 1; min-width: 250px;">                <h4 style="margin: 0 0 8px 0; color: #333; font-size: 18px;">{{title}}</h4>                <ul style="list-style: none; padding: 0; margin: 0; font-size: 13px; color: #555;">                    {{features_list}}                </ul>            </div>            <div style="flex-shrink: 0; display: flex; align-items: center; justify-content: center;">                <span style="background: #3498db; color: white; padding: 12px 20px; border-radius: 6px; font-size: 14px; font-weight: bold; display: inline-block;">Shop Now &rarr;</span>            </div>        </div>    </a></div>"""
+VERTICAL_CARD_TEMPLATE = """<div style="margin-bottom: 25px; display: inline-block; width: 100%; max-width: 300px; vertical-align: top; margin-right: 15px;">    <a href="{{link}}" target="_blank" rel="nofollow sponsored"         style="text-decoration: none; color: inherit; display: block; border: 1px solid #eee; border-radius: 12px; padding: 20px; background: #fff; box-shadow: 0 4px 15px rgba(0,0,0,0.06); transition: transform 0.2s; text-align: center;">                <div style="margin-bottom: 15px; height: 180px; display: flex; align-items: center; justify-content: center;">            <img src="{{image}}" style="max-width: 100%; max-height: 100%; object-fit: contain;" alt="{{title}}">        </div>        <div style="font-size: 11px; text-transform: uppercase; letter-spacing: 1px; color: #888; margin-bottom: 5px;">{{badge_text}}</div>                <h4 style="margin: 0 0 10px 0; color: #222; font-size: 16px; line-height: 1.4; height: 45px; overflow: hidden;">{{title}}</h4>                <div style="display: flex; justify-content: center; margin-bottom: 10px;">{{stars}}</div>                <p style="font-size: 13px; color: #666; margin-bottom: 15px; line-height: 1.5; height: 40px; overflow: hidden;">{{description}}</p>        <span style="background: #111; color: white; padding: 12px 0; width: 100%; border-radius: 6px; font-size: 14px; font-weight: bold; display: block;">            Check Price        </span>    </a></div>"""
+
+class CompiledTemplate:
+    """{{field}} টেমপ্লেট একবারই parse হয়ে str.format স্ট্রিং এ রূপান্তরিত হয় (লিটারাল { } escape করে),
+    তাই প্রতিটি রেন্ডার একটি format_map কল।"""
+
+    def __init__(self, name, source):
+        self.name = name
+        parts = TEMPLATE_PLACEHOLDER_RE.split(source)
+        self.fields = tuple(dict.fromkeys(parts[1::2]))
+        unknown = [f for f in self.fields if f not in AFFILIATE_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown placeholder(s) in template '{name}': {', '.join(unknown)}")
+        self.format_string = "".join(
+            "{" + part + "}" if i % 2 else part.replace("{", "{{").replace("}", "}}")
+            for i, part in enumerate(parts)
+        )
+
+    def render(self, context):
+        return self.format_string.format_map(context)
+
+AFFILIATE_TEMPLATES = {
+    "Detailed Review Snippet (Pros/Cons সহ)": CompiledTemplate("detailed_review", DETAILED_REVIEW_TEMPLATE),
+    "Benefit Badge Style (ব্যাজ সহ)": CompiledTemplate("benefit_badge", BENEFIT_BADGE_TEMPLATE),
+    "Featured Deal Box (অফার বক্স)": CompiledTemplate("featured_deal", FEATURED_DEAL_TEMPLATE),
+    "Key Feature Callout (লিস্ট স্টাইল)": CompiledTemplate("feature_callout", FEATURE_CALLOUT_TEMPLATE),
+    "Modern Vertical Card (লম্বা কার্ড)": CompiledTemplate("vertical_card", VERTICAL_CARD_TEMPLATE)
+}
+
+@functools.lru_cache(maxsize=64)
+def get_star_html(rating):
+    try:
+        rating_val = float(rating)
+    except (TypeError, ValueError):
+        rating_val = 0.0
+    full_stars_count = round(rating_val)
+    stars = "".join('&#9733;' if i < full_stars_count else '&#9734;' for i in range(5))
+    return f'<div style="color: #ffa41c; font-size: 14px; margin: 3px 0 5px 0;">{stars} <span style="color: #666; font-size: 12px;">({rating_val})</span></div>'
+
+def affiliate_context(product):
+    """একটি প্রোডাক্টের সব placeholder এর মান (stars, pros/cons/features লিস্ট সহ) একবারে তৈরি করে"""
+    data = {**AFFILIATE_DEFAULTS, **{k: v for k, v in product.items() if v is not None}}
+    features = [f.strip() for f in str(data['description']).split('.') if len(f.strip()) > 5][:3]
+    data['stars'] = get_star_html(data['rating'])
+    data['deal_color'] = data['badge_color'] or '#ff9900'
+    data['pros_list'] = "".join([f"<li>&#10003; {p.strip()}</li>" for p in str(data['pros']).split('\n') if p.strip()]) or '<li>&#10003; No pros listed.</li>'
+    data['cons_list'] = "".join([f"<li>&#10007; {c.strip()}</li>" for c in str(data['cons']).split('\n') if c.strip()]) or '<li>&#10007; No cons listed.</li>'
+    data['features_list'] = "".join([f"<li>&#9989; {f}</li>" for f in features])
+    return data
+
+def render_affiliate_boxes(products, template, disclosure=True):
+    """সব প্রোডাক্ট রেন্ডার করে একবারে join (string += এর বদলে)"""
+    parts = [template.render(affiliate_context(p)) for p in products]
+    if disclosure:
+        parts.append(AFFILIATE_DISCLOSURE)
+    return "".join(parts)
+
+def load_template_files(directory=AFFILIATE_TEMPLATE_DIR):
+    """ফোল্ডারের *.html টেমপ্লেট; ফাইলের নাম/mtime না বদলালে ক্যাশ থেকে"""
+    if not os.path.isdir(directory):
+        return {}
+    entries = tuple(sorted((f.path, f.stat().st_mtime) for f in os.scandir(directory) if f.name.lower().endswith((".html", ".htm"))))
+    return _compile_template_files(entries)
+
+@functools.lru_cache(maxsize=32)
+def _compile_template_files(entries):
+    templates = {}
+    for path, _ in entries:
+        name = os.path.splitext(os.path.basename(path))[0]
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                templates[f"📄 {name}"] = CompiledTemplate(name, f.read())
+        except (OSError, ValueError):
+            continue
+    return templates
+
+def benchmark_affiliate_templates(count=2000):
+    """প্রতিটি ডিজাইনে count টি প্রোডাক্ট বক্স রেন্ডার করে boxes/sec মাপে"""
+    products = [{
+        'title': f"Sample Product {i}",
+        'link': f"https://www.amazon.com/dp/B0{i:08d}",
+        'image': f"https://m.media-amazon.com/images/I/{i}.jpg",
+        'rating': 3.5 + (i % 15) / 10,
+        'description': "Lightweight frame. Adjustable height for every user. Non-slip rubber feet.",
+        'badge_text': "Best Overall",
+        'badge_color': "#343a40",
+        'pros': "Sturdy\nFoldable\nGreat value",
+        'cons': "Heavier than others"
+    } for i in range(count)]
+    results = []
+    for label, template in AFFILIATE_TEMPLATES.items():
+        start = time.perf_counter()
+        html = render_affiliate_boxes(products, template)
+        elapsed = time.perf_counter() - start
+        results.append({"design": label, "boxes": count, "ms": elapsed * 1000, "boxes_per_sec": count / elapsed if elapsed else 0.0, "kb": len(html) / 1024})
+    return results
+
+# [NEW] Affiliate Product Feed
+AFFILIATE_FEED_ALIASES = {
+    'name': 'title', 'product': 'title', 'product_title': 'title',
+    'url': 'link', 'affiliate_link': 'link', 'product_url': 'link',
+    'image_url': 'image', 'img': 'image', 'gallery_image': 'image',
+    'stars': 'rating', 'desc': 'description', 'description_text': 'description',
+    'badge': 'badge_text', 'color': 'badge_color',
+    'post': 'article', 'article_title': 'article'
+}
+AFFILIATE_TEXT_FIELDS = ('title', 'link', 'image', 'description', 'badge_text', 'pros', 'cons')
+HTML_ESCAPES = (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;"), ("'", "&#x27;"))
+HEX_COLOR_RE = r"^#(?:[0-9a-fA-F]{3}){1,2}$"
+
+def escape_html_frame(frame):
+    """DataFrame এর সব (string) সেল একসাথে stack করে একবারে HTML escape"""
+    if frame.empty:
+        return frame
+    escaped = frame.stack()
+    for char, entity in HTML_ESCAPES:
+        escaped = escaped.str.replace(char, entity, regex=False)
+    return escaped.unstack().reindex(index=frame.index, columns=frame.columns)
+
+def amazon_results_to_feed(results, tag=""):
+    """Amazon ট্যাবের স্ক্র্যাপ রেজাল্ট (বা তার JSON export) থেকে feed রো: gallery র প্রথম ছবি, bullet point গুলো pros"""
+    rows = []
+    for item in results:
+        if not item or "error" in item:
+            continue
+        link = item.get('url', '#')
+        if tag and link.startswith("http"):
+            link = f"{link}{'&' if '?' in link else '?'}tag={tag}"
+        description = item.get('description_text', '') or ""
+        rows.append({
+            'title': item.get('title', ''),
+            'link': link,
+            'image': (item.get('gallery_images') or [''])[0],
+            'description': description[:200].rsplit(' ', 1)[0] + "..." if len(description) > 200 else description,
+            'pros': "\n".join(item.get('bullet_points') or []),
+            'article': item.get('article', '')
+        })
+    return pd.DataFrame(rows)
+
+def load_affiliate_feed(uploaded_file, tag=""):
+    """CSV বা JSON (প্রোডাক্ট লিস্ট অথবা Amazon ট্যাবের export) থেকে feed DataFrame"""
+    if uploaded_file.name.lower().endswith('.json'):
+        items = json.loads(uploaded_file.getvalue().decode('utf-8'))
+        if isinstance(items, dict):
+            items = items.get('products', [items])
+        if any(isinstance(item, dict) and 'gallery_images' in item for item in items):
+            return amazon_results_to_feed(items, tag)
+        return pd.DataFrame(items)
+    return pd.read_csv(uploaded_file, dtype=str, keep_default_na=False)
+
+def prepare_affiliate_feed(df):
+    """কলামের নাম মিলিয়ে নেওয়া, ডিফল্ট বসানো, যাচাই আর HTML escape — সব কলাম ধরে vectorized ভাবে।
+    Returns (clean DataFrame, issues DataFrame)।"""
+    df = df.rename(columns=lambda c: str(c).strip().lower().replace(' ', '_')).rename(columns=AFFILIATE_FEED_ALIASES)
+    df = df.loc[:, ~df.columns.duplicated()].reset_index(drop=True)
+    for field in ('article', 'design', 'badge_color', 'rating') + AFFILIATE_TEXT_FIELDS:
+        if field not in df.columns:
+            df[field] = ""
+    text = df[list(AFFILIATE_TEXT_FIELDS) + ['article', 'design', 'badge_color']].fillna("").astype(str).apply(lambda col: col.str.strip())
+    issues = []
+
+    def flag(mask, field, problem):
+        issues.extend({'row': i + 1, 'field': field, 'problem': problem} for i in np.flatnonzero(mask.to_numpy()))
+
+    missing_title = text['title'] == ""
+    flag(missing_title, 'title', "Missing title (row skipped)")
+    bad_link = ~text['link'].str.match(r"^(https?://|#)") | (text['link'] == "")
+    flag(bad_link & ~missing_title, 'link', "Invalid or missing link (set to #)")
+    text.loc[bad_link, 'link'] = AFFILIATE_DEFAULTS['link']
+    bad_image = ~text['image'].str.match(r"^https?://")
+    flag(bad_image & (text['image'] != "") & ~missing_title, 'image', "Invalid image URL (placeholder used)")
+    text.loc[bad_image, 'image'] = AFFILIATE_DEFAULTS['image']
+    bad_color = ~text['badge_color'].str.match(HEX_COLOR_RE)
+    flag(bad_color & (text['badge_color'] != "") & ~missing_title, 'badge_color', "Invalid color (default used)")
+    text.loc[bad_color, 'badge_color'] = AFFILIATE_DEFAULTS['badge_color']
+    rating = pd.to_numeric(df['rating'], errors='coerce')
+    flag(rating.isna() & (df['rating'].astype(str).str.strip() != "") & ~missing_title, 'rating', "Invalid rating (4.5 used)")
+    flag(((rating < 1) | (rating > 5)) & ~missing_title, 'rating', "Rating out of range (clipped to 1-5)")
+    rating = rating.fillna(AFFILIATE_DEFAULTS['rating']).clip(1.0, 5.0).round(1)
+    for field in ('description', 'badge_text'):
+        text.loc[text[field] == "", field] = AFFILIATE_DEFAULTS[field]
+
+    text[list(AFFILIATE_TEXT_FIELDS)] = escape_html_frame(text[list(AFFILIATE_TEXT_FIELDS)])
+    text['rating'] = rating
+    clean = text[~missing_title].reset_index(drop=True)
+    return clean, pd.DataFrame(issues, columns=['row', 'field', 'problem'])
+
+def slugify(text, fallback="article"):
+    return re.sub(r"[^\w-]+", "-", text.lower()).strip("-") or fallback
+
+def render_affiliate_feed(feed, default_template, templates=AFFILIATE_TEMPLATES, disclosure=True):
+    """পুরো feed একবারে রেন্ডার: article অনুযায়ী ভাগ করে প্রতিটির HTML। design কলামে টেমপ্লেটের নাম/label থাকলে
+    সেই রো তে সেটি, না হলে default। Returns {article name: html}।"""
+    by_name = {**templates, **{t.name: t for t in templates.values()}}
+    articles = {}
+    for article, group in feed.groupby(feed['article'].replace("", "affiliate-boxes"), sort=False):
+        parts = [by_name.get(p['design'], default_template).render(affiliate_context(p)) for p in group.to_dict('records')]
+        if disclosure:
+            parts.append(AFFILIATE_DISCLOSURE)
+        articles[article] = "".join(parts)
+    return articles
+
+def build_articles_zip(articles):
+    """প্রতিটি article এর জন্য একটি .html ফাইল। মান dict হলে ({extension: content}) প্রতিটি ফরম্যাটের একটি করে ফাইল।"""
+    buffer = io.BytesIO()
+    used = set()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, html in articles.items():
+            file_name, n = slugify(name), 1
+            while file_name in used:
+                n += 1
+                file_name = f"{slugify(name)}-{n}"
+            used.add(file_name)
+            for extension, content in (html if isinstance(html, dict) else {"html": html}).items():
+                zf.writestr(f"{file_name}.{extension}", content)
+    return buffer.getvalue()
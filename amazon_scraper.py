@@ -0,0 +1,512 @@
+# Amazon Scraper ট্যাবের ডাউনলোড, পার্সার আর পেজ ক্যাশ।
+# Streamlit ছাড়া (CLI / cron থেকেও) ব্যবহার করা যায়, তাই app.py র বাইরে আলাদা মডিউলে।
+import re
+import json
+import os
+import time
+import gzip
+import hashlib
+import random
+import threading
+import functools
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+from perf_metrics import incr, timed
+
+# [UPDATED] Amazon Scraper Function (With Bullet Points for Pros)
+AMAZON_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9"
+}
+# ASIN দিলে এই বেস URL দিয়ে লিংক বানানো হয় (লোকাল টেস্ট সার্ভারের জন্য env দিয়ে বদলানো যায়)
+AMAZON_BASE_URL = os.environ.get("AMAZON_BASE_URL", "https://www.amazon.com").rstrip("/")
+AMAZON_TIMEOUT = (5, 20)  # (connect, read) seconds
+AMAZON_MAX_RETRIES = 3
+AMAZON_BACKOFF = 1.5
+AMAZON_PER_HOST_LIMIT = 2
+ASIN_RE = re.compile(r"^[A-Z0-9]{10}$")
+CAPTCHA_MARKERS = ("/errors/validateCaptcha", "Type the characters you see in this image", "api-services-support@amazon.com")
+
+def make_http_session(pool_size=16):
+    """Keep-alive connection pool সহ একটি শেয়ার্ড requests Session তৈরি করে।
+    requests (আর bs4) প্রথম স্ক্র্যাপের সময়ই import হয়, অ্যাপ চালু হওয়ার সময় নয়।"""
+    import requests
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(AMAZON_HEADERS)
+    return session
+
+@functools.lru_cache(maxsize=None)
+def get_amazon_session():
+    return make_http_session()
+
+def normalize_amazon_input(item):
+    """URL হলে যেমন আছে তেমন, ASIN হলে প্রোডাক্ট URL বানিয়ে দেয়"""
+    item = item.strip()
+    if ASIN_RE.match(item.upper()):
+        return f"{AMAZON_BASE_URL}/dp/{item.upper()}"
+    return item
+
+def is_captcha_page(html):
+    return any(marker in html for marker in CAPTCHA_MARKERS)
+
+@timed("amazon.fetch")
+def fetch_amazon_page(url, session=None, timeout=AMAZON_TIMEOUT, max_retries=AMAZON_MAX_RETRIES, backoff=AMAZON_BACKOFF, headers=None):
+    """Timeout আর retry সহ পেজ ডাউনলোড করে। 503/captcha পেলে exponential backoff করে আবার চেষ্টা করে।
+    Returns (response, error). Conditional রিকোয়েস্টে 304 এলে সেটাও সফল response হিসেবে ফেরত দেয়।"""
+    import requests  # make_http_session এ আগেই লোড হয়েছে, এখানে শুধু exception টাইপের জন্য
+    session = session or get_amazon_session()
+    error = "Page could not be loaded. Amazon might be blocking requests."
+    for attempt in range(max_retries + 1):
+        try:
+            response = session.get(url, timeout=timeout, headers=headers)
+            if response.status_code == 304:
+                return response, None
+            if response.status_code == 200 and not is_captcha_page(response.text):
+                return response, None
+            if response.status_code not in (200, 429, 503):
+                return None, error
+            error = "Amazon returned a captcha / throttling page. Please try again later."
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error = str(e)
+        if attempt < max_retries:
+            time.sleep(backoff * (2 ** attempt) + random.uniform(0, backoff))
+    return None, error
+
+def parse_amazon_product_html_soup(html):
+    """পুরনো (reference) পার্সার: পুরো পেজের BeautifulSoup ট্রি বানিয়ে ডাটা বের করে"""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+
+    # 1. Product Title
+    title_tag = soup.find(id="productTitle")
+    product_title = title_tag.get_text(strip=True) if title_tag else "Title Not Found"
+
+    # 2. Main Gallery Images
+    gallery_images = []
+    img_container = soup.find("img", {"id": "landingImage"})
+    if img_container and img_container.get("data-a-dynamic-image"):
+        json_data = img_container.get("data-a-dynamic-image")
+        gallery_images = list(json.loads(json_data).keys())
+    
+    # Fallback for gallery
+    if not gallery_images:
+        match = re.search(r'"hiRes":"(.*?)"', html)
+        if match: gallery_images.append(match.group(1))
+
+    # 3. Description Text (Summary)
+    description_text = ""
+    desc_div = soup.find("div", {"id": "productDescription"})
+    if desc_div:
+        description_text = desc_div.get_text(separator="\n", strip=True)
+    else:
+        aplus_div = soup.find("div", {"id": "aplus"})
+        if aplus_div:
+            paragraphs = aplus_div.find_all("p")
+            description_text = "\n\n".join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
+
+    # 4. [NEW] Bullet Points (Pros)
+    bullet_points = []
+    bullets_ul = soup.find(id="feature-bullets")
+    if bullets_ul:
+        # প্রথম ৫টি পয়েন্ট নিচ্ছি
+        for li in bullets_ul.find_all("li")[:5]:
+            text = li.get_text(strip=True)
+            # হিডেন টেক্সট বাদ দেওয়া
+            if text and not "hidden" in str(li):
+                bullet_points.append(text)
+
+    # 5. Description Images
+    description_images = []
+    target_divs = [soup.find("div", {"id": "productDescription"}), soup.find("div", {"id": "aplus"})]
+    
+    for container in target_divs:
+        if container:
+            imgs = container.find_all("img")
+            for img in imgs:
+                src = img.get("data-src") or img.get("src")
+                if src and "http" in src:
+                    if "sprite" not in src and "pixel" not in src and ".gif" not in src:
+                        if src not in description_images and src not in gallery_images:
+                            description_images.append(src)
+
+    return {
+        "title": product_title,
+        "gallery_images": gallery_images,
+        "description_text": description_text[:3000] + "..." if len(description_text) > 3000 else description_text,
+        "bullet_points": bullet_points, # নতুন ডাটা
+        "description_images": description_images
+    }
+
+# [NEW] Fast-path Amazon Parser
+# পুরো পেজের ট্রি না বানিয়ে শুধু দরকারি অংশগুলো (id দিয়ে) কেটে নিয়ে পার্স করা হয়
+try:
+    import lxml.html
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+HIRES_RE = re.compile(r'"hiRes":"(.*?)"')
+ID_ATTR_TAIL_RE = re.compile(r"""(?<![\w-])id\s*=\s*["']?$""")
+SKIP_TEXT_TAGS = ("script", "style", "template", "noscript")
+VOID_TAGS = ("img", "br", "hr", "input", "meta", "link", "source")
+_tag_scan_cache = {}
+
+def extract_element_html(html, element_id, tag=None):
+    """id দিয়ে একটি element এর HTML অংশটুকু কেটে দেয় (nested একই ট্যাগ গুনে ক্লোজিং ট্যাগ পর্যন্ত)। না পেলে None।"""
+    # regex দিয়ে পুরো পেজ স্ক্যান না করে str.find (অনেক দ্রুত), তারপর আশেপাশে id= আছে কিনা যাচাই
+    pos = html.find(element_id)
+    while pos != -1:
+        candidate, pos = pos, html.find(element_id, pos + 1)
+        after = html[candidate + len(element_id):candidate + len(element_id) + 1]
+        if after not in ('"', "'", " ", "/", ">") or not ID_ATTR_TAIL_RE.search(html, max(candidate - 16, 0), candidate):
+            continue
+        start = html.rfind("<", 0, candidate)
+        if start == -1 or ">" in html[start:candidate]:
+            continue
+        tag_match = re.match(r"<([a-zA-Z][a-zA-Z0-9]*)", html[start:start + 20])
+        if not tag_match:
+            continue
+        tag_name = tag_match.group(1).lower()
+        if tag and tag_name != tag:
+            continue
+        open_end = html.find(">", candidate)
+        if open_end == -1:
+            return None
+        if tag_name in VOID_TAGS:
+            return html[start:open_end + 1]
+        if tag_name not in _tag_scan_cache:
+            _tag_scan_cache[tag_name] = re.compile(r"<(/?)%s\b[^>]*>" % tag_name, re.IGNORECASE)
+        depth = 1
+        for tag_token in _tag_scan_cache[tag_name].finditer(html, open_end + 1):
+            depth += -1 if tag_token.group(1) else 1
+            if depth == 0:
+                return html[start:tag_token.end()]
+        return html[start:]
+    return None
+
+class _LxmlNode:
+    """lxml element কে BeautifulSoup এর মত ছোট একটা ইন্টারফেস দেয়, যাতে দুই পাথে একই লজিক চলে"""
+
+    def __init__(self, el):
+        self.el = el
+
+    def _strings(self, el):
+        if not isinstance(el.tag, str) or el.tag in SKIP_TEXT_TAGS:
+            return
+        if el.text:
+            yield el.text
+        for child in el:
+            yield from self._strings(child)
+            if child.tail:
+                yield child.tail
+
+    def get_text(self, separator="", strip=False):
+        strings = self._strings(self.el)
+        if strip:
+            strings = (t.strip() for t in strings)
+            strings = (t for t in strings if t)
+        return separator.join(strings)
+
+    def get(self, attr):
+        return self.el.get(attr)
+
+    def find_all(self, tag):
+        return [_LxmlNode(e) for e in self.el.iter(tag) if e is not self.el]
+
+    def __str__(self):
+        return lxml.html.tostring(self.el, encoding="unicode", with_tail=False)
+
+def _parse_fragment(fragment):
+    if fragment is None:
+        return None
+    if HAS_LXML:
+        try:
+            return _LxmlNode(lxml.html.fragment_fromstring(fragment))
+        except Exception:
+            pass
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(fragment, "html.parser").find()
+
+def parse_amazon_product_html_fast(html):
+    """Targeted pass: productTitle, landingImage, feature-bullets, productDescription আর aplus অংশ কেটে
+    শুধু সেগুলোই পার্স করে। আউটপুট parse_amazon_product_html_soup এর মতই।"""
+    title_tag = _parse_fragment(extract_element_html(html, "productTitle"))
+    product_title = title_tag.get_text(strip=True) if title_tag is not None else "Title Not Found"
+
+    gallery_images = []
+    img_container = _parse_fragment(extract_element_html(html, "landingImage", tag="img"))
+    if img_container is not None and img_container.get("data-a-dynamic-image"):
+        gallery_images = list(json.loads(img_container.get("data-a-dynamic-image")).keys())
+    if not gallery_images:
+        match = HIRES_RE.search(html)
+        if match: gallery_images.append(match.group(1))
+
+    desc_div = _parse_fragment(extract_element_html(html, "productDescription", tag="div"))
+    aplus_div = _parse_fragment(extract_element_html(html, "aplus", tag="div"))
+
+    description_text = ""
+    if desc_div is not None:
+        description_text = desc_div.get_text(separator="\n", strip=True)
+    elif aplus_div is not None:
+        paragraph_texts = [p.get_text(strip=True) for p in aplus_div.find_all("p")]
+        description_text = "\n\n".join([t for t in paragraph_texts if t])
+
+    bullet_points = []
+    bullets_ul = _parse_fragment(extract_element_html(html, "feature-bullets"))
+    if bullets_ul is not None:
+        for li in bullets_ul.find_all("li")[:5]:
+            text = li.get_text(strip=True)
+            if text and not "hidden" in str(li):
+                bullet_points.append(text)
+
+    description_images = []
+    for container in (desc_div, aplus_div):
+        if container is not None:
+            for img in container.find_all("img"):
+                src = img.get("data-src") or img.get("src")
+                if src and "http" in src:
+                    if "sprite" not in src and "pixel" not in src and ".gif" not in src:
+                        if src not in description_images and src not in gallery_images:
+                            description_images.append(src)
+
+    return {
+        "title": product_title,
+        "gallery_images": gallery_images,
+        "description_text": description_text[:3000] + "..." if len(description_text) > 3000 else description_text,
+        "bullet_points": bullet_points,
+        "description_images": description_images
+    }
+
+@timed("amazon.parse")
+def parse_amazon_product_html(html):
+    try:
+        return parse_amazon_product_html_fast(html)
+    except Exception:
+        # অদ্ভুত মার্কআপে fast path ব্যর্থ হলে পুরনো পার্সার
+        return parse_amazon_product_html_soup(html)
+
+def benchmark_amazon_parsers(pages, repeat=3):
+    """সেভ করা পেজের উপর পুরনো আর নতুন পার্সারের সময় তুলনা করে। pages: HTML string এর লিস্ট।"""
+    timings = {"soup": 0.0, "fast": 0.0}
+    mismatches = 0
+    for html in pages:
+        for name, parser in (("soup", parse_amazon_product_html_soup), ("fast", parse_amazon_product_html_fast)):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                result = parser(html)
+            timings[name] += (time.perf_counter() - start) / repeat
+            if name == "soup":
+                expected = result
+        if result != expected:
+            mismatches += 1
+    return {
+        "pages": len(pages),
+        "soup_ms_per_page": timings["soup"] * 1000 / max(len(pages), 1),
+        "fast_ms_per_page": timings["fast"] * 1000 / max(len(pages), 1),
+        "speedup": timings["soup"] / timings["fast"] if timings["fast"] else 0.0,
+        "mismatches": mismatches,
+        "engine": "lxml" if HAS_LXML else "html.parser"
+    }
+
+# [NEW] Amazon Page Cache
+AMAZON_CACHE_DIR = os.environ.get("AMAZON_CACHE_DIR", os.path.join(".cache", "amazon"))
+AMAZON_CACHE_TTL = int(os.environ.get("AMAZON_CACHE_TTL", 24 * 3600))  # seconds
+AMAZON_CACHE_MAX_MB = int(os.environ.get("AMAZON_CACHE_MAX_MB", 200))
+AMAZON_PARSER_VERSION = 1  # পার্সার বদলালে বাড়ান, তাহলে ক্যাশের raw HTML থেকে আবার পার্স হবে
+def atomic_write(path, payload):
+    """temp ফাইলে লিখে os.replace, যাতে মাঝপথে crash হলেও পুরনো ফাইল নষ্ট না হয়"""
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+ASIN_IN_URL_RE = re.compile(r"/(?:dp|gp/product|gp/aw/d|product)/([A-Z0-9]{10})(?:[/?]|$)", re.IGNORECASE)
+
+def amazon_cache_key(url):
+    """ক্যাশ কী: marketplace + ASIN। ASIN না পেলে query ছাড়া URL।"""
+    parsed = urlparse(normalize_amazon_input(url))
+    marketplace = parsed.netloc.lower().removeprefix("www.")
+    match = ASIN_IN_URL_RE.search(parsed.path)
+    ident = match.group(1).upper() if match else parsed.path.rstrip("/")
+    return hashlib.sha256(f"{marketplace}|{ident}".encode("utf-8")).hexdigest()
+
+class AmazonPageCache:
+    """Disk ক্যাশ: প্রতিটি entry তে gzip করা raw HTML (<key>.html.gz) এবং পার্স করা ডাটা + মেটা (<key>.json)।
+    File mtime কে last-access ধরে LRU eviction করা হয়।"""
+
+    def __init__(self, directory=AMAZON_CACHE_DIR, ttl=AMAZON_CACHE_TTL, max_bytes=AMAZON_CACHE_MAX_MB * 1024 * 1024):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key, ext):
+        return os.path.join(self.directory, f"{key}.{ext}")
+
+    def get(self, key):
+        """(entry, is_fresh) ফেরত দেয়, না থাকলে (None, False)"""
+        meta_path = self._path(key, "json")
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None, False
+        now = time.time()
+        for ext in ("json", "html.gz"):
+            try:
+                os.utime(self._path(key, ext), (now, now))
+            except OSError:
+                pass
+        return entry, (now - entry.get("fetched_at", 0)) < self.ttl
+
+    def get_html(self, key):
+        try:
+            with open(self._path(key, "html.gz"), "rb") as f:
+                return gzip.decompress(f.read()).decode("utf-8")
+        except OSError:
+            return None
+
+    def put(self, key, url, data, html=None, etag=None, last_modified=None, fetched_at=None):
+        """fetched_at দিলে সেটাই থাকে (শুধু আবার পার্স করলে TTL নতুন করে শুরু হয় না)"""
+        entry = {
+            "url": url,
+            "fetched_at": time.time() if fetched_at is None else fetched_at,
+            "etag": etag,
+            "last_modified": last_modified,
+            "parser_version": AMAZON_PARSER_VERSION,
+            "data": data
+        }
+        if html is not None:
+            atomic_write(self._path(key, "html.gz"), gzip.compress(html.encode("utf-8"), compresslevel=6))
+        atomic_write(self._path(key, "json"), json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+        self.evict()
+
+    def touch(self, key, entry):
+        """304 Not Modified পেলে শুধু fetched_at আপডেট করা হয়"""
+        entry["fetched_at"] = time.time()
+        atomic_write(self._path(key, "json"), json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+
+    def evict(self):
+        with self.lock:
+            files = [f for f in os.scandir(self.directory) if f.is_file() and not f.name.endswith(".tmp")]
+            total = sum(f.stat().st_size for f in files)
+            if total <= self.max_bytes:
+                return
+            # সবচেয়ে পুরনো access করা entry আগে মুছে ফেলা হয়
+            entries = {}
+            for f in files:
+                key = f.name.split(".", 1)[0]
+                size, atime = entries.get(key, (0, 0))
+                entries[key] = (size + f.stat().st_size, max(atime, f.stat().st_mtime))
+            for key, (size, _) in sorted(entries.items(), key=lambda kv: kv[1][1]):
+                if total <= self.max_bytes:
+                    break
+                for ext in ("json", "html.gz"):
+                    try:
+                        os.remove(self._path(key, ext))
+                    except OSError:
+                        pass
+                total -= size
+
+    def stats(self):
+        files = [f for f in os.scandir(self.directory) if f.is_file() and f.name.endswith(".json")]
+        size = sum(f.stat().st_size for f in os.scandir(self.directory) if f.is_file())
+        return {"entries": len(files), "size_mb": size / (1024 * 1024)}
+
+    def iter_html(self):
+        """ক্যাশে থাকা সব raw পেজ (বেঞ্চমার্ক corpus হিসেবে ব্যবহার হয়)"""
+        for f in os.scandir(self.directory):
+            if f.name.endswith(".html.gz"):
+                html = self.get_html(f.name.split(".", 1)[0])
+                if html:
+                    yield html
+
+    def clear(self):
+        with self.lock:
+            for f in os.scandir(self.directory):
+                if f.is_file():
+                    os.remove(f.path)
+
+@functools.lru_cache(maxsize=None)
+def get_amazon_cache():
+    return AmazonPageCache()
+
+def get_amazon_product_data(url, session=None, cache=None, use_cache=True):
+    data = _load_amazon_product_data(url, session, cache, use_cache)
+    incr(f"amazon.{data.get('cache_status', 'error')}")
+    return data
+
+def _load_amazon_product_data(url, session, cache, use_cache):
+    try:
+        url = normalize_amazon_input(url)
+        if not use_cache:
+            response, error = fetch_amazon_page(url, session=session)
+            if error:
+                return {"error": error}
+            return {**parse_amazon_product_html(response.text), "cache_status": "bypass"}
+
+        cache = cache or get_amazon_cache()
+        key = amazon_cache_key(url)
+        entry, is_fresh = cache.get(key)
+        if entry and entry.get("parser_version") != AMAZON_PARSER_VERSION:
+            # পুরনো পার্সারের ডাটা: raw HTML থাকলে নতুন পার্সার দিয়ে আবার পার্স করা
+            html = cache.get_html(key)
+            if html is None:
+                entry = None
+            else:
+                entry["data"] = parse_amazon_product_html(html)
+                cache.put(key, url, entry["data"], etag=entry.get("etag"), last_modified=entry.get("last_modified"), fetched_at=entry.get("fetched_at", 0))
+        if entry and is_fresh:
+            return {**entry["data"], "cache_status": "hit"}
+
+        conditional_headers = {}
+        if entry and entry.get("etag"):
+            conditional_headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            conditional_headers["If-Modified-Since"] = entry["last_modified"]
+
+        response, error = fetch_amazon_page(url, session=session, headers=conditional_headers or None)
+        if error:
+            if entry:
+                # ব্লক হলে পুরনো (stale) ডাটাই দেখানো হয়
+                return {**entry["data"], "cache_status": "stale"}
+            return {"error": error}
+        if response.status_code == 304 and entry:
+            cache.touch(key, entry)
+            return {**entry["data"], "cache_status": "revalidated"}
+
+        data = parse_amazon_product_html(response.text)
+        cache.put(key, url, data, html=response.text, etag=response.headers.get("ETag"), last_modified=response.headers.get("Last-Modified"))
+        return {**data, "cache_status": "miss"}
+    except Exception as e:
+        return {"error": str(e)}
+
+# [NEW] Batch Amazon Scraper
+def scrape_amazon_batch(items, max_workers=8, per_host_limit=AMAZON_PER_HOST_LIMIT, session=None, use_cache=True):
+    """অনেকগুলো URL/ASIN একসাথে স্ক্র্যাপ করে। প্রতিটি রেজাল্ট শেষ হওয়া মাত্র (index, url, data) yield করে।
+    একই host এ একসাথে per_host_limit টির বেশি রিকোয়েস্ট যায় না।"""
+    session = session or get_amazon_session()
+    urls = [normalize_amazon_input(i) for i in items if i.strip()]
+    host_locks = {}
+    for url in urls:
+        host = urlparse(url).netloc
+        if host not in host_locks:
+            host_locks[host] = threading.BoundedSemaphore(per_host_limit)
+
+    def worker(url):
+        with host_locks[urlparse(url).netloc]:
+            return get_amazon_product_data(url, session=session, use_cache=use_cache)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {executor.submit(worker, url): (i, url) for i, url in enumerate(urls)}
+        for future in as_completed(futures):
+            i, url = futures[future]
+            yield i, url, future.result()
+    finally:
+        # consumer আগেই থামলে (rerun/Stop, Ctrl-C, break) বাকি URL এর জন্য অপেক্ষা নয়: queue তে থাকাগুলো বাতিল
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -1,15 +1,128 @@
+import sys
+import time
+RUN_STARTED = time.perf_counter()  # import সহ পুরো রানের সময় মাপতে সবার আগে
+COLD_START = "planner_core" not in sys.modules  # প্রসেসের প্রথম রান: নিচের মডিউলগুলো এখনই প্রথমবার import হবে
 import streamlit as st
-from serpapi import GoogleSearch 
 import re
 import json
 import os
-import pandas as pd
-from PIL import Image
-import pytesseract
 import streamlit.components.v1 as components
-import requests
-from bs4 import BeautifulSoup
 import io  # ইমেজ অপটিমাইজারের জন্য নতুন যুক্ত করা হয়েছে
+import math
+import hmac
+import statistics
+import threading
+import functools
+from collections import deque
+from writer_engine import (benchmark_writer_drafts, build_batch_drafts, build_drafts_bundle, cached_serp_faqs, generate_drafts,
+                           render_draft, writer_product_from_scrape)
+from amazon_scraper import (AMAZON_CACHE_MAX_MB, AMAZON_CACHE_TTL, AMAZON_PER_HOST_LIMIT, benchmark_amazon_parsers,
+                            get_amazon_cache, get_amazon_product_data, scrape_amazon_batch)
+from serp_tools import (SERP_LOCATIONS, build_serp_params, bulk_serp_research, cached_serp_search, dataframe_to_parquet,
+                        get_serp_cache, parse_keyword_list, serp_job_path, summarize_serp_results)
+from planner_core import (CLUSTER_THRESHOLD, PLANNER_FILE, benchmark_keyword_clustering, cluster_keywords,
+                          dedup_planner_import, import_planner_table, open_planner_store,
+                          planner_to_json, PlannerDeduper, PlannerIndex, serp_overlap_urls, split_keywords)
+from text_formatter import FORMATTER_STYLES, benchmark_text_formatter, IncrementalFormatter
+# pandas আর ভারী/শুধু এক ট্যাবের মডিউলগুলো (ocr_engine, image_pipeline, affiliate_tools, comparison_table, schema_builder)
+# এখানে নয়, যে ট্যাব বা ফাংশনে লাগে সেখানে import হয়: প্রথম রানে sidebar আর প্রথম ট্যাবগুলো pandas/PIL লোডের আগেই দেখা যায়
+from perf_metrics import HAS_PYINSTRUMENT, REGISTRY, ProfilerBusy, RunProfiler, observe, start_metrics_server, to_json, to_prometheus
+
+# [NEW] Startup & Rerun Timing
+TIMING_HISTORY = 100  # প্রসেসে শেষ কতগুলো রানের সময় রাখা হবে
+TIMING_LOG = os.environ.get("APP_TIMING_LOG", "")  # দিলে প্রতিটি রানের সময় এই ফাইলে JSONL হিসেবে যোগ হয় (regression ট্র্যাক করতে)
+
+class RunTimer:
+    """একটি স্ক্রিপ্ট রানের ধাপগুলোর সময় (ms)। st.tabs প্রতিটি রানে সব ট্যাবের বডি পরপর চালায়, তাই প্রতিটি ধাপের
+    শেষে lap(): আগের lap থেকে এখন পর্যন্ত সময়টা সেই ধাপের।"""
+
+    def __init__(self, started):
+        self.started = self.last = started
+        self.sections = {}
+
+    def lap(self, name):
+        now = time.perf_counter()
+        self.sections[name] = (now - self.last) * 1000
+        self.last = now
+
+    def total_ms(self):
+        return (self.last - self.started) * 1000
+
+@st.cache_resource
+def get_timing_history():
+    """প্রসেসের (সব সেশন মিলিয়ে) শেষ TIMING_HISTORY টি রানের সময়, আর cold start এর import সময়"""
+    return {"runs": deque(maxlen=TIMING_HISTORY), "cold_imports_ms": None, "count": 0, "lock": threading.Lock()}
+
+def record_run_timing(timer, cold):
+    history = get_timing_history()
+    with history["lock"]:
+        history["count"] += 1
+        record = {"run": history["count"], "cold": cold, "total_ms": round(timer.total_ms(), 1),
+                  "sections": {name: round(ms, 1) for name, ms in timer.sections.items()}}
+        if cold:
+            history["cold_imports_ms"] = record["sections"].get("Imports")
+        history["runs"].append(record)
+    observe("render.total", timer.total_ms() / 1000)
+    for name, ms in timer.sections.items():
+        observe(f"render.{name}", ms / 1000)
+    if TIMING_LOG:
+        try:
+            with open(TIMING_LOG, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"time": round(time.time(), 3), **record}) + "\n")
+        except OSError:
+            pass
+    return record
+
+def timing_summary(runs, current):
+    """এই রানের প্রতিটি ধাপ, আর প্রসেসের warm রানগুলোর median / max (cold start বাদে, কারণ তাতে import সময়ও ধরা)"""
+    warm = [r for r in runs if not r["cold"]]
+    rows = []
+    for name, ms in [*current["sections"].items(), ("Total", current["total_ms"])]:
+        values = [r["total_ms"] if name == "Total" else r["sections"].get(name) for r in warm]
+        values = [v for v in values if v is not None]
+        rows.append({"step": name, "this run (ms)": ms, "median (ms)": statistics.median(values) if values else None, "max (ms)": max(values, default=None)})
+    import pandas as pd
+    return pd.DataFrame(rows)
+
+# [NEW] Hot-path Metrics & Profiling
+ADMIN_TOKEN = os.environ.get("APP_ADMIN_TOKEN", "")  # দিলে URL এ ?admin=<token> থাকলেই মেট্রিক্স প্যানেল আর প্রোফাইলার দেখা যায়
+METRICS_PORT = int(os.environ.get("METRICS_PORT") or 0)  # দিলে এই পোর্টে /metrics (Prometheus) আর /metrics.json
+METRICS_HOST = os.environ.get("METRICS_HOST", "127.0.0.1")
+PROFILE_MODES = ["Off", "cProfile"] + (["pyinstrument"] if HAS_PYINSTRUMENT else [])
+
+def is_admin_session():
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(st.query_params.get("admin", "").encode("utf-8"), ADMIN_TOKEN.encode("utf-8"))
+
+@st.cache_resource
+def get_metrics_server():
+    """প্রসেসে একবারই exporter চালু হয় (পোর্ট সেট না থাকলে বা ব্যস্ত থাকলে None)"""
+    if not METRICS_PORT:
+        return None
+    try:
+        return start_metrics_server(METRICS_PORT, METRICS_HOST)
+    except OSError:
+        return None
+
+def metrics_summary(snapshot):
+    import pandas as pd
+    return pd.DataFrame([{"operation": name, "calls": t["count"], "p50 (ms)": t["p50"] * 1000, "p95 (ms)": t["p95"] * 1000,
+                          "max (ms)": t["max"] * 1000, "total (s)": t["sum"]} for name, t in sorted(snapshot["timers"].items())])
+
+run_timer = RunTimer(RUN_STARTED)
+run_timer.lap("Imports")
+get_metrics_server()
+# opt-in: শুধু admin সেশনে, প্যানেলে মোড বাছাই করলে পরের রান থেকে প্রতিটি রান প্রোফাইল হয়।
+# profiler সেশনেই থাকে: এই সেশনের আগের রান st.rerun() বা exception এ থেমে গেলে (শেষের stop() পর্যন্ত পৌঁছায়নি)
+# শুধু সেটিই এখানে বন্ধ হয়, অন্য সেশনের চালু profiler এ হাত দেওয়া হয় না
+if st.session_state.get("run_profiler"):
+    st.session_state.run_profiler.stop()
+run_profiler, profiler_busy = None, None
+if is_admin_session() and st.session_state.get("profile_mode", "Off") != "Off":
+    try:
+        run_profiler = RunProfiler(st.session_state.profile_mode)
+    except ProfilerBusy as e:
+        profiler_busy = str(e)
+st.session_state.run_profiler = run_profiler
 
 # --- পেজের কনফিগারেশন ---
 st.set_page_config(page_title="SEO & Amazon Tool", page_icon="🛠️", layout="wide")
@@ -43,211 +156,85 @@ with st.sidebar:
     st.divider()
     
     # --- Country Selection ---
-    country = st.selectbox("Select Target Country (SEO):", ["United States", "United Kingdom", "Bangladesh", "India"])
-    location_map = {
-        "United States": {"gl": "us", "loc": "United States", "domain": "google.com"},
-        "United Kingdom": {"gl": "uk", "loc": "United Kingdom", "domain": "google.co.uk"},
-        "Bangladesh": {"gl": "bd", "loc": "Bangladesh", "domain": "google.com.bd"},
-        "India": {"gl": "in", "loc": "India", "domain": "google.co.in"}
-    }
+    country = st.selectbox("Select Target Country (SEO):", list(SERP_LOCATIONS))
+
+    # SERP ক্যাশের hit/miss কাউন্টার (স্ক্রিপ্টের শেষে পূরণ করা হয়)
+    serp_stats_placeholder = st.empty()
     
     st.divider()
     st.markdown("### 👨‍💻 Info")
     st.caption("All-in-One Content & Affiliate Tool")
     st.caption("Developed for **Tariqul Islam**")
 
+run_timer.lap("Sidebar")
+
 # --- Helper Functions ---
 
-# [NEW] Image Optimizer Function
-def convert_image_to_webp(image_file):
-    """ইমেজকে WebP ফরম্যাটে অপটিমাইজ করে কনভার্ট করে"""
-    try:
-        image = Image.open(image_file)
-        buffer = io.BytesIO()
-        image.save(buffer, format="WEBP", optimize=True, quality=80)
-        buffer.seek(0)
-        return buffer
-    except Exception as e:
-        return None
+# [NEW] Parallel WebP Conversion Engine
+WEBP_CACHE_MAX_MB = int(os.environ.get("WEBP_CACHE_MAX_MB", 256))
+IMAGE_POOL_WORKERS = os.cpu_count() or 2  # get_image_pool এর worker সংখ্যা; batch ফাংশনগুলো chunk সাইজের জন্য এটাই পায়
+# batch লজিক image_pipeline / ocr_engine / writer_engine এ (CLI ও একই ফাংশন চালায়); এখানে শুধু প্রসেস-জুড়ে শেয়ার্ড pool আর ক্যাশ
 
-# [UPDATED] Amazon Scraper Function (With Bullet Points for Pros)
-def get_amazon_product_data(url):
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept-Language": "en-US,en;q=0.9"
-    }
+@st.cache_resource
+def get_image_pool():
+    from image_pipeline import make_image_pool
+    return make_image_pool(IMAGE_POOL_WORKERS)
 
-    try:
-        response = requests.get(url, headers=headers)
-        if response.status_code != 200:
-            return {"error": "Page could not be loaded. Amazon might be blocking requests."}
-            
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # 1. Product Title
-        title_tag = soup.find(id="productTitle")
-        product_title = title_tag.get_text(strip=True) if title_tag else "Title Not Found"
-
-        # 2. Main Gallery Images
-        gallery_images = []
-        img_container = soup.find("img", {"id": "landingImage"})
-        if img_container and img_container.get("data-a-dynamic-image"):
-            json_data = img_container.get("data-a-dynamic-image")
-            gallery_images = list(json.loads(json_data).keys())
-        
-        # Fallback for gallery
-        if not gallery_images:
-            match = re.search(r'"hiRes":"(.*?)"', response.text)
-            if match: gallery_images.append(match.group(1))
-
-        # 3. Description Text (Summary)
-        description_text = ""
-        desc_div = soup.find("div", {"id": "productDescription"})
-        if desc_div:
-            description_text = desc_div.get_text(separator="\n", strip=True)
-        else:
-            aplus_div = soup.find("div", {"id": "aplus"})
-            if aplus_div:
-                paragraphs = aplus_div.find_all("p")
-                description_text = "\n\n".join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
-
-        # 4. [NEW] Bullet Points (Pros)
-        bullet_points = []
-        bullets_ul = soup.find(id="feature-bullets")
-        if bullets_ul:
-            # প্রথম ৫টি পয়েন্ট নিচ্ছি
-            for li in bullets_ul.find_all("li")[:5]:
-                text = li.get_text(strip=True)
-                # হিডেন টেক্সট বাদ দেওয়া
-                if text and not "hidden" in str(li):
-                    bullet_points.append(text)
-
-        # 5. Description Images
-        description_images = []
-        target_divs = [soup.find("div", {"id": "productDescription"}), soup.find("div", {"id": "aplus"})]
-        
-        for container in target_divs:
-            if container:
-                imgs = container.find_all("img")
-                for img in imgs:
-                    src = img.get("data-src") or img.get("src")
-                    if src and "http" in src:
-                        if "sprite" not in src and "pixel" not in src and ".gif" not in src:
-                            if src not in description_images and src not in gallery_images:
-                                description_images.append(src)
-
-        return {
-            "title": product_title,
-            "gallery_images": gallery_images,
-            "description_text": description_text[:3000] + "..." if len(description_text) > 3000 else description_text,
-            "bullet_points": bullet_points, # নতুন ডাটা
-            "description_images": description_images
-        }
-    
-    except Exception as e:
-        return {"error": str(e)}
+@st.cache_resource
+def get_webp_result_cache():
+    from image_pipeline import ResultCache
+    return ResultCache(max_bytes=WEBP_CACHE_MAX_MB * 1024 * 1024)
 
-# --- Content Planner Storage ---
-PLANNER_FILE = 'content_planner.json'
-def load_planner_data():
-    if os.path.exists(PLANNER_FILE):
-        try:
-            with open(PLANNER_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                for item in data:
-                    if 'checked_keywords' not in item: item['checked_keywords'] = []
-                return data
-        except: return []
-    return []
-
-def save_planner_data(data):
-    with open(PLANNER_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
-
-# --- Text Formatter ---
-def format_text_to_html(text, style_name):
-    # আপনার অরিজিনাল স্টাইল কোড এখানে অক্ষত রাখা হয়েছে
-    styles = {
-        "Modern Clean": {
-            "div": "font-family: 'Inter', 'Segoe UI', sans-serif; line-height: 1.7; color: #333; max-width: 100%;",
-            "h1": "color: #111; font-weight: 800; margin-top: 0.5em; margin-bottom: 0.5em; font-size: 2.2em;",
-            "h2": "color: #111; font-weight: 700; margin-top: 1.5em; border-bottom: 2px solid #f0f0f0; padding-bottom: 10px; font-size: 1.8em;",
-            "h3": "color: #444; font-weight: 600; margin-top: 1.2em; font-size: 1.4em;",
-            "p": "margin-bottom: 1.2em; font-size: 17px; color: #333;",
-            "ul": "margin-bottom: 1.2em; padding-left: 20px;",
-            "li": "margin-bottom: 8px;",
-            "img": "max-width: 100%; height: auto; border-radius: 8px; margin: 20px 0; display: block;",
-            "strong": "color: #000; font-weight: 700;"
-        },
-        "Classic Serif": {
-            "div": "font-family: 'Georgia', 'Cambria', serif; line-height: 1.8; color: #2a2a2a; font-size: 18px; max-width: 100%;",
-            "h1": "font-family: 'Georgia', serif; color: #000; margin-top: 40px; font-size: 32px; font-weight: normal;",
-            "h2": "font-family: 'Georgia', serif; color: #000; margin-top: 40px; font-size: 28px; font-weight: normal; border-bottom: 1px solid #ccc; padding-bottom: 5px;",
-            "h3": "font-family: 'Georgia', serif; color: #333; margin-top: 30px; font-style: italic; font-size: 24px;",
-            "p": "margin-bottom: 24px;",
-            "ul": "margin-bottom: 24px; padding-left: 25px;",
-            "li": "margin-bottom: 10px;",
-            "img": "max-width: 100%; height: auto; border: 1px solid #ddd; padding: 5px; margin: 20px auto; display: block;",
-            "strong": "font-weight: bold; color: #000;"
-        },
-        "Magazine Focus": {
-            "div": "font-family: 'Merriweather', serif; line-height: 1.9; color: #222; max-width: 100%; background: #fff; padding: 20px; box-sizing: border-box;",
-            "h1": "font-family: 'Montserrat', sans-serif; text-transform: uppercase; letter-spacing: 1px; color: #2c3e50; margin-top: 20px; font-size: 36px;",
-            "h2": "font-family: 'Montserrat', sans-serif; text-transform: uppercase; letter-spacing: 1px; color: #d35400; border-left: 5px solid #d35400; padding-left: 15px; margin-top: 40px; font-size: 26px;",
-            "h3": "font-family: 'Montserrat', sans-serif; color: #2c3e50; margin-top: 30px; font-size: 22px;",
-            "p": "margin-bottom: 20px; font-size: 18px;",
-            "ul": "list-style-type: square; color: #d35400; margin-bottom: 20px; padding-left: 20px;",
-            "li": "margin-bottom: 10px; color: #222;",
-            "img": "width: 100%; height: auto; margin: 30px 0; box-shadow: 0 4px 15px rgba(0,0,0,0.1);",
-            "strong": "font-weight: bold; color: #222;"
-        }
-    }
-    
-    current_style = styles.get(style_name, styles["Modern Clean"])
-    
-    html_content = f'<div style="{current_style["div"]}">\n'
-    
-    lines = text.split('\n')
-    in_list = False
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            if in_list:
-                html_content += "</ul>\n"
-                in_list = False
-            continue
-            
-        if line.startswith('### '):
-            html_content += f'<h3 style="{current_style["h3"]}">{line[4:]}</h3>\n'
-        elif line.startswith('## '):
-            html_content += f'<h2 style="{current_style["h2"]}">{line[3:]}</h2>\n'
-        elif line.startswith('# '):
-            html_content += f'<h1 style="{current_style["h1"]}">{line[2:]}</h1>\n'
-        elif line.startswith('- ') or line.startswith('* '):
-            if not in_list:
-                html_content += f'<ul style="{current_style["ul"]}">\n'
-                in_list = True
-            html_content += f'<li style="{current_style["li"]}">{line[2:]}</li>\n'
-        elif line.startswith('![') and '](' in line:
-            try:
-                alt = line.split('![')[1].split('](')[0]
-                src = line.split('](')[1].split(')')[0]
-                html_content += f'<img src="{src}" alt="{alt}" style="{current_style["img"]}">\n'
-            except:
-                html_content += f'<p style="{current_style["p"]}">{line}</p>\n'
-        else:
-            if in_list:
-                html_content += "</ul>\n"
-                in_list = False
-            line = re.sub(r'\*\*(.*?)\*\*', f'<strong style="{current_style["strong"]}">\\1</strong>', line)
-            html_content += f'<p style="{current_style["p"]}">{line}</p>\n'
-            
-    if in_list:
-        html_content += "</ul>\n"
+# [NEW] Batch OCR Engine
+@st.cache_resource
+def get_ocr_result_cache():
+    from image_pipeline import ResultCache
+    return ResultCache(max_bytes=64 * 1024 * 1024)
 
-    html_content += "</div>"
-    return html_content
+@st.cache_resource
+def get_planner_store():
+    return open_planner_store()
+
+def load_planner_data():
+    return get_planner_store().list_clusters()
+
+def get_planner_index():
+    """সেশনের planner index। store সব সেশনে শেয়ার করা, তাই অন্য সেশন বা CLI DB বদলালে (store.version()) আবার লোড হয়।
+    version আগে পড়া হয়, তাই মাঝখানে কেউ লিখলে পরের রানে আরেকবার লোড হয়, পুরনো ডাটা থেকে যায় না।"""
+    version = get_planner_store().version()
+    if 'planner_index' not in st.session_state or st.session_state.get('planner_index_version') != version:
+        st.session_state.planner_index = PlannerIndex(load_planner_data())
+        st.session_state.planner_index_version = version
+    return st.session_state.planner_index
+
+def get_incremental_formatter():
+    if 'incremental_formatter' not in st.session_state:
+        st.session_state.incremental_formatter = IncrementalFormatter()
+    return st.session_state.incremental_formatter
+
+# [NEW] Cached Upload Parsing
+# আপলোড করা ফাইল প্রতিটি rerun এ আবার parse না করে, ফাইলের bytes অনুযায়ী ক্যাশ থেকে
+@st.cache_data(max_entries=16, show_spinner=False)
+def read_uploaded_feed(name, data, tag=""):
+    buffer = io.BytesIO(data)
+    buffer.name = name
+    from affiliate_tools import load_affiliate_feed
+    return load_affiliate_feed(buffer, tag)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def read_uploaded_csv(data):
+    import pandas as pd
+    return pd.read_csv(io.BytesIO(data), dtype=str, keep_default_na=False)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def prepare_feed_cached(df):
+    from affiliate_tools import prepare_affiliate_feed
+    return prepare_affiliate_feed(df)
+
+def planner_schema_feed(clusters, location):
+    """planner ক্লাস্টার -> schema feed রো: ক্লাস্টারের নাম আর ক্যাশড SERP "People also ask" থেকে FAQ"""
+    import pandas as pd
+    return pd.DataFrame([{'name': c['label'], 'faqs': cached_serp_faqs(c['label'], location, limit=10)} for c in clusters])
 
 # --- TABS ---
 # লিস্টের শেষে "⭐ Schema Gen" যুক্ত করা হয়েছে
@@ -263,67 +250,109 @@ tab_seo, tab_amazon, tab_affiliate, tab_optimizer, tab_planner, tab_formatter, t
     "📊 Comp. Table",
     "⭐ Schema Gen"  # <--- নতুন ট্যাব
 ])
+run_timer.lap("Helpers & tabs")
 # ==========================
 # TAB 1: SEO RESEARCH (Keep Original)
 # ==========================
 with tab_seo:
     st.subheader("Google Search Analysis")
-    col1, col2 = st.columns([3, 1])
-    with col1:
-        keyword = st.text_input("Enter Main Keyword:", placeholder="Example: Best Walking Cane")
-    with col2:
-        st.write("") 
-        st.write("") 
-        seo_submit = st.button("🚀 Start SEO Research", use_container_width=True)
+    seo_mode = st.radio("Mode:", ["Single Keyword", "Bulk (Planner Cluster / Keyword List)"], horizontal=True, key="seo_mode")
+    seo_force_refresh = st.checkbox("Force refresh (ignore cache)", help="ক্যাশ বাদ দিয়ে SerpApi থেকে নতুন ডাটা আনবে (API credit খরচ হবে)।")
+    selected_loc = SERP_LOCATIONS[country]
 
-    if seo_submit:
-        if not api_key:
-            st.error("⚠️ দয়া করে সাইডবারে SerpApi Key টি দিন (SEO ডাটার জন্য)।")
-        elif not keyword:
-            st.warning("⚠️ দয়া করে একটি Keyword লিখুন।")
-        else:
-            try:
-                with st.spinner('Fetching SEO Data...'):
-                    selected_loc = location_map[country]
-                    params = {
-                        "engine": "google",
-                        "q": keyword,
-                        "location": selected_loc["loc"],
-                        "google_domain": selected_loc["domain"],
-                        "gl": selected_loc["gl"],
-                        "hl": "en",
-                        "api_key": api_key
-                    }
-                    search = GoogleSearch(params)
-                    results = search.get_dict()
-                    
-                    snippet_content = "No direct snippet found."
-                    if "answer_box" in results:
-                        box = results["answer_box"]
-                        if "snippet" in box: snippet_content = box["snippet"]
-                        elif "answer" in box: snippet_content = box["answer"]
-                        elif "list" in box: snippet_content = "\n".join(box["list"])
-
-                    lsi = [i['query'] for i in results.get("related_searches", [])]
-                    faqs = [q['question'] for q in results.get("related_questions", [])]
-                    comps = []
-                    for res in results.get("organic_results", [])[:10]:
-                        comps.append(f"- [{res.get('title')}]({res.get('link')})")
-
-                    st.success("✅ SEO Data Found!")
+    if seo_mode == "Single Keyword":
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            keyword = st.text_input("Enter Main Keyword:", placeholder="Example: Best Walking Cane")
+        with col2:
+            st.write("") 
+            st.write("") 
+            seo_submit = st.button("🚀 Start SEO Research", use_container_width=True)
+
+        if seo_submit:
+            if not api_key:
+                st.error("⚠️ দয়া করে সাইডবারে SerpApi Key টি দিন (SEO ডাটার জন্য)।")
+            elif not keyword:
+                st.warning("⚠️ দয়া করে একটি Keyword লিখুন।")
+            else:
+                try:
+                    with st.spinner('Fetching SEO Data...'):
+                        params = build_serp_params(keyword, selected_loc, api_key)
+                        results, cache_status = cached_serp_search(params, ttl_hours=selected_loc["cache_hours"], force_refresh=seo_force_refresh)
+                        summary = summarize_serp_results(results)
+
+                        st.success("✅ SEO Data Found!")
+                        if cache_status != "miss":
+                            st.caption("♻️ Served from cache — no API credit used.")
                     
-                    prompt_text = f"""
+                        prompt_text = f"""
 Main Keyword: "{keyword}"
-Snippet Context: "{snippet_content}"
-LSI Keywords: {', '.join(lsi)}
-FAQs: {chr(10).join(['- ' + q for q in faqs])}
-Competitors: {chr(10).join([c.replace('- ', '').split('](')[1][:-1] for c in comps])}
+Snippet Context: "{summary['snippet']}"
+LSI Keywords: {', '.join(summary['lsi'])}
+FAQs: {chr(10).join(['- ' + q for q in summary['faqs']])}
+Competitors: {chr(10).join([link for _, link in summary['competitors'] if link])}
 """
-                    st.text_area("Copy for AI Writer:", value=prompt_text, height=200)
+                        st.text_area("Copy for AI Writer:", value=prompt_text, height=200)
                     
-            except Exception as e:
-                st.error(f"Error: {e}")
+                except Exception as e:
+                    st.error(f"Error: {e}")
 
+    else:
+        st.caption("Content Planner এর একটি ক্লাস্টার বেছে নিন অথবা কিওয়ার্ড লিস্ট আপলোড করুন। সব কিওয়ার্ড একসাথে রিসার্চ হবে, সেশন কেটে গেলেও আবার চালালে যেখান থেকে থেমেছিল সেখান থেকে শুরু হবে।")
+        bulk_source = st.radio("Keywords from:", ["Planner Cluster", "Upload List (TXT/CSV)"], horizontal=True)
+        bulk_keywords = []
+        if bulk_source == "Planner Cluster":
+            seo_planner = get_planner_index()
+            if len(seo_planner):
+                chosen_cluster = st.selectbox("Cluster:", list(seo_planner.by_label))
+                bulk_keywords = list(seo_planner.by_label[chosen_cluster]['keywords'])
+            else:
+                st.info("Planner এ কোনো ক্লাস্টার নেই।")
+        else:
+            kw_file = st.file_uploader("Keyword list (one per line, or first CSV column):", type=["txt", "csv"], key="bulk_kw_file")
+            if kw_file:
+                bulk_keywords = parse_keyword_list(kw_file.getvalue().decode("utf-8", errors="replace"), is_csv=kw_file.name.endswith(".csv"))
+        bulk_keywords = list(dict.fromkeys(bulk_keywords))
+
+        r_col1, r_col2 = st.columns(2)
+        with r_col1:
+            bulk_workers = st.slider("Parallel Requests:", 1, 10, 4, key="serp_workers")
+        with r_col2:
+            bulk_rate = st.number_input("Rate Limit (requests / second):", min_value=0.1, max_value=20.0, value=2.0, step=0.5)
+        st.caption(f"{len(bulk_keywords)} keywords selected")
+
+        if st.button("🚀 Start Bulk Research", type="primary", disabled=not bulk_keywords):
+            if not api_key:
+                st.error("⚠️ দয়া করে সাইডবারে SerpApi Key টি দিন (SEO ডাটার জন্য)।")
+            else:
+                import pandas as pd
+                job_path = serp_job_path(bulk_keywords, selected_loc)
+                progress = st.progress(0.0)
+                table_slot = st.empty()
+                bulk_rows = []
+                last_draw = 0.0
+                for row in bulk_serp_research(bulk_keywords, selected_loc, api_key, job_path, max_workers=bulk_workers, rate_per_sec=bulk_rate, force_refresh=seo_force_refresh):
+                    bulk_rows.append(row)
+                    progress.progress(len(bulk_rows) / len(bulk_keywords), text=f"{len(bulk_rows)} / {len(bulk_keywords)} keywords")
+                    if time.time() - last_draw > 0.5 or len(bulk_rows) == len(bulk_keywords):
+                        table_slot.dataframe(pd.DataFrame(bulk_rows), use_container_width=True, hide_index=True)
+                        last_draw = time.time()
+                st.session_state.serp_bulk_rows = bulk_rows
+                errors = len([r for r in bulk_rows if r['status'] == "error"])
+                st.success(f"✅ {len(bulk_rows) - errors} keywords researched" + (f", {errors} failed (run again to retry)" if errors else ""))
+
+        if st.session_state.get('serp_bulk_rows'):
+            import pandas as pd
+            bulk_df = pd.DataFrame(st.session_state.serp_bulk_rows)
+            e_col1, e_col2 = st.columns(2)
+            with e_col1:
+                st.download_button("⬇️ Download CSV", functools.partial(bulk_df.to_csv, index=False), file_name="serp_research.csv", mime="text/csv")
+            with e_col2:
+                parquet_bytes = dataframe_to_parquet(bulk_df)
+                if parquet_bytes:
+                    st.download_button("⬇️ Download Parquet", parquet_bytes, file_name="serp_research.parquet", mime="application/octet-stream")
+
+run_timer.lap("SEO Research")
 # ==========================
 # TAB 2: AMAZON PRODUCT INFO (UPDATED UI)
 # ==========================
@@ -331,257 +360,412 @@ with tab_amazon:
     st.subheader("🛒 Amazon Name, Pros & Images")
     st.info("লিংক দিন। আমরা টাইটেল, ছবি এবং 'About this item' থেকে Pros (Features) বের করে দেব।")
     
-    amazon_url = st.text_input("Enter Amazon Product URL:", placeholder="https://www.amazon.com/dp/...")
+    scrape_mode = st.radio("Mode:", ["Single Product", "Batch (Multiple URLs / ASINs)"], horizontal=True)
+
+    with st.expander("⚡ Cache Settings"):
+        use_amazon_cache = st.checkbox("Use cached product data", value=True, help=f"একই ASIN আবার খুঁজলে {AMAZON_CACHE_TTL // 3600} ঘণ্টা পর্যন্ত ক্যাশ থেকে দেখানো হবে।")
+        cache_stats = get_amazon_cache().stats()
+        st.caption(f"Cached products: {cache_stats['entries']} · Disk usage: {cache_stats['size_mb']:.1f} / {AMAZON_CACHE_MAX_MB} MB")
+        if st.button("🗑️ Clear Amazon Cache"):
+            get_amazon_cache().clear()
+            st.rerun()
+
+    with st.expander("🧪 Parser Benchmark"):
+        st.caption("ক্যাশে সেভ থাকা পেজ (অথবা আপলোড করা .html ফাইল) দিয়ে পুরনো BeautifulSoup পার্সার আর নতুন fast পার্সারের গতি তুলনা করুন।")
+        bench_files = st.file_uploader("Saved product pages (.html):", type=["html", "htm"], accept_multiple_files=True, key="bench_pages")
+        if st.button("Run Parser Benchmark"):
+            bench_pages = [f.getvalue().decode("utf-8", errors="replace") for f in bench_files or []]
+            bench_pages += list(get_amazon_cache().iter_html())
+            if bench_pages:
+                with st.spinner(f"Benchmarking {len(bench_pages)} pages..."):
+                    bench = benchmark_amazon_parsers(bench_pages)
+                b1, b2, b3, b4 = st.columns(4)
+                b1.metric("Pages", bench["pages"])
+                b2.metric("BeautifulSoup (ms/page)", f"{bench['soup_ms_per_page']:.1f}")
+                b3.metric(f"Fast / {bench['engine']} (ms/page)", f"{bench['fast_ms_per_page']:.1f}")
+                b4.metric("Speedup", f"{bench['speedup']:.1f}x")
+                if bench["mismatches"]:
+                    st.warning(f"{bench['mismatches']} page(s) produced different output between the two parsers.")
+            else:
+                st.info("No saved pages found. Scrape some products first or upload .html files.")
+
+    if scrape_mode == "Single Product":
+        amazon_url = st.text_input("Enter Amazon Product URL:", placeholder="https://www.amazon.com/dp/...")
     
-    if st.button("Get Product Data"):
-        if amazon_url:
-            with st.spinner("Scraping Content from Amazon..."):
-                data = get_amazon_product_data(amazon_url)
+        if st.button("Get Product Data"):
+            if amazon_url:
+                with st.spinner("Scraping Content from Amazon..."):
+                    data = get_amazon_product_data(amazon_url, use_cache=use_amazon_cache)
                 
-                if "error" in data:
-                    st.error(f"Failed: {data['error']}")
-                else:
-                    st.success("✅ Content Extracted!")
+                    if "error" in data:
+                        st.error(f"Failed: {data['error']}")
+                    else:
+                        st.success("✅ Content Extracted!")
+                        if data.get('cache_status') in ("hit", "revalidated", "stale"):
+                            st.caption(f"⚡ Served from cache ({data['cache_status']})")
                     
-                    # 1. Title
-                    st.markdown("### 🏷️ Product Title")
-                    st.code(data['title'], language=None)
+                        # 1. Title
+                        st.markdown("### 🏷️ Product Title")
+                        st.code(data['title'], language=None)
                     
-                    st.divider()
-
-                    # 2. [NEW] PROS Section
-                    st.markdown("### ✅ Potential Pros (Features)")
-                    if data.get('bullet_points'):
-                        # বুলেট পয়েন্টগুলো সুন্দর করে সাজিয়ে দেখানো
-                        pros_text = "\n".join([f"✅ {bp}" for bp in data['bullet_points']])
-                        st.text_area("Copy these as Pros:", value=pros_text, height=200)
-                    else:
-                        st.warning("No bullet points found. You may need to write Pros manually.")
+                        st.divider()
+
+                        # 2. [NEW] PROS Section
+                        st.markdown("### ✅ Potential Pros (Features)")
+                        if data.get('bullet_points'):
+                            # বুলেট পয়েন্টগুলো সুন্দর করে সাজিয়ে দেখানো
+                            pros_text = "\n".join([f"✅ {bp}" for bp in data['bullet_points']])
+                            st.text_area("Copy these as Pros:", value=pros_text, height=200)
+                        else:
+                            st.warning("No bullet points found. You may need to write Pros manually.")
 
-                    st.divider()
+                        st.divider()
                     
-                    # 3. Main Gallery Images
-                    st.markdown(f"### 🖼️ Main Gallery Images ({len(data['gallery_images'])})")
-                    if data['gallery_images']:
-                        cols = st.columns(3)
-                        for i, img_link in enumerate(data['gallery_images']):
-                            with cols[i % 3]:
-                                st.image(img_link, use_container_width=True)
-                                st.code(img_link, language=None)
-                    else:
-                        st.warning("No gallery images found.")
+                        # 3. Main Gallery Images
+                        st.markdown(f"### 🖼️ Main Gallery Images ({len(data['gallery_images'])})")
+                        if data['gallery_images']:
+                            cols = st.columns(3)
+                            for i, img_link in enumerate(data['gallery_images']):
+                                with cols[i % 3]:
+                                    st.image(img_link, use_container_width=True)
+                                    st.code(img_link, language=None)
+                        else:
+                            st.warning("No gallery images found.")
 
-                    st.divider()
+                        st.divider()
 
-                    # 4. Description Text
-                    st.markdown("### 📝 Description Summary")
-                    if data['description_text']:
-                        st.text_area("Product Description Content:", value=data['description_text'], height=250)
-                    else:
-                        st.info("No text description found.")
-
-                    st.divider()
-
-                    # 5. Description Images
-                    st.markdown(f"### 📸 Images from Description ({len(data['description_images'])})")
-                    if data['description_images']:
-                        d_cols = st.columns(3)
-                        for i, d_img in enumerate(data['description_images']):
-                            with d_cols[i % 3]:
-                                st.image(d_img, use_container_width=True)
-                                st.code(d_img, language=None)
-                    else:
-                        st.info("No additional images found.")
+                        # 4. Description Text
+                        st.markdown("### 📝 Description Summary")
+                        if data['description_text']:
+                            st.text_area("Product Description Content:", value=data['description_text'], height=250)
+                        else:
+                            st.info("No text description found.")
+
+                        st.divider()
+
+                        # 5. Description Images
+                        st.markdown(f"### 📸 Images from Description ({len(data['description_images'])})")
+                        if data['description_images']:
+                            d_cols = st.columns(3)
+                            for i, d_img in enumerate(data['description_images']):
+                                with d_cols[i % 3]:
+                                    st.image(d_img, use_container_width=True)
+                                    st.code(d_img, language=None)
+                        else:
+                            st.info("No additional images found.")
 
-        else:
-            st.warning("Please enter a URL.")
+            else:
+                st.warning("Please enter a URL.")
+
+    else:
+        st.caption("প্রতি লাইনে একটি Amazon URL অথবা ASIN দিন। সব প্রোডাক্ট একসাথে স্ক্র্যাপ হবে এবং যেটা আগে শেষ হবে সেটা আগে দেখাবে।")
+        batch_input = st.text_area("Amazon URLs / ASINs:", height=200, placeholder="https://www.amazon.com/dp/B083NJ6F5J\nB07XJ8C8F5")
+        b_col1, b_col2 = st.columns(2)
+        with b_col1:
+            batch_workers = st.slider("Parallel Requests:", 1, 16, 6)
+        with b_col2:
+            batch_per_host = st.slider("Max Requests per Host:", 1, 8, AMAZON_PER_HOST_LIMIT)
+
+        if st.button("Scrape All Products", type="primary"):
+            batch_items = [line.strip() for line in batch_input.splitlines() if line.strip()]
+            if batch_items:
+                progress = st.progress(0.0, text=f"0 / {len(batch_items)} products done")
+                batch_results = [None] * len(batch_items)
+                done = 0
+                for i, url, data in scrape_amazon_batch(batch_items, max_workers=batch_workers, per_host_limit=batch_per_host, use_cache=use_amazon_cache):
+                    done += 1
+                    batch_results[i] = {"url": url, **data}
+                    progress.progress(done / len(batch_items), text=f"{done} / {len(batch_items)} products done")
+                    if "error" in data:
+                        st.error(f"❌ {url} — {data['error']}")
+                        continue
+                    with st.expander(f"✅ {data['title'][:90]}"):
+                        st.code(data['title'], language=None)
+                        st.caption(url)
+                        if data.get('bullet_points'):
+                            st.text_area("Pros:", value="\n".join([f"✅ {bp}" for bp in data['bullet_points']]), height=150, key=f"batch_pros_{i}")
+                        if data['gallery_images']:
+                            st.code("\n".join(data['gallery_images']), language=None)
+                st.session_state.amazon_batch_results = batch_results
+                ok_count = len([r for r in batch_results if "error" not in r])
+                st.success(f"✅ {ok_count} / {len(batch_items)} products scraped!")
+            else:
+                st.warning("Please enter at least one URL or ASIN.")
+
+        if st.session_state.get('amazon_batch_results'):
+            st.download_button(
+                "⬇️ Download Results (JSON)",
+                data=json.dumps(st.session_state.amazon_batch_results, ensure_ascii=False, indent=2),
+                file_name="amazon_products.json",
+                mime="application/json"
+            )
+
+run_timer.lap("Amazon Scraper")
 # ==========================
 # TAB 3: AFFILIATE CODE GENERATOR (Keep Original)
 # ==========================
 with tab_affiliate:
+    import pandas as pd
+    from affiliate_tools import (AFFILIATE_FIELDS, AFFILIATE_TEMPLATE_DIR, AFFILIATE_TEMPLATES, amazon_results_to_feed,
+                                 benchmark_affiliate_templates, build_articles_zip, CompiledTemplate, load_template_files,
+                                 render_affiliate_boxes, render_affiliate_feed)
     st.header("🎨 HTML Affiliate Code Generator")
     st.write("এখানে প্রোডাক্টের তথ্য দিন, আমরা আপনার ব্লগের জন্য সুন্দর HTML কোড তৈরি করে দেব।")
 
     if 'aff_products' not in st.session_state:
         st.session_state.aff_products = [{'id': 0}]
 
-    def get_star_html(rating):
-        full_star = '&#9733;'
-        empty_star = '&#9734;'
-        stars = ''
-        try:
-            rating_val = float(rating)
-        except:
-            rating_val = 0.0
-        full_stars_count = round(rating_val)
-        for i in range(5):
-            stars += full_star if i < full_stars_count else empty_star
-        return f'<div style="color: #ffa41c; font-size: 14px; margin: 3px 0 5px 0;">{stars} <span style="color: #666; font-size: 12px;">({rating_val})</span></div>'
-
-    def generate_detailed_review(data):
-        star_html = get_star_html(data['rating'])
-        pros_list = "".join([f"<li>&#10003; {p.strip()}</li>" for p in data['pros'].split('\n') if p.strip()]) or '<li>&#10003; No pros listed.</li>'
-        cons_list = "".join([f"<li>&#10007; {c.strip()}</li>" for c in data['cons'].split('\n') if c.strip()]) or '<li>&#10007; No cons listed.</li>'
-        return f"""<div style="margin-bottom: 25px;">    <a href="{data['link']}" target="_blank" rel="nofollow sponsored"         style="text-decoration: none; color: inherit; display: block; border: 1px solid #ddd; border-radius: 10px; padding: 20px; background: #fff; box-shadow: 0 4px 12px rgba(0,0,0,0.08);">                <div style="display: flex; align-items: center; gap: 20px; border-bottom: 1px solid #eee; padding-bottom: 15px; margin-bottom: 15px;">            <img src="{data['image']}" style="width: 80px; height: 80px; object-fit: contain; flex-shrink: 0;" alt="{data['title']}">            <div style="flex: 1;">                <h4 style="margin: 0; color: #2c3e50; font-size: 18px;">{data['title']}</h4>                {star_html}                <p style="margin: 5px 0 0 0; font-size: 13px; color: #555;">{data['description']}</p>            </div>            <div style="min-width: 140px; text-align: right;">                <span style="background: #e67e22; color: white; padding: 10px 20px; border-radius: 5px; font-size: 14px; font-weight: bold; display: inline-block;">Check Price &rarr;</span>            </div>        </div>                <div style="display: flex; flex-wrap: wrap; gap: 20px;">            <div style="flex: 1; min-width: 45%; padding: 10px; border-left: 3px solid #2ecc71; background: #f7fff7;">                <h5 style="margin: 0 0 5px 0; color: #27ae60; font-size: 15px;">PROS:</h5>                <ul style="list-style: none; padding: 0; margin: 0; font-size: 13px; color: #333;">{pros_list}</ul>            </div>            <div style="flex: 1; min-width: 45%; padding: 10px; border-left: 3px solid #e74c3c; background: #fff7f7;">                <h5 style="margin: 0 0 5px 0; color: #c0392b; font-size: 15px;">CONS:</h5>                <ul style="list-style: none; padding: 0; margin: 0; font-size: 13px; color: #333;">{cons_list}</ul>            </div>        </div>    </a></div>"""
-
-    def generate_benefit_badge(data):
-        star_html = get_star_html(data['rating'])
-        return f"""<div style="margin-bottom: 25px;">    <a href="{data['link']}" target="_blank" rel="nofollow sponsored"         style="text-decoration: none; color: inherit; display: block; position: relative; border: 2px solid {data['badge_color']}; border-radius: 8px; padding: 20px; background: #fff; box-shadow: 0 4px 10px rgba(0,0,0,0.05);">        <div style="position: absolute; top: -12px; left: 20px; background: {data['badge_color']}; color: white; padding: 2px 12px; font-size: 12px; font-weight: bold; border-radius: 4px; text-transform: uppercase;">            {data['badge_text']}        </div>        <div style="display: flex; align-items: center; gap: 20px; flex-wrap: wrap;">            <img src="{data['image']}" style="width: 80px; height: 80px; object-fit: contain; flex-shrink: 0;" alt="{data['title']}">            <div style="flex: 1;">                <h4 style="margin: 0; color: #333;">{data['title']}</h4>                {star_html}                <p style="margin: 5px 0 0 0; font-size: 13px; color: #666;">{data['description']}</p>            </div>            <div style="text-align: right; min-width: 120px;">                <span style="background: {data['badge_color']}; color: white; padding: 10px 15px; border-radius: 4px; font-size: 13px; font-weight: bold; display: inline-block;">Check Price &rarr;</span>            </div>        </div>    </a></div>"""
-
-    def generate_featured_deal(data):
-        star_html = get_star_html(data['rating'])
-        deal_color = data['badge_color'] if data['badge_color'] else '#ff9900'
-        return f"""<div style="margin-bottom: 30px;">    <a href="{data['link']}" target="_blank" rel="nofollow sponsored"         style="text-decoration: none; color: inherit; display: block; position: relative; border-radius: 12px; padding: 20px; background: linear-gradient(145deg, #f0f0f0, #ffffff); box-shadow: 0 8px 20px rgba(0,0,0,0.15);">        <div style="position: absolute; top: 0; right: 0; background: {deal_color}; color: white; padding: 6px 15px; font-size: 14px; font-weight: bold; border-bottom-left-radius: 10px;">            {data['badge_text']}        </div>        <div style="display: flex; align-items: center; gap: 20px; flex-wrap: wrap; padding-top: 15px;">            <img src="{data['image']}" style="width: 100px; height: 100px; object-fit: contain; flex-shrink: 0;" alt="{data['title']}">            <div style="flex: 1;">                <h4 style="margin: 0; color: #333; font-size: 18px;">{data['title']}</h4>                {star_html}                <p style="margin: 5px 0 15px 0; font-size: 14px; color: #555; border-bottom: 1px dashed #ddd; padding-bottom: 10px;">{data['description']}</p>                <div style="text-align: left;">                    <span style="background: #c0392b; color: white; padding: 12px 25px; border-radius: 8px; font-size: 15px; font-weight: bold; display: inline-block;">See Deal on Amazon &rarr;</span>                </div>            </div>        </div>    </a></div>"""
-
-    def generate_feature_callout(data):
-        features = [f.strip() for f in data['description'].split('.') if len(f.strip()) > 5][:3]
-        features_html = "".join([f"<li>&#9989; {f}</li>" for f in features])
-        return f"""<div style="margin-bottom: 25px;">    <a href="{data['link']}" target="_blank" rel="nofollow sponsored"         style="text-decoration: none; color: inherit; display: block; border: 1px solid #ddd; border-left: 8px solid #3498db; border-radius: 10px; padding: 20px; background: #f7f7f7; box-shadow: 0 4px 8px rgba(0,0,0,0.05);">        <div style="display: flex; gap: 20px; flex-wrap: wrap;">            <div style="flex-shrink: 0; text-align: center;">                <img src="{data['image']}" style="width: 80px; height: 80px; object-fit: contain; margin-bottom: 5px;" alt="{data['title']}">                <div style="color: #ffa41c; font-size: 12px; font-weight: bold;">{data['rating']} Stars</div>            </div>            <div style="flex: 1; min-width: 250px;">                <h4 style="margin: 0 0 8px 0; color: #333; font-size: 18px;">{data['title']}</h4>                <ul style="list-style: none; padding: 0; margin: 0; font-size: 13px; color: #555;">                    {features_html}                </ul>            </div>            <div style="flex-shrink: 0; display: flex; align-items: center; justify-content: center;">                <span style="background: #3498db; color: white; padding: 12px 20px; border-radius: 6px; font-size: 14px; font-weight: bold; display: inline-block;">Shop Now &rarr;</span>            </div>        </div>    </a></div>"""
-
-    def generate_vertical_card(data):
-        star_html = get_star_html(data['rating'])
-        return f"""<div style="margin-bottom: 25px; display: inline-block; width: 100%; max-width: 300px; vertical-align: top; margin-right: 15px;">    <a href="{data['link']}" target="_blank" rel="nofollow sponsored"         style="text-decoration: none; color: inherit; display: block; border: 1px solid #eee; border-radius: 12px; padding: 20px; background: #fff; box-shadow: 0 4px 15px rgba(0,0,0,0.06); transition: transform 0.2s; text-align: center;">                <div style="margin-bottom: 15px; height: 180px; display: flex; align-items: center; justify-content: center;">            <img src="{data['image']}" style="max-width: 100%; max-height: 100%; object-fit: contain;" alt="{data['title']}">        </div>        <div style="font-size: 11px; text-transform: uppercase; letter-spacing: 1px; color: #888; margin-bottom: 5px;">{data['badge_text']}</div>                <h4 style="margin: 0 0 10px 0; color: #222; font-size: 16px; line-height: 1.4; height: 45px; overflow: hidden;">{data['title']}</h4>                <div style="display: flex; justify-content: center; margin-bottom: 10px;">{star_html}</div>                <p style="font-size: 13px; color: #666; margin-bottom: 15px; line-height: 1.5; height: 40px; overflow: hidden;">{data['description']}</p>        <span style="background: #111; color: white; padding: 12px 0; width: 100%; border-radius: 6px; font-size: 14px; font-weight: bold; display: block;">            Check Price        </span>    </a></div>"""
-
-    design_option = st.selectbox("ডিজাইন স্টাইল নির্বাচন করুন:", ["Detailed Review Snippet (Pros/Cons সহ)", "Benefit Badge Style (ব্যাজ সহ)", "Featured Deal Box (অফার বক্স)", "Key Feature Callout (লিস্ট স্টাইল)", "Modern Vertical Card (লম্বা কার্ড)"])
+    # ডিজাইনগুলো মডিউল লোডের সময় একবারই compile হয় (AFFILIATE_TEMPLATES); ফোল্ডার বা আপলোড থেকে নিজস্ব টেমপ্লেটও চলে
+    design_templates = {**AFFILIATE_TEMPLATES, **load_template_files()}
+    with st.expander("📄 Custom Template"):
+        st.caption(f"নিজের HTML টেমপ্লেট আপলোড করুন অথবা `{AFFILIATE_TEMPLATE_DIR}/` ফোল্ডারে .html ফাইল রাখুন। Placeholder: " + ", ".join(f"`{{{{{f}}}}}`" for f in AFFILIATE_FIELDS))
+        custom_template_file = st.file_uploader("Template file (.html):", type=["html", "htm"], key="aff_template_file")
+        if custom_template_file:
+            try:
+                custom_name = os.path.splitext(custom_template_file.name)[0]
+                design_templates[f"📄 {custom_name}"] = CompiledTemplate(custom_name, custom_template_file.getvalue().decode("utf-8"))
+            except (UnicodeDecodeError, ValueError) as e:
+                st.error(f"Template error: {e}")
+
+    design_option = st.selectbox("ডিজাইন স্টাইল নির্বাচন করুন:", list(design_templates))
     
-    for i, prod in enumerate(st.session_state.aff_products):
-        with st.expander(f"🛒 Product {i+1} Details", expanded=True):
-            col1, col2 = st.columns(2)
-            with col1:
-                st.session_state.aff_products[i]['title'] = st.text_input(f"Product Title #{i+1}", key=f"title_{i}")
-                st.session_state.aff_products[i]['link'] = st.text_input(f"Affiliate Link #{i+1}", key=f"link_{i}")
-                st.session_state.aff_products[i]['badge_text'] = st.text_input(f"Badge Text #{i+1} (e.g. Best Overall)", key=f"badge_{i}")
-            with col2:
-                st.session_state.aff_products[i]['image'] = st.text_input(f"Image URL #{i+1}", key=f"img_{i}")
-                st.session_state.aff_products[i]['rating'] = st.number_input(f"Rating (1-5) #{i+1}", min_value=1.0, max_value=5.0, value=4.5, step=0.1, key=f"rating_{i}")
-                st.session_state.aff_products[i]['badge_color'] = st.color_picker(f"Badge Color #{i+1}", "#343a40", key=f"color_{i}")
-            st.session_state.aff_products[i]['description'] = st.text_area(f"Description #{i+1}", key=f"desc_{i}", height=70)
-            c1, c2 = st.columns(2)
-            with c1:
-                st.session_state.aff_products[i]['pros'] = st.text_area(f"Pros (Line by line) #{i+1}", key=f"pros_{i}", height=100)
-            with c2:
-                st.session_state.aff_products[i]['cons'] = st.text_area(f"Cons (Line by line) #{i+1}", key=f"cons_{i}", height=100)
-
-    col_btn1, col_btn2 = st.columns([1, 4])
-    with col_btn1:
-        if st.button("➕ Add Product"):
-            st.session_state.aff_products.append({'id': len(st.session_state.aff_products)})
-            st.rerun()
-    with col_btn2:
-        if len(st.session_state.aff_products) > 1:
-            if st.button("❌ Remove Last"):
-                st.session_state.aff_products.pop()
+    aff_mode = st.radio("Input Mode:", ["Manual Entry", "Product Feed (CSV/JSON/Amazon)"], horizontal=True)
+
+    if aff_mode == "Manual Entry":
+        for i, prod in enumerate(st.session_state.aff_products):
+            with st.expander(f"🛒 Product {i+1} Details", expanded=True):
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.session_state.aff_products[i]['title'] = st.text_input(f"Product Title #{i+1}", key=f"title_{i}")
+                    st.session_state.aff_products[i]['link'] = st.text_input(f"Affiliate Link #{i+1}", key=f"link_{i}")
+                    st.session_state.aff_products[i]['badge_text'] = st.text_input(f"Badge Text #{i+1} (e.g. Best Overall)", key=f"badge_{i}")
+                with col2:
+                    st.session_state.aff_products[i]['image'] = st.text_input(f"Image URL #{i+1}", key=f"img_{i}")
+                    st.session_state.aff_products[i]['rating'] = st.number_input(f"Rating (1-5) #{i+1}", min_value=1.0, max_value=5.0, value=4.5, step=0.1, key=f"rating_{i}")
+                    st.session_state.aff_products[i]['badge_color'] = st.color_picker(f"Badge Color #{i+1}", "#343a40", key=f"color_{i}")
+                st.session_state.aff_products[i]['description'] = st.text_area(f"Description #{i+1}", key=f"desc_{i}", height=70)
+                c1, c2 = st.columns(2)
+                with c1:
+                    st.session_state.aff_products[i]['pros'] = st.text_area(f"Pros (Line by line) #{i+1}", key=f"pros_{i}", height=100)
+                with c2:
+                    st.session_state.aff_products[i]['cons'] = st.text_area(f"Cons (Line by line) #{i+1}", key=f"cons_{i}", height=100)
+
+        col_btn1, col_btn2 = st.columns([1, 4])
+        with col_btn1:
+            if st.button("➕ Add Product"):
+                st.session_state.aff_products.append({'id': len(st.session_state.aff_products)})
                 st.rerun()
+        with col_btn2:
+            if len(st.session_state.aff_products) > 1:
+                if st.button("❌ Remove Last"):
+                    st.session_state.aff_products.pop()
+                    st.rerun()
 
-    st.divider()
+        st.divider()
 
-    if st.button("🚀 Generate Code & Preview"):
-        full_html_output = ""
-        for p in st.session_state.aff_products:
-            data = {
-                'title': p.get('title', 'Sample Product'),
-                'link': p.get('link', '#'),
-                'image': p.get('image', 'https://via.placeholder.com/150'),
-                'rating': p.get('rating', 4.5),
-                'description': p.get('description', 'Great product description here.'),
-                'badge_text': p.get('badge_text', 'Best Choice'),
-                'badge_color': p.get('badge_color', '#000000'),
-                'pros': p.get('pros', ''),
-                'cons': p.get('cons', '')
-            }
-            if "Detailed Review" in design_option:
-                full_html_output += generate_detailed_review(data)
-            elif "Benefit Badge" in design_option:
-                full_html_output += generate_benefit_badge(data)
-            elif "Featured Deal" in design_option:
-                full_html_output += generate_featured_deal(data)
-            elif "Key Feature" in design_option:
-                full_html_output += generate_feature_callout(data)
-            elif "Vertical Card" in design_option:
-                full_html_output += generate_vertical_card(data)
-
-        disclosure = '<div style="font-size: 11px; color: #888; margin-top: 15px; font-style: italic; text-align: right; clear: both;">As an Amazon Associate I earn from qualifying purchases.</div>'
-        full_html_output += disclosure
-
-        st.subheader("📝 Generated HTML Code")
-        st.code(full_html_output, language='html')
-        st.subheader("👁️ Live Preview")
-        components.html(full_html_output, height=600, scrolling=True)
+        if st.button("🚀 Generate Code & Preview"):
+            full_html_output = render_affiliate_boxes(st.session_state.aff_products, design_templates[design_option])
 
+            st.subheader("📝 Generated HTML Code")
+            st.code(full_html_output, language='html')
+            st.subheader("👁️ Live Preview")
+            components.html(full_html_output, height=600, scrolling=True)
+
+    else:
+        st.caption("CSV/JSON ফাইল (title, link, image, rating, description, badge_text, badge_color, pros, cons, ঐচ্ছিক article ও design কলাম) অথবা Amazon ট্যাবের Batch রেজাল্ট থেকে সব প্রোডাক্টের বক্স একবারে তৈরি করুন। `article` কলাম অনুযায়ী প্রতিটি আর্টিকেলের আলাদা HTML ফাইল হবে।")
+        feed_source = st.radio("Products from:", ["Upload CSV/JSON", "Amazon Batch Results"], horizontal=True)
+        amazon_tag = st.text_input("Amazon Associate Tag (optional):", placeholder="yourtag-20", help="Amazon লিংকের শেষে ?tag= হিসেবে যোগ হবে।")
+        feed_df = None
+        try:
+            if feed_source == "Upload CSV/JSON":
+                feed_file = st.file_uploader("Product feed:", type=["csv", "json"], key="aff_feed_file")
+                if feed_file:
+                    feed_df = read_uploaded_feed(feed_file.name, feed_file.getvalue(), amazon_tag.strip())
+            elif st.session_state.get('amazon_batch_results'):
+                feed_df = amazon_results_to_feed(st.session_state.amazon_batch_results, amazon_tag.strip())
+            else:
+                st.info("আগে Amazon ট্যাবের Batch Scrape মোডে প্রোডাক্ট স্ক্র্যাপ করুন।")
+        except (ValueError, UnicodeDecodeError, pd.errors.ParserError) as e:
+            st.error(f"Error reading feed: {e}")
+
+        if feed_df is not None:
+            feed_clean, feed_issues = prepare_feed_cached(feed_df)
+            article_count = feed_clean['article'].replace("", "affiliate-boxes").nunique()
+            st.caption(f"{len(feed_clean)} products · {article_count} article(s)")
+            st.dataframe(feed_clean, use_container_width=True, hide_index=True, height=250)
+            if len(feed_issues):
+                with st.expander(f"⚠️ {len(feed_issues)} validation issue(s)"):
+                    st.dataframe(feed_issues, use_container_width=True, hide_index=True)
+
+            if len(feed_clean) and st.button("🚀 Generate All Articles", type="primary"):
+                feed_start = time.perf_counter()
+                feed_articles = render_affiliate_feed(feed_clean, design_templates[design_option], design_templates)
+                feed_elapsed = time.perf_counter() - feed_start
+                st.success(f"✅ {len(feed_clean)} product boxes in {len(feed_articles)} article(s) — {feed_elapsed * 1000:.0f} ms")
+                st.download_button("⬇️ Download All Articles (ZIP)", build_articles_zip(feed_articles), file_name="affiliate_articles.zip", mime="application/zip", type="primary")
+                preview_article = next(iter(feed_articles))
+                st.subheader(f"👁️ Preview: {preview_article}")
+                st.code(feed_articles[preview_article], language='html')
+                components.html(feed_articles[preview_article], height=600, scrolling=True)
+
+    with st.expander("🧪 Template Benchmark"):
+        bench_boxes = st.select_slider("Product boxes per design:", options=[500, 1000, 2000, 5000], value=2000)
+        if st.button("Run Template Benchmark"):
+            bench_df = pd.DataFrame(benchmark_affiliate_templates(bench_boxes))
+            st.dataframe(bench_df.style.format({"ms": "{:.1f}", "boxes_per_sec": "{:,.0f}", "kb": "{:,.0f}"}), use_container_width=True, hide_index=True)
+
+run_timer.lap("Affiliate Code")
 # ==========================
 # TAB 4: IMAGE OPTIMIZER (NEW FEATURE)
 # ==========================
 with tab_optimizer:
+    import pandas as pd
+    from image_pipeline import (WEBP_QUALITY, DEFAULT_WIDTHS, MAX_IMAGE_PIXELS, avif_supported, build_picture_html, build_webp_zip,
+                                content_hash, convert_images_parallel, generate_variants, variant_file_name)
     st.header("🚀 WebP Image Optimizer")
     st.info("আপনার ছবি আপলোড করুন। এটি অটোমেটিক কম্প্রেস হবে এবং WebP ফরম্যাটে কনভার্ট হয়ে যাবে। এটি ব্লগের লোডিং স্পিড বাড়াতে সাহায্য করে।")
 
     uploaded_files = st.file_uploader("Upload Images (JPG, PNG)", type=['png', 'jpg', 'jpeg'], accept_multiple_files=True)
-
-    if uploaded_files:
+    optimizer_mode = st.radio("Output:", ["Single WebP", "Responsive srcset (multiple sizes)"], horizontal=True)
+    if optimizer_mode != "Single WebP":
+        available_formats = ["WEBP", "AVIF"] if avif_supported() else ["WEBP"]
+        o_col1, o_col2 = st.columns(2)
+        with o_col1:
+            ladder_widths = st.multiselect("Widths (px):", [320, 480, 640, 768, 960, 1280, 1600, 1920, 2560], default=list(DEFAULT_WIDTHS))
+            ladder_formats = st.multiselect("Formats:", available_formats, default=["WEBP"], help="AVIF ছোট হয় কিন্তু এনকোড হতে বেশি সময় লাগে।")
+        with o_col2:
+            ladder_quality = st.slider("Quality:", 30, 95, WEBP_QUALITY)
+            ladder_budget_kb = st.number_input("Max size per image (KB, 0 = off):", min_value=0, max_value=5000, value=0, step=10, help="দিলে quality অটোমেটিক কমিয়ে (binary search) প্রতিটি ফাইল এই সাইজের মধ্যে রাখা হবে।")
+        ladder_base_url = st.text_input("Image base URL (for the snippet):", placeholder="https://example.com/wp-content/uploads/2024/05/")
+        if not ladder_widths or not ladder_formats:
+            st.warning("অন্তত একটি width এবং একটি format বেছে নিন।")
+            uploaded_files = []
+
+    if uploaded_files and optimizer_mode == "Single WebP":
         st.divider()
         st.subheader("🎉 Optimized Images")
-        
+
+        # সব ছবি একসাথে সব CPU কোরে কনভার্ট হয়; আগে কনভার্ট হওয়া ছবি (একই content) ক্যাশ থেকে আসে
+        images = [(f.name, f.getvalue()) for f in uploaded_files]
+        results = [None] * len(images)
+        progress = st.progress(0.0, text=f"Converting 0 / {len(images)}")
+        for done, (i, result) in enumerate(convert_images_parallel(images, get_image_pool(), cache=get_webp_result_cache()), start=1):
+            results[i] = result
+            progress.progress(done / len(images), text=f"Converted {done} / {len(images)} — {images[i][0]}")
+        progress.empty()
+
+        converted = [(os.path.splitext(name)[0] + ".webp", r["webp"]) for (name, _), r in zip(images, results) if "error" not in r]
+        total_original = sum(r["original_size"] for r in results if "error" not in r) / 1024
+        total_optimized = sum(r["webp_size"] for r in results if "error" not in r) / 1024
+
+        s_col1, s_col2 = st.columns([3, 1])
+        with s_col1:
+            if total_original:
+                st.markdown(f"**Total:** `{total_original:.1f} KB` → `{total_optimized:.1f} KB` (Saved **{(1 - total_optimized / total_original) * 100:.1f}%** 📉)")
+        with s_col2:
+            if len(converted) == 1:
+                st.download_button("⬇️ Download WebP", data=converted[0][1], file_name=converted[0][0], mime="image/webp", type="primary", use_container_width=True)
+            elif converted:
+                zip_key = tuple(content_hash(webp) for _, webp in converted)
+                if st.session_state.get("webp_zip_key") != zip_key:
+                    st.session_state.webp_zip = build_webp_zip(converted)
+                    st.session_state.webp_zip_key = zip_key
+                st.download_button("⬇️ Download all as ZIP", data=st.session_state.webp_zip, file_name="optimized_images.zip", mime="application/zip", type="primary", use_container_width=True)
+
         # Grid layout for results
         cols = st.columns(3)
         
-        for i, uploaded_file in enumerate(uploaded_files):
-            # Process each image
-            optimized_buffer = convert_image_to_webp(uploaded_file)
-            
-            if optimized_buffer:
-                # Calculate size savings (Optional visualization)
-                original_size = uploaded_file.size / 1024 # KB
-                optimized_size = optimized_buffer.getbuffer().nbytes / 1024 # KB
-                saving = original_size - optimized_size
-                saving_percent = (saving / original_size) * 100
-                
-                # Display in grid
-                with cols[i % 3]:
-                    with st.container(border=True):
-                        # Show original image preview
-                        st.image(uploaded_file, caption="Original Preview", use_container_width=True)
-                        
-                        st.markdown(f"""
-                        **Stats:**
-                        - Original: `{original_size:.1f} KB`
-                        - Optimized: `{optimized_size:.1f} KB`
-                        - Saved: **{saving_percent:.1f}%** 📉
-                        """)
-                        
-                        # Download Button
-                        file_name = os.path.splitext(uploaded_file.name)[0] + ".webp"
-                        st.download_button(
-                            label="⬇️ Download WebP",
-                            data=optimized_buffer,
-                            file_name=file_name,
-                            mime="image/webp",
-                            key=f"dl_{i}",
-                            type="primary",
-                            use_container_width=True
-                        )
+        for i, (uploaded_file, result) in enumerate(zip(uploaded_files, results)):
+            with cols[i % 3]:
+                with st.container(border=True):
+                    if "error" in result:
+                        st.error(f"{uploaded_file.name}: {result['error']}")
+                        continue
+
+                    # Calculate size savings (Optional visualization)
+                    original_size = result["original_size"] / 1024 # KB
+                    optimized_size = result["webp_size"] / 1024 # KB
+                    saving_percent = ((original_size - optimized_size) / original_size) * 100
 
+                    # Preview হিসেবে ছোট WebP টাই দেখানো হয়, অরিজিনাল ফুল-সাইজ ছবি না
+                    st.image(result["webp"], caption=uploaded_file.name, use_container_width=True)
+                    
+                    st.markdown(f"""
+                    **Stats:** ({result['width']}×{result['height']})
+                    - Original: `{original_size:.1f} KB`
+                    - Optimized: `{optimized_size:.1f} KB`
+                    - Saved: **{saving_percent:.1f}%** 📉
+                    - Peak memory: `{result['peak_bytes'] / 1024 / 1024:.1f} MB`
+                    """)
+                    if result.get("downscaled_from"):
+                        st.caption(f"⚠️ Downscaled from {result['downscaled_from'][0]}×{result['downscaled_from'][1]} (pixel limit {MAX_IMAGE_PIXELS / 1e6:.0f} MP)")
+
+    elif uploaded_files:
+        st.divider()
+        st.subheader("📐 Responsive Variants")
+        images = [(f.name, f.getvalue()) for f in uploaded_files]
+        results = [None] * len(images)
+        progress = st.progress(0.0, text=f"Generating 0 / {len(images)}")
+        variant_options = {
+            "widths": tuple(ladder_widths),
+            "formats": tuple(ladder_formats),
+            "quality": ladder_quality,
+            "max_bytes": ladder_budget_kb * 1024 if ladder_budget_kb else None
+        }
+        for done, (i, result) in enumerate(convert_images_parallel(images, get_image_pool(), worker=generate_variants, cache=get_webp_result_cache(), **variant_options), start=1):
+            results[i] = result
+            progress.progress(done / len(images), text=f"Generated {done} / {len(images)} — {images[i][0]}")
+        progress.empty()
+
+        all_variants = []
+        for (name, _), result in zip(images, results):
+            if "error" not in result:
+                base_name = os.path.splitext(name)[0]
+                all_variants += [(variant_file_name(base_name, v), v["bytes"]) for v in result["variants"]]
+        if all_variants:
+            zip_key = ("variants",) + tuple(content_hash(b) for _, b in all_variants)
+            if st.session_state.get("variants_zip_key") != zip_key:
+                st.session_state.variants_zip = build_webp_zip(all_variants)
+                st.session_state.variants_zip_key = zip_key
+            st.download_button(f"⬇️ Download all {len(all_variants)} variants as ZIP", data=st.session_state.variants_zip, file_name="responsive_images.zip", mime="application/zip", type="primary")
+
+        for (name, _), result in zip(images, results):
+            with st.container(border=True):
+                if "error" in result:
+                    st.error(f"{name}: {result['error']}")
+                    continue
+                base_name = os.path.splitext(name)[0]
+                v_col1, v_col2 = st.columns([1, 2])
+                with v_col1:
+                    smallest = result["variants"][0]
+                    st.image(smallest["bytes"], caption=f"{name} ({result['width']}×{result['height']})", use_container_width=True)
+                    st.caption(f"Peak memory: {result['peak_bytes'] / 1024 / 1024:.1f} MB")
+                    if result.get("downscaled_from"):
+                        st.caption(f"⚠️ Limited to {max(v['width'] for v in result['variants'])}px by the {MAX_IMAGE_PIXELS / 1e6:.0f} MP pixel limit")
+                with v_col2:
+                    st.dataframe(
+                        pd.DataFrame([{"file": variant_file_name(base_name, v), "size (KB)": round(v["size"] / 1024, 1), "quality": v["quality"]} for v in result["variants"]]),
+                        hide_index=True, use_container_width=True
+                    )
+                st.code(build_picture_html(base_name, result["variants"], alt=base_name.replace("-", " ").replace("_", " "), base_url=ladder_base_url), language="html")
+
+run_timer.lap("Image Optimizer")
 # ==========================
 # TAB 5: CONTENT PLANNER (Keep Original)
 # ==========================
 with tab_planner:
+    import pandas as pd
     st.header("🗂️ Keyword Cluster & Content Planner")
     st.info("আপনার কিওয়ার্ড ক্লাস্টারগুলো এখানে সেভ রাখুন এবং কাজের অগ্রগতি ট্র্যাক করুন। ডাটা অটোমেটিক সেভ থাকবে।")
 
-    # Load Data
-    if 'planner_data' not in st.session_state:
-        st.session_state.planner_data = load_planner_data()
+    # Load Data (একবার parse হওয়া index; metric গুলো এর counter থেকে আসে)
+    planner = get_planner_index()
+    store = get_planner_store()
 
     # --- Dashboard Metrics ---
-    total_keywords_count = 0
-    completed_keywords_count = 0
-
-    for item in st.session_state.planner_data:
-        kws = [k.strip() for k in item.get('keywords', '').split(';') if k.strip()]
-        total_keywords_count += len(kws)
-        checked = item.get('checked_keywords', [])
-        completed_keywords_count += len(checked)
-
-    pending_keywords_count = total_keywords_count - completed_keywords_count
+    total_keywords_count = planner.total_keywords
+    completed_keywords_count = planner.completed_keywords
+    pending_keywords_count = planner.pending_keywords
     
     col_metrics, col_actions = st.columns([3, 1])
 
@@ -596,15 +780,21 @@ with tab_planner:
         st.write("") 
         if total_keywords_count > 0:
             if st.button("🗑️ সব ডাটা মুছে ফেলুন", type="primary", use_container_width=True):
-                st.session_state.planner_data = []
-                save_planner_data([])
+                planner.clear()
+                store.clear()
                 st.rerun()
+            st.download_button("⬇️ Export JSON", lambda: planner_to_json(store.list_clusters()), file_name=PLANNER_FILE, mime="application/json", use_container_width=True)
 
     st.divider()
 
     # --- Data Input Section ---
     with st.expander("➕ Add New Clusters (Upload CSV or Paste Text)", expanded=(total_keywords_count == 0)):
-        tab_input_text, tab_input_csv = st.tabs(["Paste Text", "Upload CSV"])
+        d_col1, d_col2 = st.columns(2)
+        with d_col1:
+            drop_exact_dups = st.checkbox("Drop exact duplicate keywords", value=True, help="ছোট/বড় হাত, punctuation বাদ দিয়ে একই কিওয়ার্ড (পুরো প্ল্যান জুড়ে) বাদ দেওয়া হবে।")
+        with d_col2:
+            near_dup_threshold = st.slider("Near-duplicate similarity:", 0.5, 0.95, 0.7, 0.05, help="MinHash/LSH দিয়ে এর চেয়ে বেশি মিল থাকা কিওয়ার্ডগুলো merge report এ আসবে।")
+        tab_input_text, tab_input_csv, tab_input_cluster = st.tabs(["Paste Text", "Upload CSV", "Cluster Raw Keywords"])
         
         with tab_input_text:
             st.caption("Format: `Cluster Label : YOUR LABEL Keywords: key1; key2; key3`")
@@ -613,91 +803,171 @@ with tab_planner:
                 matches = re.findall(r"Cluster Label\s*[:\|]\s*(.*?)\s*Keywords\s*[:\|]\s*(.*)", raw_text, re.IGNORECASE | re.MULTILINE)
                 
                 if matches:
-                    count = 0
-                    for match in matches:
-                        label = match[0].strip()
-                        keywords = match[1].strip()
-                        if not any(d['label'] == label for d in st.session_state.planner_data):
-                            st.session_state.planner_data.append({
-                                'label': label,
-                                'keywords': keywords,
-                                'done': False,
-                                'checked_keywords': [] 
-                            })
-                            count += 1
-                    save_planner_data(st.session_state.planner_data)
-                    st.success(f"✅ {count} new clusters added!")
+                    # আগে থাকা label index থেকেই O(1) এ বাদ পড়ে
+                    rows = [{'label': m[0].strip(), 'keywords': m[1].strip()} for m in matches if not planner.has_label(m[0].strip())]
+                    rows, st.session_state.planner_dedup_report = dedup_planner_import(rows, planner, near_dup_threshold, drop_exact_dups)
+                    added = store.add_clusters(rows)
+                    planner.add(added)
+                    st.success(f"✅ {len(added)} new clusters added!")
                     st.rerun()
                 else:
                     st.warning("No matching format found. Please check the input format.")
 
         with tab_input_csv:
+            st.caption("এক রো তে একটি ক্লাস্টার (keywords `;` দিয়ে আলাদা) অথবা এক রো তে একটি কিওয়ার্ড + তার cluster কলাম — দুটোই চলবে। বড় ফাইল chunk ধরে পড়া হয়।")
             uploaded_file = st.file_uploader("Upload CSV/Excel file", type=['csv', 'xlsx'])
-            if uploaded_file:
+            if uploaded_file and st.button("📥 Import File"):
+                import_progress = st.progress(0.0, text="Reading file...")
+                deduper = PlannerDeduper(planner, near_dup_threshold, drop_exact_dups)
                 try:
-                    if uploaded_file.name.endswith('.csv'):
-                        df = pd.read_csv(uploaded_file)
-                    else:
-                        df = pd.read_excel(uploaded_file)
-                    
-                    label_cols = [c for c in df.columns if 'label' in c.lower() or 'cluster' in c.lower()]
-                    kw_cols = [c for c in df.columns if 'keyword' in c.lower()]
-                    
-                    label_col = label_cols[0] if label_cols else None
-                    kw_col = None
-
-                    if kw_cols:
-                        for col in kw_cols:
-                            sample = df[col].dropna().iloc[0] if not df[col].dropna().empty else ""
-                            if isinstance(sample, str) and (';' in sample or len(sample) > 5):
-                                kw_col = col
-                                break
-                        if not kw_col:
-                            kw_col = kw_cols[0]
-                    
-                    if label_col and kw_col:
-                        count = 0
-                        for _, row in df.iterrows():
-                            label = str(row[label_col]).strip()
-                            keywords = str(row[kw_col]).strip()
-                            if not any(d['label'] == label for d in st.session_state.planner_data):
-                                st.session_state.planner_data.append({
-                                    'label': label,
-                                    'keywords': keywords,
-                                    'done': False,
-                                    'checked_keywords': []
-                                })
-                                count += 1
-                        save_planner_data(st.session_state.planner_data)
-                        st.success(f"✅ {count} clusters imported from file!")
-                        st.rerun()
-                    else:
-                        st.error("Could not identify 'Cluster Label' and 'Keywords' columns. Ensure CSV headers are correct.")
+                    stats = None
+                    for stats in import_planner_table(uploaded_file, planner, store, deduper):
+                        import_progress.progress(stats["fraction"], text=f"{stats['rows']:,} rows · {stats['clusters']:,} clusters · {stats['rows_per_sec']:,.0f} rows/sec")
+                    with st.spinner("Checking near-duplicates..."):
+                        st.session_state.planner_dedup_report = deduper.finish()
+                    if stats:
+                        st.session_state.planner_import_stats = stats
+                    st.rerun()
                 except Exception as e:
                     st.error(f"Error reading file: {e}")
+            import_stats = st.session_state.pop('planner_import_stats', None)
+            if import_stats:
+                st.success(f"✅ {import_stats['clusters']} clusters ({import_stats['keywords']} keywords) imported from {import_stats['rows']:,} rows in {import_stats['seconds']:.1f}s ({import_stats['rows_per_sec']:,.0f} rows/sec)")
+
+        with tab_input_cluster:
+            st.caption("ক্লাস্টার ছাড়া শুধু কিওয়ার্ডের লিস্ট দিন (এক লাইনে একটি, অথবা CSV এর keyword কলাম)। অফলাইনে মিল অনুযায়ী ক্লাস্টার তৈরি হবে।")
+            raw_kw_text = st.text_area("Paste keywords:", height=150, key="cluster_raw_text")
+            raw_kw_file = st.file_uploader("Or upload a keyword list (TXT/CSV):", type=["txt", "csv"], key="cluster_raw_file")
+            cl_col1, cl_col2 = st.columns(2)
+            with cl_col1:
+                cluster_threshold = st.slider("Cluster similarity:", 0.3, 0.9, CLUSTER_THRESHOLD, 0.05, help="বেশি হলে ছোট কিন্তু বেশি মিলওয়ালা ক্লাস্টার।")
+            with cl_col2:
+                use_serp_overlap = st.checkbox("Use cached SERP overlap", value=False, help="SEO ট্যাবে আগে রিসার্চ করা কিওয়ার্ডের ক্যাশড রেজাল্ট থাকলে একই URL র‍্যাঙ্ক করা কিওয়ার্ডগুলো এক ক্লাস্টারে আসবে। কোনো API কল হয় না।")
+            if st.button("🧩 Build Clusters"):
+                raw_keywords = parse_keyword_list(raw_kw_text)
+                if raw_kw_file:
+                    raw_keywords += parse_keyword_list(raw_kw_file.getvalue().decode("utf-8", errors="replace"), is_csv=raw_kw_file.name.endswith(".csv"))
+                if raw_keywords:
+                    cluster_start = time.perf_counter()
+                    with st.spinner(f"Clustering {len(raw_keywords)} keywords..."):
+                        serp_urls = serp_overlap_urls(raw_keywords, SERP_LOCATIONS[country]) if use_serp_overlap else None
+                        st.session_state.planner_cluster_preview = cluster_keywords(raw_keywords, cluster_threshold, serp_urls)
+                    st.session_state.planner_cluster_seconds = time.perf_counter() - cluster_start
+                else:
+                    st.warning("কোনো কিওয়ার্ড পাওয়া যায়নি।")
+
+            preview = st.session_state.get('planner_cluster_preview')
+            if preview:
+                elapsed = st.session_state.get('planner_cluster_seconds', 0.0)
+                st.caption(f"{len(preview)} clusters in {elapsed:.2f}s ({len(preview) / elapsed if elapsed else 0:.0f} clusters/sec)")
+                st.dataframe(pd.DataFrame([{'label': c['label'], 'size': len(split_keywords(c['keywords'])), 'keywords': c['keywords']} for c in preview]), use_container_width=True, hide_index=True, height=250)
+                if st.button("➕ Add Clusters to Planner", type="primary"):
+                    rows = [c for c in preview if not planner.has_label(c['label'])]
+                    rows, st.session_state.planner_dedup_report = dedup_planner_import(rows, planner, near_dup_threshold, drop_exact_dups)
+                    planner.add(store.add_clusters(rows))
+                    del st.session_state.planner_cluster_preview
+                    st.rerun()
+
+    with st.expander("🧪 Clustering Benchmark"):
+        st.caption("নির্দিষ্ট (seeded) কিওয়ার্ড লিস্টে ক্লাস্টারিং এর গতি মাপুন।")
+        bench_size = st.select_slider("Benchmark keywords:", options=[5000, 10000, 20000, 50000], value=20000)
+        if st.button("Run Clustering Benchmark"):
+            with st.spinner("Clustering benchmark list..."):
+                bench = benchmark_keyword_clustering(bench_size)
+            b1, b2, b3, b4 = st.columns(4)
+            b1.metric("Unique Keywords", bench["keywords"])
+            b2.metric("Clusters", bench["clusters"])
+            b3.metric("Keywords/sec", f"{bench['keywords_per_sec']:.0f}")
+            b4.metric("Clusters/sec", f"{bench['clusters_per_sec']:.0f}")
+
+    # --- Duplicate / Merge Report ---
+    if total_keywords_count > 0 and st.button("🔍 Scan Plan for Duplicates"):
+        _, st.session_state.planner_dedup_report = dedup_planner_import([], planner, near_dup_threshold, scan_existing=True)
+    dedup_report = st.session_state.get('planner_dedup_report')
+    if dedup_report is not None:
+        with st.expander(f"🔁 Duplicate Report ({len(dedup_report)} findings)", expanded=bool(dedup_report)):
+            if dedup_report:
+                report_df = pd.DataFrame(dedup_report)
+                exact_count = int((report_df['type'] == 'exact').sum())
+                st.caption(f"Exact: {exact_count} · Near-duplicate: {len(report_df) - exact_count}")
+                st.dataframe(report_df, use_container_width=True, hide_index=True)
+                st.download_button("⬇️ Download Report (CSV)", functools.partial(report_df.to_csv, index=False), file_name="planner_duplicates.csv", mime="text/csv")
+            else:
+                st.success("কোনো duplicate পাওয়া যায়নি।")
 
     # --- Display Cards (GRID LAYOUT) ---
     st.subheader("Your Content Plan")
     
-    filter_status = st.radio("Filter:", ["All", "Pending", "Completed"], horizontal=True)
+    f_col1, f_col2, f_col3 = st.columns([2, 2, 1])
+    with f_col1:
+        filter_status = st.radio("Filter:", ["All", "Pending", "Completed"], horizontal=True)
+    with f_col2:
+        planner_view = st.radio("View:", ["Cards", "Compact Table"], horizontal=True, help="Compact Table: প্রতিটি ক্লাস্টার একটি এডিটেবল টেবিল, সব পরিবর্তন একবারে সেভ হয়।")
+    with f_col3:
+        page_size = st.selectbox("Clusters per page:", [6, 9, 12, 24, 48], index=1)
     
-    display_data = []
-    for i, item in enumerate(st.session_state.planner_data):
-        item['original_index'] = i 
-        if filter_status == "All":
-            display_data.append(item)
-        elif filter_status == "Pending" and not item['done']:
-            display_data.append(item)
-        elif filter_status == "Completed" and item['done']:
-            display_data.append(item)
+    display_data = planner.filtered(filter_status)
+
+    # --- Pagination: শুধু বর্তমান পেজের ক্লাস্টারগুলোর widget তৈরি হয় ---
+    page_count = max(1, math.ceil(len(display_data) / page_size))
+    if st.session_state.get('planner_page', 1) > page_count:
+        st.session_state.planner_page = page_count
+    if page_count > 1:
+        p_col1, p_col2 = st.columns([1, 4])
+        with p_col1:
+            current_page = st.number_input("Page:", min_value=1, max_value=page_count, step=1, key="planner_page")
+        with p_col2:
+            st.write("")
+            st.caption(f"Page {current_page} of {page_count} · {len(display_data)} clusters")
+    else:
+        current_page = 1
+    page_data = display_data[(current_page - 1) * page_size:current_page * page_size]
 
     if not display_data:
         st.info("No clusters found matching your filter.")
+    elif planner_view == "Compact Table":
+        # সব এডিট form এর ভেতরে, তাই প্রতিটি ক্লিকে rerun হয় না; "Save" চাপলে একবারে commit
+        with st.form("planner_compact_form"):
+            edited_tables = {}
+            for item in page_data:
+                c_col1, c_col2 = st.columns([0.8, 0.2])
+                with c_col1:
+                    st.markdown(f"**{item['label']}**")
+                with c_col2:
+                    edited_tables[item['id']] = {"done": st.checkbox("Mark Complete", value=item['done'], key=f"c_status_{item['id']}")}
+                edited_tables[item['id']]["table"] = st.data_editor(
+                    pd.DataFrame({"done": [kw in item['checked'] for kw in item['keywords']], "keyword": item['keywords']}),
+                    key=f"c_table_{item['id']}",
+                    num_rows="dynamic",
+                    hide_index=True,
+                    use_container_width=True,
+                    column_config={
+                        "done": st.column_config.CheckboxColumn("✅", width="small"),
+                        "keyword": st.column_config.TextColumn("Keyword", width="large")
+                    }
+                )
+            if st.form_submit_button("💾 Save Changes", type="primary"):
+                changed = 0
+                for cluster_id, edits in edited_tables.items():
+                    item = planner.get(cluster_id)
+                    table = edits["table"].dropna(subset=["keyword"])
+                    # একই কিওয়ার্ড দুবার থাকলে একটাই থাকে (প্রথম অবস্থান, শেষ checkbox মান)
+                    rows = list({str(kw).strip(): bool(pd.notna(done) and done) for done, kw in zip(table["done"], table["keyword"]) if str(kw).strip()}.items())
+                    if [kw for kw, _ in rows] != item['keywords'] or {kw for kw, done in rows if done} != item['checked']:
+                        store.save_cluster_keywords(cluster_id, rows)
+                        planner.replace_keywords(cluster_id, rows)
+                        changed += 1
+                    if edits["done"] != item['done']:
+                        store.set_done(cluster_id, edits["done"])
+                        planner.set_done(cluster_id, edits["done"])
+                        changed += 1
+                if changed:
+                    st.rerun()
     else:
         cols = st.columns(3)
         
-        for i, item in enumerate(display_data):
-            idx = item['original_index']
+        for i, item in enumerate(page_data):
+            cid = item['id']
             col = cols[i % 3] 
             
             with col:
@@ -709,32 +979,29 @@ with tab_planner:
                         title_style = "text-decoration: line-through; color: gray;" if item['done'] else "font-weight: bold; color: #1f77b4; font-size: 16px;"
                         st.markdown(f"<div style='{title_style}'>{item['label']}</div>", unsafe_allow_html=True)
                         
-                        is_done = st.checkbox("Mark Complete", value=item['done'], key=f"status_{idx}")
+                        is_done = st.checkbox("Mark Complete", value=item['done'], key=f"status_{cid}")
                         if is_done != item['done']:
-                            st.session_state.planner_data[idx]['done'] = is_done
-                            save_planner_data(st.session_state.planner_data)
+                            planner.set_done(cid, is_done)
+                            store.set_done(cid, is_done)
                             st.rerun()
 
                     with h_col2:
-                         if st.button("🗑️", key=f"del_c_{idx}", help="Delete Cluster"):
-                            st.session_state.planner_data.pop(idx)
-                            save_planner_data(st.session_state.planner_data)
+                         if st.button("🗑️", key=f"del_c_{cid}", help="Delete Cluster"):
+                            planner.delete(cid)
+                            store.delete_cluster(cid)
                             st.rerun()
                     
                     st.markdown("---")
                     
                     # --- Scrollable Keywords List ---
+                    keywords_list = item['keywords']
                     with st.container(height=250, border=False):
-                        keywords_list = [k.strip() for k in item['keywords'].split(';') if k.strip()]
-                        
                         if not keywords_list:
                             st.caption("No keywords.")
                         else:
-                            checked_kws = set(item.get('checked_keywords', []))
-                            
                             for kw in keywords_list:
-                                kw_key = f"chk_{idx}_{hash(kw)}"
-                                is_checked = kw in checked_kws
+                                kw_key = f"chk_{cid}_{hash(kw)}"
+                                is_checked = kw in item['checked']
                                 
                                 k_col1, k_col2 = st.columns([0.15, 0.85])
                                 
@@ -745,11 +1012,8 @@ with tab_planner:
                                     st.code(kw, language=None)
                                 
                                 if new_checked != is_checked:
-                                    if new_checked:
-                                        item.setdefault('checked_keywords', []).append(kw)
-                                    else:
-                                        item.setdefault('checked_keywords', []).remove(kw)
-                                    save_planner_data(st.session_state.planner_data)
+                                    planner.set_keyword_checked(cid, kw, new_checked)
+                                    store.set_keyword_checked(cid, kw, new_checked)
                                     st.rerun()
                     
                     with st.expander("⚙️ Edit"):
@@ -757,19 +1021,22 @@ with tab_planner:
                             "Remove:",
                             options=keywords_list,
                             default=keywords_list,
-                            key=f"edit_{idx}",
+                            key=f"edit_{cid}",
                             label_visibility="collapsed"
                         )
-                        if len(updated_keywords) != len(keywords_list) or set(updated_keywords) != set(keywords_list):
-                            new_keywords_str = "; ".join(updated_keywords)
-                            st.session_state.planner_data[idx]['keywords'] = new_keywords_str
-                            save_planner_data(st.session_state.planner_data)
+                        if len(updated_keywords) != len(keywords_list):
+                            kept = set(updated_keywords)
+                            removed = [k for k in keywords_list if k not in kept]
+                            planner.remove_keywords(cid, removed)
+                            store.remove_keywords(cid, removed)
                             st.rerun()
 
+run_timer.lap("Content Planner")
 # ==========================
 # TAB 6: BLOG FORMATTER (Keep Original)
 # ==========================
 with tab_formatter:
+    import pandas as pd
     st.header("📝 Blog Post Formatter")
     st.info("আপনার আর্টিকেলটি এখানে পেস্ট করুন। আমরা এটিকে সুন্দর, রেসপন্সিভ এবং SEO-Friendly HTML এ রূপান্তর করে দেব।")
 
@@ -779,244 +1046,538 @@ with tab_formatter:
         st.subheader("Design Settings")
         design_style = st.selectbox(
             "Select Design Style:", 
-            ["Modern Clean", "Classic Serif", "Magazine Focus"]
+            list(FORMATTER_STYLES)
         )
+        live_preview = st.checkbox("⚡ Live Preview", value=False, help="প্রতিবার লেখা বদলালেই (Ctrl+Enter / বাইরে ক্লিক) আপডেট হবে; শুধু বদলানো অংশগুলো আবার রেন্ডার হয়।")
+        show_html_code = st.checkbox("Show HTML Code", value=True, help="লম্বা লেখায় বন্ধ রাখলে প্রতি rerun এ ব্রাউজারে পাঠানো ডেটা অর্ধেক হয়।")
         st.write("---")
         if st.button("🔄 Convert to HTML", type="primary", use_container_width=True):
             st.session_state.do_convert = True
         
     with col_input:
         raw_blog_text = st.text_area(
-            "Paste your full blog content here (supports Basic Markdown like # Headers, - Lists, **Bold**):", 
+            "Paste your full blog content here (supports Markdown: # Headers, - / 1. Lists, **Bold**, *Italic*, [Links](url), ![Images](url), > Quotes, `code`, | Tables |):", 
             height=400,
             placeholder="# My Awesome Blog Post\n\nHere is the introduction...\n\n## Key Features\n- Feature 1\n- Feature 2"
         )
 
-    if st.session_state.get('do_convert') and raw_blog_text:
+    if (st.session_state.get('do_convert') or live_preview) and raw_blog_text:
         st.divider()
         st.subheader("🎉 Your Formatted HTML")
         
-        formatted_html = format_text_to_html(raw_blog_text, design_style)
+        formatted_html, format_stats = get_incremental_formatter().render(raw_blog_text, design_style)
+        st.caption(f"{format_stats['blocks']} blocks · {format_stats['rendered']} rendered, {format_stats['reused']} from cache · "
+                   f"{format_stats['ms']:.1f} ms · {format_stats['kb']:.1f} KB payload")
         
-        st.code(formatted_html, language='html')
+        if show_html_code:
+            st.code(formatted_html, language='html')
+        else:
+            st.download_button("⬇️ Download HTML", formatted_html, file_name="formatted_post.html", mime="text/html")
         st.subheader("👁️ Live Preview")
         components.html(formatted_html, height=600, scrolling=True)
         st.success("HTML generated successfully! Copy the code above and paste it into your CMS (WordPress Custom HTML block, Blogger HTML view, etc.).")
 
+    with st.expander("🧪 Formatter Benchmark"):
+        bench_words = st.select_slider("Document size (words):", options=[10000, 50000, 100000], value=50000)
+        if st.button("Run Formatter Benchmark"):
+            bench_df = pd.DataFrame(benchmark_text_formatter(bench_words, design_style))
+            st.dataframe(bench_df.style.format({"legacy_ms": "{:.1f}", "new_ms": "{:.1f}", "speedup": "{:.2f}×"}), use_container_width=True, hide_index=True)
+            st.caption("পুরনো ফরম্যাটার যা বোঝে শুধু সেই markup দিয়ে লেখা ডকুমেন্ট; 'identical' মানে দুটোর আউটপুট হুবহু এক। "
+                       "নতুনটি প্রতিটি লাইনে বেশি markup (লিংক, italic, কোড, টেবিল ...) খোঁজে, তাই এখানে পার্থক্য সামান্য; "
+                       "দুটোই লেখার দৈর্ঘ্যের সাথে linear।")
+
+run_timer.lap("Formatter")
 # ==========================
 # TAB 7: IMAGE TO TEXT (Keep Original)
 # ==========================
 with tab_ocr:
+    import pandas as pd
+    from ocr_engine import DEFAULT_PREPROCESS, HAS_PDF, PSM_MODES, UPLOAD_TYPES, document_kind, run_ocr_batch, safe_page_count
     st.header("📷 Image to Text (OCR)")
     st.info("যেকোনো ছবি আপলোড করুন, আমরা তার ভেতরের লেখাগুলো বের করে দেব।")
 
-    uploaded_image = st.file_uploader("Upload an Image (JPG, PNG)", type=["jpg", "png", "jpeg"])
-
-    if uploaded_image is not None:
-        col_img_view, col_text_view = st.columns(2)
-        
-        with col_img_view:
-            st.image(uploaded_image, caption="Uploaded Image", use_container_width=True)
-            if st.button("🔍 Extract Text", type="primary"):
-                st.session_state.do_ocr = True
-
-        with col_text_view:
-            if st.session_state.get('do_ocr'):
-                with st.spinner("Extracting text..."):
-                    try:
-                        image = Image.open(uploaded_image)
-                        extracted_text = pytesseract.image_to_string(image)
-                        
-                        st.subheader("📝 Extracted Text:")
-                        if extracted_text.strip():
-                            st.text_area("Copy text below:", value=extracted_text, height=300)
+    uploaded_images = st.file_uploader("Upload Images / Documents (JPG, PNG, TIFF" + (", PDF" if HAS_PDF else "") + ")", type=list(UPLOAD_TYPES), accept_multiple_files=True)
+
+    with st.expander("⚙️ OCR Settings"):
+        oc_col1, oc_col2 = st.columns(2)
+        with oc_col1:
+            ocr_lang = st.text_input("Language(s):", value="eng", help="Tesseract language code, e.g. eng, ben, eng+ben")
+            ocr_psm = st.selectbox("Page Layout (PSM):", list(PSM_MODES), format_func=PSM_MODES.get)
+        with oc_col2:
+            ocr_steps = st.multiselect("Preprocessing:", list(DEFAULT_PREPROCESS), default=list(DEFAULT_PREPROCESS))
+
+    if uploaded_images:
+        if st.button("🔍 Extract Text", type="primary"):
+            st.session_state.do_ocr = True
+
+        if st.session_state.get('do_ocr'):
+            # আগে OCR হওয়া ছবি/পেজ ক্যাশ থেকে আসে, তাই rerun এ আবার tesseract চলে না
+            ocr_files = [(f.name, f.getvalue()) for f in uploaded_images]
+            page_results = [[] for _ in ocr_files]
+            total_pages = sum(safe_page_count(name, data) for name, data in ocr_files)
+            progress = st.progress(0.0, text="Extracting text...")
+            done = 0
+            for file_index, result in run_ocr_batch(ocr_files, get_image_pool(), cache=get_ocr_result_cache(), config=f"--psm {ocr_psm}", lang=ocr_lang or "eng", steps=ocr_steps, workers=IMAGE_POOL_WORKERS):
+                page_results[file_index].append(result)
+                done += 1
+                progress.progress(min(done / total_pages, 1.0), text=f"{done} / {total_pages} page(s) done — {ocr_files[file_index][0]}")
+            progress.empty()
+
+            timing_rows = []
+            for (name, _), pages in zip(ocr_files, page_results):
+                for r in sorted(pages, key=lambda r: r["page"]):
+                    timing_rows.append({
+                        "file": name,
+                        "page": r["page"],
+                        "confidence": round(r.get("confidence", 0.0), 1),
+                        "words": r.get("words", 0),
+                        "skew (°)": r.get("skew", 0.0),
+                        "preprocess (ms)": round(r.get("preprocess_ms", 0.0)),
+                        "ocr (ms)": round(r.get("ocr_ms", 0.0)),
+                        "error": r.get("error", "")
+                    })
+            if any(r["error"] for r in timing_rows):
+                st.error("Error during extraction on some pages. Please make sure Tesseract OCR is installed on the server.")
+                st.info("Tip: If you are deploying on Streamlit Cloud, ensure `packages.txt` contains `tesseract-ocr`.")
+            st.dataframe(pd.DataFrame(timing_rows), hide_index=True, use_container_width=True)
+
+            all_text = []
+            for i, ((name, data), pages) in enumerate(zip(ocr_files, page_results)):
+                text = "\n\n".join(r["text"] for r in sorted(pages, key=lambda r: r["page"]) if r.get("text"))
+                all_text.append(f"===== {name} =====\n{text}")
+                with st.expander(f"📝 {name} ({len(pages)} page(s))", expanded=len(ocr_files) == 1):
+                    col_img_view, col_text_view = st.columns(2)
+                    with col_img_view:
+                        if document_kind(name) == "image":
+                            st.image(data, caption="Uploaded Image", use_container_width=True)
+                    with col_text_view:
+                        if text.strip():
+                            st.text_area("Copy text below:", value=text, height=300, key=f"ocr_text_{i}")
                         else:
                             st.warning("No text found in the image.")
-                            
-                    except Exception as e:
-                        st.error("Error during extraction. Please make sure Tesseract OCR is installed on the server.")
-                        st.caption(f"Details: {e}")
-                        st.info("Tip: If you are deploying on Streamlit Cloud, ensure `packages.txt` contains `tesseract-ocr`.")
+            if len(ocr_files) > 1:
+                st.download_button("⬇️ Download all text (.txt)", "\n\n".join(all_text).encode("utf-8"), file_name="ocr_text.txt", mime="text/plain")
 
+run_timer.lap("Image to Text")
 # ==========================
 # TAB 8: QUICK WRITER (SMART TEMPLATE)
 # ==========================
 with tab_writer:
+    import pandas as pd
     st.header("⚡ Smart Article Generator (Fill-in-the-Blanks)")
     st.info("এটি একটি 'Rule-Based' রাইটার। এটি আপনার দেওয়া তথ্যগুলোকে সুন্দর বাক্যে সাজিয়ে একটি এসইও ফ্রেন্ডলি ড্রাফট তৈরি করে দেবে।")
 
-    # --- INPUT SECTION ---
-    with st.container(border=True):
-        col1, col2 = st.columns(2)
-        with col1:
-            w_product = st.text_input("Product Name:", placeholder="Ex: Hugo Adjustable Cane")
-            w_keyword = st.text_input("Target Keyword:", placeholder="Ex: best walking cane for seniors")
-            w_audience = st.text_input("Target Audience:", placeholder="Ex: elderly people")
-        with col2:
-            w_rating = st.slider("Product Rating:", 1.0, 5.0, 4.5)
-            w_price_type = st.selectbox("Price Range:", ["Budget-Friendly", "Mid-Range", "Premium/Expensive"])
+    writer_mode = st.radio("Mode:", ["Single Draft", "Batch from Planner"], horizontal=True, key="writer_mode")
+
+    if writer_mode == "Single Draft":
+        # --- INPUT SECTION ---
+        with st.container(border=True):
+            col1, col2 = st.columns(2)
+            with col1:
+                w_product = st.text_input("Product Name:", placeholder="Ex: Hugo Adjustable Cane")
+                w_keyword = st.text_input("Target Keyword:", placeholder="Ex: best walking cane for seniors")
+                w_audience = st.text_input("Target Audience:", placeholder="Ex: elderly people")
+            with col2:
+                w_rating = st.slider("Product Rating:", 1.0, 5.0, 4.5)
+                w_price_type = st.selectbox("Price Range:", ["Budget-Friendly", "Mid-Range", "Premium/Expensive"])
     
-    st.write("---")
+        st.write("---")
     
-    col3, col4 = st.columns(2)
-    with col3:
-        st.markdown("**🔹 Key Features (প্রতি লাইনে একটি করে ফিচার লিখুন):**")
-        w_features = st.text_area("Features:", height=150, placeholder="Lightweight aluminum body\nErgonomic cushion handle\nAdjustable height settings")
-    with col4:
-        st.markdown("**🔹 Pros & Cons (প্রতি লাইনে একটি):**")
-        w_pros = st.text_area("Pros:", height=70, placeholder="Easy to carry\nVery durable")
-        w_cons = st.text_area("Cons:", height=70, placeholder="Limited color options")
-
-    # --- GENERATOR LOGIC ---
-    if st.button("📝 Generate Article Draft", type="primary"):
-        if w_product and w_keyword and w_features:
+        col3, col4 = st.columns(2)
+        with col3:
+            st.markdown("**🔹 Key Features (প্রতি লাইনে একটি করে ফিচার লিখুন):**")
+            w_features = st.text_area("Features:", height=150, placeholder="Lightweight aluminum body\nErgonomic cushion handle\nAdjustable height settings")
+        with col4:
+            st.markdown("**🔹 Pros & Cons (প্রতি লাইনে একটি):**")
+            w_pros = st.text_area("Pros:", height=70, placeholder="Easy to carry\nVery durable")
+            w_cons = st.text_area("Cons:", height=70, placeholder="Limited color options")
+
+        # --- GENERATOR LOGIC ---
+        if st.button("📝 Generate Article Draft", type="primary"):
+            if w_product and w_keyword and w_features:
             
-            # 1. Processing Lists
-            # ফিচারগুলোকে লিস্টে ভাগ করা এবং প্যারাগ্রাফে রূপান্তর করা
-            feat_list = [f.strip() for f in w_features.split('\n') if f.strip()]
-            pros_list = [p.strip() for p in w_pros.split('\n') if p.strip()]
-            cons_list = [c.strip() for c in w_cons.split('\n') if c.strip()]
-            
-            # ফিচারগুলোকে একটু বিস্তারিত বাক্যে রূপান্তর করা (Sentence Expansion)
-            expanded_features = ""
-            for i, feat in enumerate(feat_list):
-                starters = [
-                    f"First and foremost, the **{w_product}** comes with {feat}.",
-                    f"Another significant aspect is the {feat}, which makes it stand out.",
-                    f"Users will also appreciate the {feat}, ensuring a great experience.",
-                    f"Furthermore, the inclusion of {feat} adds tremendous value."
-                ]
-                # ঘুরিয়ে ফিরিয়ে বাক্য ব্যবহার করা
-                sentence = starters[i % len(starters)] 
-                expanded_features += f"- {sentence} This is particularly useful for {w_audience} because it solves common daily struggles.\n"
-
-            # 2. Building the Article (THE TEMPLATE)
-            article_body = f"""
-# {w_product} Review: The Best Choice for {w_keyword}?
-
-## Introduction
-Finding the **{w_keyword}** can be a daunting task, especially with so many options available in the market today. Whether you are looking for comfort, durability, or style, making the right choice is crucial.
-
-Today, we are diving deep into the **{w_product}**. This product has been gaining attention among {w_audience} for its impressive build quality and features. In this review, we will analyze why this might be the perfect solution for your needs.
-
----
-
-## At a Glance
-* **Product Name:** {w_product}
-* **Rating:** {w_rating}/5 Stars
-* **Price Category:** {w_price_type}
-* **Best For:** {w_audience} looking for {w_keyword}
-
----
-
-## In-Depth Features Analysis
-Why should you consider buying the {w_product}? Let's look at the key features that set it apart from the competition.
-
-{expanded_features}
-
-These features combined make the {w_product} a top contender in the {w_keyword} category.
-
----
-
-## Pros and Cons
-No product is perfect. Here is a transparent look at what we liked and what could be improved.
-
-### ✅ What We Like (Pros)
-{chr(10).join([f"* **{p}**: This is a major advantage for daily use." for p in pros_list])}
-
-### ❌ What We Don't Like (Cons)
-{chr(10).join([f"* {c}: While not a dealbreaker, it is something to keep in mind." for c in cons_list])}
-
----
-
-## Who is this for?
-If you are **{w_audience}**, then the **{w_product}** is designed specifically with you in mind. Its {w_price_type} price point makes it an attractive option without compromising on quality. 
-
-If you prioritize {feat_list[0] if feat_list else 'quality'} and {feat_list[1] if len(feat_list)>1 else 'performance'}, this is an investment worth making.
-
----
-
-## Final Verdict
-To conclude, the **{w_product}** offers excellent value for money. With a rating of **{w_rating}/5**, it delivers on its promises.
-
-For anyone searching for a reliable **{w_keyword}**, we highly recommend checking this out. It checks all the boxes for comfort, usability, and durability.
-
-**[Check Latest Price of {w_product} on Amazon](#)**
-            """
+                # ফিচার/pros/cons লিস্টে ভাগ করে writer_engine এর precompiled টেমপ্লেটে
+                article_body = render_draft({
+                    "product": w_product,
+                    "keyword": w_keyword,
+                    "audience": w_audience,
+                    "rating": w_rating,
+                    "price_type": w_price_type,
+                    "features": [f.strip() for f in w_features.split('\n') if f.strip()],
+                    "pros": [p.strip() for p in w_pros.split('\n') if p.strip()],
+                    "cons": [c.strip() for c in w_cons.split('\n') if c.strip()]
+                })
             
-            # --- OUTPUT ---
-            st.success("🎉 Article Draft Generated Successfully!")
-            st.subheader("Preview:")
-            st.markdown(article_body)
-            st.divider()
-            st.subheader("Copy Code:")
-            st.text_area("Copy Markdown Code:", value=article_body, height=400)
+                # --- OUTPUT ---
+                st.success("🎉 Article Draft Generated Successfully!")
+                st.subheader("Preview:")
+                st.markdown(article_body)
+                st.divider()
+                st.subheader("Copy Code:")
+                st.text_area("Copy Markdown Code:", value=article_body, height=400)
             
+            else:
+                st.warning("⚠️ Please fill in at least the Product Name, Keyword, and Features.")
+
+    else:
+        st.caption("Content Planner এর প্রতিটি ক্লাস্টার থেকে একটি ড্রাফট: ক্লাস্টারের নাম মূল কিওয়ার্ড, বাকি কিওয়ার্ডগুলো আলাদা সেকশন। চাইলে Amazon স্ক্র্যাপ ডেটা আর ক্যাশড SERP FAQ ও যোগ হয়।")
+        writer_planner = get_planner_index()
+        if not writer_planner.clusters:
+            st.info("আগে Content Planner ট্যাবে ক্লাস্টার যোগ করুন।")
         else:
-            st.warning("⚠️ Please fill in at least the Product Name, Keyword, and Features.")
+            b_col1, b_col2, b_col3 = st.columns(3)
+            with b_col1:
+                batch_status = st.selectbox("Clusters:", ["Pending", "All"], key="writer_batch_status")
+                batch_clusters = writer_planner.filtered(batch_status)
+                batch_limit = st.number_input("Max drafts:", 1, max(1, len(batch_clusters)), max(1, min(len(batch_clusters), 30)), key="writer_batch_limit")
+            with b_col2:
+                batch_audience = st.text_input("Target Audience:", value="everyday users", key="writer_batch_audience")
+                batch_price = st.selectbox("Price Range:", ["Budget-Friendly", "Mid-Range", "Premium/Expensive"], index=1, key="writer_batch_price")
+            with b_col3:
+                batch_rating = st.slider("Default Rating:", 1.0, 5.0, 4.5, key="writer_batch_rating")
+                batch_supporting = st.slider("Supporting keywords per draft:", 0, 15, 6, key="writer_batch_supporting")
+            o_col1, o_col2, o_col3 = st.columns(3)
+            with o_col1:
+                scraped_products = [writer_product_from_scrape(item) for item in st.session_state.get('amazon_batch_results') or [] if item and "error" not in item]
+                use_scraped = st.checkbox(f"Use scraped products ({len(scraped_products)})", value=bool(scraped_products), disabled=not scraped_products, help="Amazon ট্যাবের Batch Scrape রেজাল্ট থেকে ক্লাস্টারের সাথে নামে মেলে এমন প্রোডাক্ট।")
+            with o_col2:
+                use_serp_faqs = st.checkbox("Add cached SERP FAQs", value=True, help="SEO ট্যাবে আগে রিসার্চ করা কিওয়ার্ডের 'People also ask'। কোনো API কল হয় না।")
+            with o_col3:
+                bundle_style = st.selectbox("HTML in bundle:", ["Markdown only"] + list(FORMATTER_STYLES), index=1, key="writer_bundle_style")
+
+            if st.button("🚀 Generate Drafts", type="primary"):
+                batch_start = time.perf_counter()
+                drafts = build_batch_drafts(
+                    batch_clusters[:int(batch_limit)],
+                    products=scraped_products if use_scraped else None,
+                    location=SERP_LOCATIONS[country] if use_serp_faqs else None,
+                    audience=batch_audience, price_type=batch_price, rating=batch_rating, max_supporting=batch_supporting
+                )
+                markdowns = [None] * len(drafts)
+                draft_progress = st.progress(0.0, text="Rendering drafts...")
+                for done, (index, markdown) in enumerate(generate_drafts(drafts, get_image_pool(), workers=IMAGE_POOL_WORKERS), start=1):
+                    markdowns[index] = markdown
+                    if done % 25 == 0 or done == len(drafts):
+                        draft_progress.progress(done / len(drafts), text=f"{done}/{len(drafts)} drafts")
+                bundle = build_drafts_bundle(drafts, markdowns, None if bundle_style == "Markdown only" else bundle_style)
+                st.session_state.writer_batch = {
+                    "bundle": bundle,
+                    "count": len(drafts),
+                    "with_product": sum(1 for d in drafts if d.get('features')),
+                    "with_faqs": sum(1 for d in drafts if d['faqs']),
+                    "seconds": time.perf_counter() - batch_start,
+                    "preview": {d['keyword']: m for d, m in zip(drafts[:20], markdowns[:20])}
+                }
+
+            writer_batch = st.session_state.get('writer_batch')
+            if writer_batch:
+                st.success(f"🎉 {writer_batch['count']} drafts in {writer_batch['seconds']:.2f}s — {writer_batch['with_product']} with product data, {writer_batch['with_faqs']} with FAQs")
+                st.download_button("⬇️ Download Drafts (ZIP)", writer_batch['bundle'], file_name="article_drafts.zip", mime="application/zip")
+                preview_keyword = st.selectbox("Preview:", list(writer_batch['preview']), key="writer_batch_preview")
+                with st.container(border=True, height=500):
+                    st.markdown(writer_batch['preview'][preview_keyword])
+
+        with st.expander("🧪 Draft Throughput Benchmark"):
+            bench_drafts = st.select_slider("Drafts:", options=[500, 1000, 5000, 10000], value=1000, key="writer_bench_count")
+            if st.button("Run Draft Benchmark"):
+                bench_df = pd.DataFrame(benchmark_writer_drafts(get_image_pool(), bench_drafts, workers=IMAGE_POOL_WORKERS))
+                st.dataframe(bench_df.style.format({"seconds": "{:.2f}", "drafts_per_sec": "{:,.0f}", "words": "{:,}"}), use_container_width=True, hide_index=True)
+
+run_timer.lap("Smart Writer")
+# ==========================
+# TAB 9: COMPARISON TABLE
+# ==========================
+with tab_table:
+    import pandas as pd
+    from comparison_table import (amazon_results_to_table, best_value_mask, guess_best_rules, render_comparison_html,
+                                  render_comparison_markdown)
+    st.header("📊 Product Comparison Table")
+    st.info("প্রোডাক্ট (রো) × বৈশিষ্ট্য (কলাম) দিন — টাইপ করে, CSV থেকে অথবা Amazon স্ক্র্যাপ থেকে। প্রথম কলামটি প্রোডাক্টের নাম। Image/Link নামের কলাম ছবি ও বাটন হিসেবে দেখাবে।")
+
+    table_source = st.radio("Data from:", ["Type In", "Upload CSV", "Amazon Batch Results"], horizontal=True)
+    table_df = None
+    if table_source == "Type In":
+        if 'cmp_table_data' not in st.session_state:
+            st.session_state.cmp_table_data = pd.DataFrame({
+                "Product": ["Product A", "Product B", "Product C"],
+                "Price": ["$49.99", "$39.99", "$59.99"],
+                "Rating": ["4.6", "4.3", "4.8"],
+                "Weight": ["1.2 lbs", "0.9 lbs", "1.5 lbs"],
+                "Link": ["", "", ""]
+            })
+        table_df = st.data_editor(st.session_state.cmp_table_data, num_rows="dynamic", use_container_width=True, hide_index=True, key="cmp_editor")
+    elif table_source == "Upload CSV":
+        table_file = st.file_uploader("Comparison CSV:", type=["csv"], key="cmp_csv")
+        if table_file:
+            try:
+                table_df = read_uploaded_csv(table_file.getvalue())
+            except (ValueError, UnicodeDecodeError, pd.errors.ParserError) as e:
+                st.error(f"Error reading CSV: {e}")
+    elif st.session_state.get('amazon_batch_results'):
+        table_df = amazon_results_to_table(st.session_state.amazon_batch_results)
+    else:
+        st.info("আগে Amazon ট্যাবের Batch Scrape মোডে প্রোডাক্ট স্ক্র্যাপ করুন।")
+
+    if table_df is not None and len(table_df.columns) > 1 and len(table_df):
+        table_df = table_df.dropna(how="all").reset_index(drop=True)
+        if table_source != "Type In":
+            st.dataframe(table_df, use_container_width=True, hide_index=True, height=250)
+        default_rules = guess_best_rules(table_df)
+        attribute_cols = list(table_df.columns[1:])
+        h_col1, h_col2 = st.columns(2)
+        with h_col1:
+            higher_cols = st.multiselect("Highlight highest value in:", attribute_cols, default=[c for c, r in default_rules.items() if r == "higher"])
+        with h_col2:
+            lower_cols = st.multiselect("Highlight lowest value in:", [c for c in attribute_cols if c not in higher_cols], default=[c for c, r in default_rules.items() if r == "lower" and c not in higher_cols])
+        o_col1, o_col2 = st.columns(2)
+        with o_col1:
+            table_sortable = st.checkbox("Sortable columns (adds a tiny script)", value=True)
+        with o_col2:
+            table_transpose = st.checkbox("Products as columns", value=False)
+
+        if st.button("📊 Generate Table", type="primary"):
+            render_start = time.perf_counter()
+            rules = {**{c: "higher" for c in higher_cols}, **{c: "lower" for c in lower_cols}}
+            best_mask = best_value_mask(table_df, rules)
+            out_df, out_mask = table_df, best_mask
+            if table_transpose:
+                # প্রথম কলাম (প্রোডাক্ট) হেডার হয়ে যায়, বৈশিষ্ট্যগুলো রো
+                out_df = table_df.set_index(table_df.columns[0]).T.reset_index().rename(columns={"index": "Feature"})
+                out_mask = best_mask.set_index(table_df[table_df.columns[0]]).drop(columns=table_df.columns[0]).T.reset_index(drop=True)
+                out_mask.insert(0, "Feature", False)
+                out_mask.columns = out_df.columns
+            table_html = render_comparison_html(out_df, out_mask, sortable=table_sortable)
+            table_md = render_comparison_markdown(out_df, out_mask)
+            render_ms = (time.perf_counter() - render_start) * 1000
+            st.caption(f"{len(table_df)} products × {len(attribute_cols)} attributes · rendered in {render_ms:.1f} ms · {len(table_html.encode('utf-8')) / 1024:.1f} KB")
+            components.html(table_html, height=min(700, 120 + 48 * len(out_df)), scrolling=True)
+            t_col1, t_col2 = st.columns(2)
+            with t_col1:
+                st.subheader("HTML")
+                st.code(table_html, language="html")
+                st.download_button("⬇️ Download HTML", table_html, file_name="comparison_table.html", mime="text/html")
+            with t_col2:
+                st.subheader("Markdown")
+                st.code(table_md, language="markdown")
+                st.download_button("⬇️ Download Markdown", table_md, file_name="comparison_table.md", mime="text/markdown")
+
+run_timer.lap("Comparison Table")
 # ==========================
 # TAB 10: REVIEW SCHEMA GENERATOR (JSON-LD)
 # ==========================
 with tab_schema:
+    import pandas as pd
+    from affiliate_tools import amazon_results_to_feed, build_articles_zip
+    from schema_builder import HAS_ORJSON, SCHEMA_TYPES, benchmark_bulk_schema, generate_bulk_schema, validate_json_ld
     st.header("⭐ SEO Review Schema Generator (JSON-LD)")
     st.info("এটি Google Search এ আপনার আর্টিকেলের নিচে স্টার রেটিং দেখানোর জন্য কোড তৈরি করবে।")
 
-    col1, col2 = st.columns(2)
+    schema_mode = st.radio("Mode:", ["Single Product", "Bulk (Feed / Planner / Amazon)"], horizontal=True, key="schema_mode")
+
+    if schema_mode == "Single Product":
+        col1, col2 = st.columns(2)
     
-    with col1:
-        s_product_name = st.text_input("Product Name (Schema):", placeholder="e.g. Hugo Walking Cane")
-        s_sku = st.text_input("SKU / ASIN (Optional):", placeholder="B083NJ6F5J")
-        s_brand = st.text_input("Brand Name:", placeholder="Hugo")
+        with col1:
+            s_product_name = st.text_input("Product Name (Schema):", placeholder="e.g. Hugo Walking Cane")
+            s_sku = st.text_input("SKU / ASIN (Optional):", placeholder="B083NJ6F5J")
+            s_brand = st.text_input("Brand Name:", placeholder="Hugo")
         
-    with col2:
-        s_rating = st.slider("Your Rating:", 1.0, 5.0, 4.5, step=0.1)
-        s_author = st.text_input("Author Name (Your Name):", placeholder="Tariqul Islam")
-        s_date = st.date_input("Review Date:")
-        s_summary = st.text_area("Short Review Summary:", placeholder="Great product with excellent durability...", height=100)
+        with col2:
+            s_rating = st.slider("Your Rating:", 1.0, 5.0, 4.5, step=0.1)
+            s_author = st.text_input("Author Name (Your Name):", placeholder="Tariqul Islam")
+            s_date = st.date_input("Review Date:")
+            s_summary = st.text_area("Short Review Summary:", placeholder="Great product with excellent durability...", height=100)
 
-    st.divider()
+        st.divider()
 
-    if st.button("Generate Schema Code"):
-        if s_product_name and s_author:
-            # Constructing JSON-LD Dictionary
-            schema_data = {
-                "@context": "https://schema.org/",
-                "@type": "Product",
-                "name": s_product_name,
-                "image": "", # Optional, can be added if needed
-                "description": s_summary,
-                "brand": {
-                    "@type": "Brand",
-                    "name": s_brand if s_brand else "Unknown"
-                },
-                "sku": s_sku if s_sku else "",
-                "review": {
-                    "@type": "Review",
-                    "reviewRating": {
-                        "@type": "Rating",
-                        "ratingValue": str(s_rating),
-                        "bestRating": "5"
+        if st.button("Generate Schema Code"):
+            if s_product_name and s_author:
+                # Constructing JSON-LD Dictionary
+                schema_data = {
+                    "@context": "https://schema.org/",
+                    "@type": "Product",
+                    "name": s_product_name,
+                    "image": "", # Optional, can be added if needed
+                    "description": s_summary,
+                    "brand": {
+                        "@type": "Brand",
+                        "name": s_brand if s_brand else "Unknown"
                     },
-                    "author": {
-                        "@type": "Person",
-                        "name": s_author
-                    },
-                    "datePublished": str(s_date),
-                    "reviewBody": s_summary
+                    "sku": s_sku if s_sku else "",
+                    "review": {
+                        "@type": "Review",
+                        "reviewRating": {
+                            "@type": "Rating",
+                            "ratingValue": str(s_rating),
+                            "bestRating": "5"
+                        },
+                        "author": {
+                            "@type": "Person",
+                            "name": s_author
+                        },
+                        "datePublished": str(s_date),
+                        "reviewBody": s_summary
+                    }
                 }
-            }
 
-            # Convert to nicely formatted JSON string
-            json_output = f"""<script type="application/ld+json">
-{json.dumps(schema_data, indent=4)}
-</script>"""
-
-            st.success("✅ Schema Code Generated!")
-            st.subheader("Copy & Paste this into your Blog Post (Custom HTML):")
-            st.code(json_output, language='html')
-            st.caption("টিপস: এই কোডটি আপনার ওয়ার্ডপ্রেস পোস্টের 'Custom HTML' ব্লকে পেস্ট করবেন।")
+                # Convert to nicely formatted JSON string
+                json_output = f"""<script type="application/ld+json">
+    {json.dumps(schema_data, indent=4)}
+    </script>"""
+
+                st.success("✅ Schema Code Generated!")
+                for issue_type, issue_field, issue_problem in validate_json_ld(schema_data):
+                    st.warning(f"{issue_type} · {issue_field}: {issue_problem}")
+                st.subheader("Copy & Paste this into your Blog Post (Custom HTML):")
+                st.code(json_output, language='html')
+                st.caption("টিপস: এই কোডটি আপনার ওয়ার্ডপ্রেস পোস্টের 'Custom HTML' ব্লকে পেস্ট করবেন।")
             
+            else:
+                st.warning("Please enter Product Name and Author Name.")
+
+    else:
+        schema_source = st.radio("Products from:", ["Upload CSV/JSON", "Amazon Batch Results", "Planner Clusters (FAQ)"], horizontal=True, key="schema_source")
+        schema_df = None
+        if schema_source == "Upload CSV/JSON":
+            st.caption("কলাম: name, sku, brand, image, description, rating, review_body, author, date_published, url, price, currency, faqs (প্রতি লাইনে 'Question? | Answer')। Amazon ট্যাবের JSON export ও চলবে।")
+            schema_file = st.file_uploader("Product Feed:", type=["csv", "json"], key="schema_feed_file")
+            if schema_file:
+                try:
+                    schema_df = read_uploaded_feed(schema_file.name, schema_file.getvalue())
+                except (ValueError, UnicodeDecodeError, pd.errors.ParserError) as e:
+                    st.error(f"Error reading feed: {e}")
+        elif schema_source == "Amazon Batch Results":
+            if st.session_state.get('amazon_batch_results'):
+                schema_df = amazon_results_to_feed(st.session_state.amazon_batch_results)
+            else:
+                st.info("আগে Amazon ট্যাবের Batch Scrape মোডে প্রোডাক্ট স্ক্র্যাপ করুন।")
         else:
-            st.warning("Please enter Product Name and Author Name.")
+            schema_planner = get_planner_index()
+            if schema_planner.clusters:
+                st.caption("প্রতিটি ক্লাস্টারের জন্য SEO ট্যাবের ক্যাশড 'People also ask' প্রশ্ন-উত্তর থেকে FAQPage (কোনো API কল হয় না)।")
+                schema_df = planner_schema_feed(schema_planner.filtered("All"), SERP_LOCATIONS[country])
+            else:
+                st.info("আগে Content Planner ট্যাবে ক্লাস্টার যোগ করুন।")
+
+        if schema_df is not None and len(schema_df):
+            default_types = ["FAQPage"] if schema_source.startswith("Planner") else ["Product", "Review"]
+            schema_types = st.multiselect("Schema types:", list(SCHEMA_TYPES), default=default_types)
+            d_col1, d_col2, d_col3, d_col4 = st.columns(4)
+            with d_col1:
+                bulk_author = st.text_input("Default Author:", key="schema_bulk_author")
+            with d_col2:
+                bulk_date = st.date_input("Default Review Date:", key="schema_bulk_date")
+            with d_col3:
+                bulk_rating = st.number_input("Default Rating:", 1.0, 5.0, 4.5, 0.1, key="schema_bulk_rating")
+            with d_col4:
+                bulk_currency = st.text_input("Currency:", value="USD", key="schema_bulk_currency")
+            l_col1, l_col2 = st.columns(2)
+            with l_col1:
+                bulk_list_name = st.text_input("ItemList name:", placeholder="Best Walking Canes for Seniors", key="schema_list_name")
+            with l_col2:
+                bulk_compact = st.checkbox("Compact output" + (" (orjson)" if HAS_ORJSON else ""), value=True, help="এক লাইনে, space ছাড়া — পেজ ছোট হয়। অফ করলে indent=4।")
+
+            if st.button("⚡ Generate Bulk Schema", type="primary"):
+                if not schema_types:
+                    st.warning("অন্তত একটি schema type বেছে নিন।")
+                else:
+                    snippets, schema_issues, item_list_script, schema_stats = generate_bulk_schema(
+                        schema_df, schema_types,
+                        {'author': bulk_author, 'date_published': str(bulk_date), 'rating': bulk_rating, 'currency': bulk_currency},
+                        compact=bulk_compact, list_name=bulk_list_name
+                    )
+                    st.session_state.schema_bulk = {
+                        "zip": build_articles_zip({name: {"html": script} for name, script in snippets}) if snippets else None,
+                        "jsonl": "\n".join(json.dumps({"name": name, "script": script}, ensure_ascii=False) for name, script in snippets),
+                        "preview": snippets[:3],
+                        "item_list": item_list_script,
+                        "issues": schema_issues,
+                        "stats": schema_stats
+                    }
 
+            schema_bulk = st.session_state.get('schema_bulk')
+            if schema_bulk:
+                stats = schema_bulk['stats']
+                st.success(f"✅ {stats['rows']:,} products in {stats['seconds']:.2f}s ({stats['rows_per_sec']:,.0f} rows/sec, {stats['serializer']}) · {stats['kb']:,.0f} KB")
+                if len(schema_bulk['issues']):
+                    with st.expander(f"⚠️ Validation Issues ({len(schema_bulk['issues'])})"):
+                        st.dataframe(schema_bulk['issues'].head(1000), use_container_width=True, hide_index=True)
+                        st.download_button("⬇️ Issues CSV", functools.partial(schema_bulk['issues'].to_csv, index=False), file_name="schema_issues.csv", mime="text/csv")
+                else:
+                    st.caption("✅ কোনো আবশ্যক ফিল্ড বাদ নেই।")
+                dl_col1, dl_col2 = st.columns(2)
+                with dl_col1:
+                    if schema_bulk['zip']:
+                        st.download_button("⬇️ Download Snippets (ZIP)", schema_bulk['zip'], file_name="schema_snippets.zip", mime="application/zip")
+                with dl_col2:
+                    if schema_bulk['jsonl']:
+                        st.download_button("⬇️ Download JSONL", schema_bulk['jsonl'], file_name="schema_snippets.jsonl", mime="application/json")
+                if schema_bulk['item_list']:
+                    st.subheader("ItemList (list page):")
+                    st.code(schema_bulk['item_list'][:20000], language='html')
+                for name, script in schema_bulk['preview']:
+                    st.caption(name)
+                    st.code(script, language='html')
+
+        with st.expander("🧪 Schema Benchmark"):
+            bench_rows = st.select_slider("Products:", options=[1000, 10000, 50000], value=10000, key="schema_bench_rows")
+            if st.button("Run Schema Benchmark"):
+                bench_df = pd.DataFrame(benchmark_bulk_schema(bench_rows))
+                st.dataframe(bench_df.style.format({"seconds": "{:.2f}", "rows_per_sec": "{:,.0f}", "kb": "{:,.0f}"}), use_container_width=True, hide_index=True)
+
+run_timer.lap("Schema Gen")
+
+# --- Sidebar: SERP Cache Stats ---
+with serp_stats_placeholder.container():
+    serp_stats = get_serp_cache().stats()
+    st.caption(f"♻️ SERP Cache — Hits: {serp_stats['hits'] + serp_stats['shared']} · Misses: {serp_stats['misses']} · Hit rate: {serp_stats['hit_rate']:.0%} · Saved queries: {serp_stats['entries']}")
+
+# --- Sidebar: Startup & Rerun Timing ---
+run_timer.lap("Sidebar stats")
+run_timing = record_run_timing(run_timer, COLD_START)
+with st.sidebar:
+    with st.expander("⏱️ Startup & Rerun Timing"):
+        timing_history = get_timing_history()
+        cold_ms = timing_history["cold_imports_ms"]
+        cold_text = f"{cold_ms:,.0f} ms" if cold_ms is not None else "n/a"
+        st.caption(f"Cold start imports: {cold_text} · This run: {run_timing['total_ms']:,.0f} ms" + (" (cold)" if run_timing['cold'] else "") + f" · Runs in process: {run_timing['run']}")
+        st.dataframe(timing_summary(list(timing_history["runs"]), run_timing), use_container_width=True, hide_index=True,
+                     column_config={c: st.column_config.NumberColumn(format="%.1f") for c in ("this run (ms)", "median (ms)", "max (ms)")})
+        st.download_button("⬇️ Timing History (JSON)", lambda: json.dumps(list(get_timing_history()["runs"]), indent=2), file_name="run_timings.json", mime="application/json")
+        if TIMING_LOG:
+            st.caption(f"প্রতিটি রান `{TIMING_LOG}` ফাইলে লেখা হচ্ছে।")
+
+# --- Sidebar: Metrics (admin) ---
+if run_profiler:
+    run_profiler.stop()
+if is_admin_session():
+    import pandas as pd
+    with st.sidebar:
+        with st.expander("📈 Metrics (admin)"):
+            metrics = REGISTRY.snapshot()
+            exporter = f" · Exporter: http://{METRICS_HOST}:{METRICS_PORT}/metrics" if get_metrics_server() else ""
+            st.caption(f"Hot-path p50 / p95 over the last {REGISTRY.window} calls per operation{exporter}")
+            if metrics["timers"]:
+                st.dataframe(metrics_summary(metrics), use_container_width=True, hide_index=True,
+                             column_config={c: st.column_config.NumberColumn(format="%.1f") for c in ("p50 (ms)", "p95 (ms)", "max (ms)", "total (s)")})
+            if metrics["counters"]:
+                st.dataframe(pd.DataFrame(sorted(metrics["counters"].items()), columns=["event", "count"]), use_container_width=True, hide_index=True)
+            col_prom, col_json = st.columns(2)
+            col_prom.download_button("⬇️ Prometheus", to_prometheus, file_name="metrics.prom", mime="text/plain")
+            col_json.download_button("⬇️ JSON", to_json, file_name="metrics.json", mime="application/json")
+            if st.button("Reset Metrics"):
+                REGISTRY.reset()
+                st.rerun()
 
+            st.radio("Profile each rerun:", PROFILE_MODES, key="profile_mode", horizontal=True)
+            if run_profiler:
+                st.caption(f"This run under {run_profiler.kind}: {run_timing['total_ms']:,.0f} ms (profiler overhead included)")
+                if run_profiler.kind == "cProfile":
+                    st.dataframe(pd.DataFrame(run_profiler.top_functions()), use_container_width=True, hide_index=True,
+                                 column_config={c: st.column_config.NumberColumn(format="%.1f") for c in ("own (ms)", "cumulative (ms)")})
+                else:
+                    st.code(run_profiler.text(), language=None)
+                profile_data, profile_name, profile_mime = run_profiler.export()
+                st.download_button("⬇️ Profile", profile_data, file_name=profile_name, mime=profile_mime)
+            elif profiler_busy:
+                st.warning(f"This run was not profiled: only one profiler can run per process. {profiler_busy}")
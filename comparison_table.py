@@ -0,0 +1,95 @@
+# Comparison Table ট্যাবের রেন্ডারার (HTML আর Markdown)।
+# Streamlit ছাড়া (CLI / cron থেকেও) ব্যবহার করা যায়, তাই app.py র বাইরে আলাদা মডিউলে।
+import pandas as pd
+import numpy as np
+from affiliate_tools import escape_html_frame
+
+# [NEW] Comparison Table Renderer
+COMPARISON_TABLE_CSS = """<style>
+.cmp-wrap{overflow:auto;max-height:640px;border:1px solid #e5e7eb;border-radius:8px;margin:20px 0}
+.cmp-table{border-collapse:collapse;width:100%;font-size:14px;line-height:1.4}
+.cmp-table th,.cmp-table td{padding:10px 12px;border-bottom:1px solid #eee;text-align:left;vertical-align:middle}
+.cmp-table thead th{position:sticky;top:0;z-index:2;background:#1f2937;color:#fff;white-space:nowrap}
+.cmp-table[data-sortable] thead th{cursor:pointer}
+.cmp-table tbody th{position:sticky;left:0;z-index:1;background:#f9fafb;font-weight:600}
+.cmp-table tbody tr:nth-child(even) td{background:#fafafa}
+.cmp-table td.cmp-best{background:#e8f8ef;color:#137333;font-weight:700}
+.cmp-table img{max-width:80px;height:auto}
+.cmp-btn{display:inline-block;background:#ff9900;color:#111;padding:6px 12px;border-radius:4px;text-decoration:none;font-weight:600;white-space:nowrap}
+</style>"""
+COMPARISON_SORT_SCRIPT = """<script>document.querySelectorAll('table.cmp-table[data-sortable]').forEach(function(t){t.querySelectorAll('thead th').forEach(function(th,i){th.addEventListener('click',function(){var b=t.tBodies[0],r=Array.from(b.rows),d=th.dataset.dir==='asc'?-1:1;th.dataset.dir=d===1?'asc':'desc';r.sort(function(x,y){var a=x.cells[i].innerText,c=y.cells[i].innerText,n=parseFloat(a.replace(/[^0-9.-]/g,'')),m=parseFloat(c.replace(/[^0-9.-]/g,''));return (isNaN(n)||isNaN(m)?a.localeCompare(c):n-m)*d;});r.forEach(function(x){b.appendChild(x);});});});});</script>"""
+NUMBER_RE = r"(-?\d+(?:\.\d+)?)"
+SAFE_URL_RE = r"^(https?://|#)"  # affiliate feed এর মতো: javascript:/data: ইত্যাদি href/src এ বসে না
+
+def comparison_numeric(df):
+    """প্রতিটি কলামের সংখ্যা ("$49.99", "4.5 stars", "1,200 mAh") — কলাম ধরে vectorized extract"""
+    return df.apply(lambda col: pd.to_numeric(col.astype(str).str.replace(",", "", regex=False).str.extract(NUMBER_RE, expand=False), errors="coerce"))
+
+def guess_best_rules(df):
+    """কলামের নাম দেখে ডিফল্ট নিয়ম: দাম/ওজন কম ভালো, রেটিং/রিভিউ/ব্যাটারি বেশি ভালো"""
+    numeric = comparison_numeric(df)
+    rules = {}
+    for col in df.columns[1:]:
+        if numeric[col].notna().sum() < 2:
+            continue
+        name = str(col).lower()
+        if any(word in name for word in ("price", "cost", "weight", "$")):
+            rules[col] = "lower"
+        elif any(word in name for word in ("rating", "review", "score", "battery", "capacity", "warranty", "star")):
+            rules[col] = "higher"
+    return rules
+
+def best_value_mask(df, rules):
+    """rules: {column: "higher" | "lower"} — প্রতি কলামের সেরা মান(গুলো) True"""
+    numeric = comparison_numeric(df[list(rules)]) if rules else None
+    mask = pd.DataFrame(False, index=df.index, columns=df.columns)
+    for col, rule in rules.items():
+        values = numeric[col]
+        if values.notna().any():
+            mask[col] = values.eq(values.max() if rule == "higher" else values.min())
+    return mask
+
+def render_comparison_html(df, best_mask, sortable=True):
+    """DataFrame থেকে responsive টেবিল: sticky header ও প্রথম কলাম, সেরা মান হাইলাইট। সেলগুলো পুরো কলাম/অ্যারে
+    ধরে তৈরি হয় (সেল ধরে Python লুপ নেই); স্টাইল class-based, তাই প্রতি সেলে inline CSS এর ভার নেই।"""
+    raw = df.fillna("").astype(str)
+    cells = escape_html_frame(raw)
+    for col in cells.columns:
+        name = str(col).lower()
+        # http(s) বা # ছাড়া অন্য কিছু লিংক/ছবি হয় না, escape করা টেক্সট হিসেবেই থাকে
+        filled = raw[col].str.match(SAFE_URL_RE, case=False)
+        if "image" in name or name == "img":
+            cells[col] = cells[col].where(~filled, '<img src="' + cells[col] + '" alt="" loading="lazy">')
+        elif "link" in name or "url" in name:
+            cells[col] = cells[col].where(~filled, '<a class="cmp-btn" href="' + cells[col] + '" target="_blank" rel="nofollow sponsored">Check Price</a>')
+    values = cells.to_numpy(dtype=object)
+    opening = np.where(best_mask.to_numpy(), '<td class="cmp-best">', "<td>").astype(object)
+    body = opening + values + "</td>"
+    body[:, 0] = '<th scope="row">' + values[:, 0] + "</th>"
+    header = "".join(f"<th>{h}</th>" for h in escape_html_frame(pd.DataFrame([list(map(str, df.columns))])).iloc[0])
+    rows = "\n".join("<tr>" + "".join(row) + "</tr>" for row in body)
+    sort_attr = " data-sortable" if sortable else ""
+    return (f'{COMPARISON_TABLE_CSS}\n<div class="cmp-wrap"><table class="cmp-table"{sort_attr}>\n'
+            f"<thead><tr>{header}</tr></thead>\n<tbody>\n{rows}\n</tbody></table></div>"
+            + (f"\n{COMPARISON_SORT_SCRIPT}" if sortable else ""))
+
+def render_comparison_markdown(df, best_mask):
+    """একই টেবিলের Markdown (সেরা মান **bold**)"""
+    cells = df.fillna("").astype(str).apply(lambda col: col.str.replace("|", "\\|", regex=False).str.replace("\n", " ", regex=False))
+    values = cells.to_numpy(dtype=object)
+    values = np.where(best_mask.to_numpy() & (values != ""), "**" + values + "**", values)
+    header = "| " + " | ".join(str(c).replace("|", "\\|") for c in df.columns) + " |"
+    separator = "|" + "|".join(["---"] * len(df.columns)) + "|"
+    return "\n".join([header, separator] + ["| " + " | ".join(row) + " |" for row in values])
+
+def amazon_results_to_table(results, features=3):
+    rows = []
+    for item in results:
+        if not item or "error" in item:
+            continue
+        bullets = item.get('bullet_points') or []
+        row = {'Product': item.get('title', '')[:80], 'Image': (item.get('gallery_images') or [''])[0]}
+        row.update({f"Feature {i + 1}": bullets[i][:120] if i < len(bullets) else "" for i in range(features)})
+        row['Link'] = item.get('url', '')
+        rows.append(row)
+    return pd.DataFrame(rows)
@@ -0,0 +1,365 @@
+# Image Optimizer এর worker ফাংশন আর batch কনভার্সন (app.py আর CLI দুজনেই এখান থেকে)।
+# Streamlit স্ক্রিপ্টের (app.py) ভেতরে ডিফাইন করা ফাংশন process pool এ pickle করে পাঠানো যায় না,
+# তাই যেগুলো আলাদা প্রসেসে চলে সেগুলো এই মডিউলে রাখা হয়েছে।
+import io
+import os
+import math
+import time
+import hashlib
+import zipfile
+import threading
+import functools
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from PIL import Image, ImageOps, JpegImagePlugin
+
+from perf_metrics import incr, observe
+
+WEBP_QUALITY = 80
+
+# --- Memory limits ---
+MAX_IMAGE_PIXELS = int(os.environ.get("IMAGE_MAX_PIXELS", 40_000_000))  # এর বেশি হলে decode এর সময়ই ছোট করা হয়
+MAX_IMAGE_BYTES = int(os.environ.get("IMAGE_MAX_BYTES", 50 * 1024 * 1024))  # আপলোড ফাইলের সর্বোচ্চ সাইজ
+# decompression bomb: এর বেশি হলে decode ই করা হয় না। JPEG ছাড়া অন্য ফরম্যাট (PNG, TIFF ...) পুরো সাইজেই decode হয়,
+# tiled_reduce শুধু converted কপির মেমরি বাঁচায়, তাই এদের সীমা max_pixels এর কাছাকাছি রাখা হয়েছে।
+HARD_PIXEL_LIMIT = MAX_IMAGE_PIXELS * 2
+# JPEG draft mode এ প্রতি দিকে 1/8 (পিক্সেলে 1/64) স্কেলে decode করা যায়, তাই 64 গুণ বেশি হলেও decode হওয়া ছবি HARD_PIXEL_LIMIT এর মধ্যে
+JPEG_PIXEL_LIMIT = HARD_PIXEL_LIMIT * 64
+TILE_ROWS = 256
+# একসাথে কতগুলো ছবি decode হবে। এই threading semaphore শুধু একটি প্রসেসের থ্রেডগুলোর জন্য;
+# make_image_pool এর worker রা একটি শেয়ার্ড multiprocessing semaphore পায়, তাই সীমাটা পুরো pool জুড়ে
+DECODE_CONCURRENCY = int(os.environ.get("IMAGE_DECODE_CONCURRENCY", 2))
+DECODE_SEMAPHORE = threading.BoundedSemaphore(DECODE_CONCURRENCY)
+
+
+class ImageTooLarge(ValueError):
+    pass
+
+
+def image_nbytes(image):
+    """Pillow এর ভেতরের pixel buffer এর আনুমানিক সাইজ (multi-band আর 32-bit মোড প্রতি পিক্সেলে 4 byte)"""
+    pixel_size = 4 if len(image.getbands()) > 1 or image.mode in ("I", "F") else (2 if image.mode.startswith("I;16") else 1)
+    return image.width * image.height * pixel_size
+
+
+def _init_decode_worker(semaphore):
+    global DECODE_SEMAPHORE
+    DECODE_SEMAPHORE = semaphore
+
+
+def make_image_pool(max_workers=None):
+    """Image/OCR worker দের process pool: সব worker মিলিয়ে একসাথে DECODE_CONCURRENCY টির বেশি decode নয়"""
+    return ProcessPoolExecutor(max_workers=max_workers or os.cpu_count() or 2, initializer=_init_decode_worker,
+                               initargs=(multiprocessing.BoundedSemaphore(DECODE_CONCURRENCY),))
+
+
+def tiled_reduce(image, factor):
+    """বড় ছবিকে ব্যান্ড (TILE_ROWS * factor সারি) ধরে reduce করে। প্রতিটি ব্যান্ড আলাদাভাবে convert হয়,
+    তাই পুরো সাইজের converted কপি কখনো মেমরিতে তৈরি হয় না। Returns (image, peak_extra_bytes)।"""
+    mode = image.mode if image.mode in ("L", "RGB", "RGBA") else ("RGBA" if "A" in image.getbands() or "transparency" in image.info else ("L" if image.mode in ("1", "I", "F", "I;16") else "RGB"))
+    out = Image.new(mode, (math.ceil(image.width / factor), math.ceil(image.height / factor)))
+    band_rows = TILE_ROWS * factor
+    peak_band = 0
+    for top in range(0, image.height, band_rows):
+        band = image.crop((0, top, image.width, min(image.height, top + band_rows)))
+        if band.mode != mode:
+            band = band.convert(mode)
+        peak_band = max(peak_band, image_nbytes(band))
+        out.paste(band.reduce(factor), (0, top // factor))
+    return out, image_nbytes(out) + peak_band
+
+
+def open_header(data):
+    """শুধু header পড়া lazy Image (পিক্সেল decode হয় load এ)। JPEG সরাসরি plugin দিয়ে খোলা হয়, তাই Pillow এর
+    প্রসেস-ব্যাপী bomb check (Image.MAX_IMAGE_PIXELS, ~179 MP) draft mode এ ছোট করে decode করা যায় এমন বড় JPEG
+    আটকায় না; সেগুলোর সীমা guarded_open header size দিয়ে দেখে। অন্য ফরম্যাটে Pillow এর check থেকেই যায়।"""
+    try:
+        if data[:3] == b"\xff\xd8\xff":
+            return JpegImagePlugin.JpegImageFile(io.BytesIO(data))
+        return Image.open(io.BytesIO(data))
+    except Image.DecompressionBombError as e:
+        raise ImageTooLarge(str(e)) from e
+
+
+def guarded_open(data, max_pixels=MAX_IMAGE_PIXELS, max_bytes=MAX_IMAGE_BYTES, scale=1.0):
+    """মেমরি-সীমিত decode। ফাইল/পিক্সেল লিমিট header size দিয়ে decode এর আগেই চেক করে, JPEG হলে draft mode এ
+    ছোট করে decode করে, তারপরও লিমিটের বেশি থাকলে tiled_reduce। scale দিলে (যেমন srcset এর সবচেয়ে বড় width)
+    JPEG সেই স্কেলেই decode হয়। JPEG ছাড়া অন্য ফরম্যাট (PNG, WebP, TIFF ...) সবসময় পুরো সাইজে decode হয়
+    (তাই তাদের সীমা HARD_PIXEL_LIMIT), tiled_reduce শুধু তার পরের কপিগুলো ছোট রাখে।
+    Returns (loaded image, info) — info তে peak_bytes (আনুমানিক সর্বোচ্চ pixel buffer মেমরি)।"""
+    if len(data) > max_bytes:
+        raise ImageTooLarge(f"File is {len(data) / 1024 / 1024:.1f} MB, limit is {max_bytes / 1024 / 1024:.0f} MB.")
+    with DECODE_SEMAPHORE:
+        image = open_header(data)
+        width, height = image.size
+        limit = JPEG_PIXEL_LIMIT if image.format == "JPEG" else HARD_PIXEL_LIMIT
+        if width * height > limit:
+            raise ImageTooLarge(f"Image is {width}×{height} ({width * height / 1e6:.0f} MP), limit is {limit / 1e6:.0f} MP.")
+        target_scale = min(scale, math.sqrt(max_pixels / (width * height)))
+        if image.format == "JPEG" and target_scale < 1:
+            image.draft(image.mode if image.mode in ("L", "RGB", "CMYK") else "RGB", (math.ceil(width * target_scale), math.ceil(height * target_scale)))
+        image.load()
+        peak = image_nbytes(image)
+        tiled = False
+        if image.width * image.height > max_pixels:
+            factor = math.ceil(math.sqrt(image.width * image.height / max_pixels))
+            source = image
+            image, extra = tiled_reduce(source, factor)
+            image.info.update(source.info)
+            image.format = source.format
+            source.close()
+            peak += extra
+            tiled = True
+    return image, {
+        "original_size": (width, height),
+        "decoded_size": image.size,
+        "downscaled": image.size != (width, height),
+        "tiled": tiled,
+        "peak_bytes": peak
+    }
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def save_webp(image, quality=WEBP_QUALITY):
+    """PIL Image কে WebP হিসেবে BytesIO তে সেভ করে"""
+    buffer = io.BytesIO()
+    image.save(buffer, format="WEBP", optimize=True, quality=quality)
+    buffer.seek(0)
+    return buffer
+
+
+def convert_webp_bytes(data, quality=WEBP_QUALITY):
+    """Process pool worker: ইমেজের raw bytes নিয়ে WebP bytes আর সাইজের তথ্য ফেরত দেয়"""
+    try:
+        image, info = guarded_open(data)
+        with image:
+            width, height = image.size
+            start = time.perf_counter()
+            buffer = save_webp(image, quality)
+            webp = buffer.getvalue()
+            # worker প্রসেসের registry মূল প্রসেসে দেখা যায় না, তাই সময়টা রেজাল্টের সাথেই ফেরত যায়
+            encode_ms = (time.perf_counter() - start) * 1000
+        return {
+            "webp": webp,
+            "width": width,
+            "height": height,
+            "original_size": len(data),
+            "webp_size": len(webp),
+            "downscaled_from": info["original_size"] if info["downscaled"] else None,
+            "peak_bytes": info["peak_bytes"] + len(webp),
+            "encode_ms": encode_ms
+        }
+    except Exception as e:
+        return {"error": str(e), "original_size": len(data)}
+
+
+# --- Responsive Variants (srcset ladder) ---
+DEFAULT_WIDTHS = (320, 640, 960, 1280, 1920)
+FORMAT_MIME = {"WEBP": "image/webp", "AVIF": "image/avif"}
+EXIF_ORIENTATION = 0x0112
+
+
+@functools.lru_cache(maxsize=None)
+def avif_supported():
+    """Pillow এ AVIF encoder আছে কিনা (Pillow 11.3+ অথবা pillow-avif-plugin)। প্রসেসে একবারই দেখা হয়।"""
+    try:
+        import pillow_avif  # noqa: F401
+    except ImportError:
+        pass
+    Image.init()
+    return "AVIF" in Image.SAVE
+
+
+def encode_image(image, fmt, quality):
+    buffer = io.BytesIO()
+    if fmt == "WEBP":
+        image.save(buffer, format="WEBP", optimize=True, quality=quality)
+    else:
+        image.save(buffer, format=fmt, quality=quality)
+    return buffer.getvalue()
+
+
+def encode_to_budget(image, fmt, max_bytes, min_quality=30, max_quality=90):
+    """Quality এর উপর binary search করে max_bytes এর মধ্যে সবচেয়ে ভালো quality খুঁজে বের করে।
+    সবচেয়ে কম quality তেও না আঁটলে সেটাই ফেরত দেয়। Returns (bytes, quality)।"""
+    best = None
+    low, high = min_quality, max_quality
+    while low <= high:
+        quality = (low + high) // 2
+        data = encode_image(image, fmt, quality)
+        if len(data) <= max_bytes:
+            best = (data, quality)
+            low = quality + 1
+        else:
+            high = quality - 1
+    return best or (encode_image(image, fmt, min_quality), min_quality)
+
+
+def display_size(image):
+    """EXIF orientation অনুযায়ী ঘোরানোর পরের (width, height)"""
+    if image.getexif().get(EXIF_ORIENTATION, 1) in (5, 6, 7, 8):
+        return image.height, image.width
+    return image.size
+
+
+def prepare_base_image(image):
+    """guarded_open থেকে আসা ছবিকে সোজা (EXIF orientation) করে RGB/RGBA তে আনে"""
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+    return image
+
+
+def generate_variants(data, widths=DEFAULT_WIDTHS, formats=("WEBP",), quality=WEBP_QUALITY, max_bytes=None):
+    """Process pool worker: একটি ছবি থেকে প্রতিটি width x format এর variant বানায়।
+    অরিজিনালের চেয়ে বড় width বাদ যায়; অরিজিনাল ছোট হলে অরিজিনাল width টাই শেষ ধাপ।"""
+    try:
+        with open_header(data) as probe:
+            # শুধু হেডার পড়া হয় (lazy), পিক্সেল decode হয় guarded_open এ
+            original_width, original_height = display_size(probe)
+        ladder = sorted({w for w in widths if w < original_width} | ({original_width} if original_width <= max(widths) else set()))
+        if not ladder:
+            ladder = [original_width]
+        # srcset এর সবচেয়ে বড় ধাপের চেয়ে বড় করে decode করার দরকার নেই (JPEG draft mode)
+        source, info = guarded_open(data, scale=max(ladder) / original_width)
+        base = prepare_base_image(source)
+        peak = info["peak_bytes"] + (image_nbytes(base) if base is not source else 0)
+        limited = base.width < max(ladder)
+        if limited:
+            # পিক্সেল লিমিটের কারণে ছোট decode হলে ladder ও সেই সাইজে সীমিত
+            ladder = sorted({w for w in ladder if w <= base.width} or {base.width})
+
+        variants = []
+        start = time.perf_counter()
+        for width in sorted(ladder, reverse=True):
+            height = max(1, round(base.height * width / base.width))
+            # reducing_gap দিলে Pillow আগে integer factor এ reduce() করে তারপর LANCZOS — বড় ছবিতে অনেক দ্রুত
+            resized = base if base.size == (width, height) else base.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+            peak = max(peak, info["peak_bytes"] + image_nbytes(base) + image_nbytes(resized))
+            for fmt in formats:
+                if max_bytes:
+                    encoded, used_quality = encode_to_budget(resized, fmt, max_bytes)
+                else:
+                    encoded, used_quality = encode_image(resized, fmt, quality), quality
+                variants.append({
+                    "width": width,
+                    "height": height,
+                    "format": fmt,
+                    "quality": used_quality,
+                    "bytes": encoded,
+                    "size": len(encoded)
+                })
+        return {
+            "variants": sorted(variants, key=lambda v: (v["format"], v["width"])),
+            "width": original_width,
+            "height": original_height,
+            "original_size": len(data),
+            "nbytes": sum(v["size"] for v in variants),
+            "downscaled_from": (original_width, original_height) if limited else None,
+            "peak_bytes": peak + sum(v["size"] for v in variants),
+            "encode_ms": (time.perf_counter() - start) * 1000
+        }
+    except Exception as e:
+        return {"error": str(e), "original_size": len(data)}
+
+
+def variant_file_name(base_name, variant):
+    return f"{base_name}-{variant['width']}w.{variant['format'].lower()}"
+
+
+def build_picture_html(base_name, variants, alt="", base_url="", sizes="(max-width: 768px) 100vw, 768px"):
+    """<picture> স্নিপেট: AVIF (থাকলে) আগে, তারপর WebP; <img> এ সবচেয়ে বড় WebP fallback"""
+    prefix = base_url.rstrip("/") + "/" if base_url else ""
+    sources = []
+    for fmt in ("AVIF", "WEBP"):
+        fmt_variants = [v for v in variants if v["format"] == fmt]
+        if fmt_variants:
+            srcset = ", ".join(f"{prefix}{variant_file_name(base_name, v)} {v['width']}w" for v in fmt_variants)
+            sources.append((fmt, srcset, fmt_variants[-1]))
+    if not sources:
+        return ""
+    lines = ["<picture>"]
+    for fmt, srcset, _ in sources:
+        lines.append(f'  <source type="{FORMAT_MIME[fmt]}" srcset="{srcset}" sizes="{sizes}">')
+    fallback = sources[-1][2]
+    alt_text = alt.replace('"', "&quot;")
+    lines.append(f'  <img src="{prefix}{variant_file_name(base_name, fallback)}" srcset="{sources[-1][1]}" sizes="{sizes}" '
+                 f'width="{fallback["width"]}" height="{fallback["height"]}" alt="{alt_text}" loading="lazy" decoding="async">')
+    lines.append("</picture>")
+    return "\n".join(lines)
+
+
+# --- Batch conversion ---
+class ResultCache:
+    """content hash -> worker রেজাল্ট (WebP, variants, OCR)। মোট সাইজ max_bytes ছাড়ালে পুরনোগুলো বাদ যায় (LRU)।"""
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.items = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key in self.items:
+                self.items.move_to_end(key)
+                return self.items[key]
+        return None
+
+    def put(self, key, result):
+        with self.lock:
+            if key in self.items:
+                return
+            self.items[key] = result
+            self.size += self._nbytes(result)
+            while self.size > self.max_bytes and len(self.items) > 1:
+                _, old = self.items.popitem(last=False)
+                self.size -= self._nbytes(old)
+
+    @staticmethod
+    def _nbytes(result):
+        return result.get("nbytes", len(result.get("webp", b"")) + len(result.get("text", "")))
+
+
+def convert_images_parallel(images, pool, worker=convert_webp_bytes, cache=None, **options):
+    """images: [(name, bytes)]। ক্যাশে থাকা ছবি সাথে সাথে, বাকিগুলো process pool এ worker দিয়ে কনভার্ট হয়ে
+    শেষ হওয়া মাত্র (index, result) yield করে। ক্যাশ কী = content hash + worker + options (cache না দিলে ক্যাশ নেই)।"""
+    options_key = (worker.__name__, tuple(sorted(options.items())))
+    futures = {}
+    for i, (name, data) in enumerate(images):
+        key = (content_hash(data), options_key)
+        result = cache.get(key) if cache is not None else None
+        if result is not None:
+            yield i, result
+        else:
+            futures[pool.submit(worker, data, **options)] = (i, key)
+    for future in as_completed(futures):
+        i, key = futures[future]
+        result = future.result()
+        if "error" in result:
+            incr("image.error")
+        else:
+            observe("image.encode", result["encode_ms"] / 1000)
+            if cache is not None:
+                cache.put(key, result)
+        yield i, result
+
+
+def build_webp_zip(named_results):
+    """[(file_name, webp_bytes)] থেকে একটি ZIP। WebP আগেই কম্প্রেসড, তাই ZIP_STORED (আবার কম্প্রেস করার দরকার নেই)।"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+        used_names = set()
+        for file_name, webp in named_results:
+            base, ext = os.path.splitext(file_name)
+            n = 1
+            while file_name in used_names:
+                file_name = f"{base}-{n}{ext}"
+                n += 1
+            used_names.add(file_name)
+            archive.writestr(file_name, webp)
+    return buffer.getvalue()
@@ -0,0 +1,501 @@
+# app.py র ট্যাবগুলোর কাজ Streamlit ছাড়া, কমান্ড লাইন থেকে (cron / CI / বড় ব্যাচ)।
+# ব্যবহার: python myarticletools.py {scrape,optimize,format,ocr,schema,affiliate,planner,write} ... [--jobs N]
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# ভারী মডিউল শুধু যে কমান্ডে দরকার তার ভেতরে import হয়: pandas (schema_builder, affiliate_tools), PIL (image_pipeline,
+# ocr_engine), numpy (planner_core, writer_engine)। তাই scrape / format / schema এর প্রতিটি cron রান এগুলোর খরচ দেয় না।
+# নিচেরগুলো শুধু standard library নির্ভর।
+from amazon_scraper import scrape_amazon_batch
+from text_formatter import FORMATTER_STYLES, format_text_to_html
+from serp_tools import SERP_LOCATIONS, parse_keyword_list
+from perf_metrics import to_json
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp", ".tif", ".tiff")
+OCR_EXTENSIONS = IMAGE_EXTENSIONS + (".pdf",)
+TEXT_EXTENSIONS = (".md", ".markdown", ".txt")
+FEED_EXTENSIONS = (".csv", ".json", ".jsonl")
+PLANNER_TABLE_EXTENSIONS = (".csv", ".xlsx")
+KEYWORD_EXTENSIONS = (".txt", ".csv")
+
+
+def log(message):
+    print(message, file=sys.stderr, flush=True)
+
+
+def expand_inputs(paths, extensions):
+    """ফাইল আর ফোল্ডার (recursive) থেকে মিলে যাওয়া ফাইলের সাজানো লিস্ট"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, name) for name in names if name.lower().endswith(extensions))
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            log(f"skip: {path} not found")
+    return sorted(dict.fromkeys(files))
+
+
+def read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def output_path(output_dir, source, extension):
+    os.makedirs(output_dir, exist_ok=True)
+    return os.path.join(output_dir, os.path.splitext(os.path.basename(source))[0] + extension)
+
+
+def write_text(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def read_items(path):
+    """JSON (লিস্ট অথবা {"products": [...]}) বা JSONL (scrape কমান্ডের আউটপুট) থেকে dict লিস্ট"""
+    with open(path, encoding="utf-8") as f:
+        if path.lower().endswith(".jsonl"):
+            return [json.loads(line) for line in f if line.strip()]
+        items = json.load(f)
+    return items.get("products", [items]) if isinstance(items, dict) else items
+
+
+def read_feed(path):
+    """CSV, JSON বা JSONL থেকে DataFrame"""
+    import pandas as pd
+    if path.lower().endswith((".json", ".jsonl")):
+        return pd.DataFrame(read_items(path))
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def map_files(func, files, jobs, *args):
+    """প্রতিটি ফাইলে func(path, *args), ক্রমানুসারে (path, result) yield করে। একাধিক ফাইল আর jobs > 1 হলে process
+    pool এ (func মডিউলের top-level ফাংশন হতে হবে), না হলে এখানেই — একটি ফাইলের জন্য worker চালু করার খরচ নেই।"""
+    if jobs > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(files))) as pool:
+            yield from zip(files, pool.map(func, files, *([arg] * len(files) for arg in args)))
+    else:
+        for path in files:
+            yield path, func(path, *args)
+
+
+def write_named_files(output_dir, named, extension):
+    """[(নাম, লেখা)] -> output_dir/<slug>.<extension>; একই slug হলে -2, -3 ..."""
+    from affiliate_tools import slugify
+    os.makedirs(output_dir, exist_ok=True)
+    used = set()
+    for name, text in named:
+        file_name, n = slugify(name), 1
+        while file_name in used:
+            n += 1
+            file_name = f"{slugify(name)}-{n}"
+        used.add(file_name)
+        write_text(os.path.join(output_dir, f"{file_name}.{extension}"), text)
+
+
+def cmd_scrape(args):
+    items = list(args.items)
+    for path in args.input or []:
+        with open(path, encoding="utf-8") as f:
+            items.extend(line.strip() for line in f if line.strip())
+    if not items:
+        log("No URLs or ASINs given.")
+        return 1
+    start = time.perf_counter()
+    results, failed = {}, 0
+    for i, url, data in scrape_amazon_batch(items, max_workers=args.jobs, use_cache=not args.no_cache):
+        results[i] = {"url": url, **data}
+        failed += "error" in data
+        log(f"[{len(results)}/{len(items)}] {'ERROR' if 'error' in data else 'ok'} {url}")
+    lines = [json.dumps(results[i], ensure_ascii=False) for i in sorted(results)]
+    if args.output:
+        write_text(args.output, "\n".join(lines) + "\n")
+    else:
+        print("\n".join(lines))
+    log(f"{len(results) - failed} scraped, {failed} failed in {time.perf_counter() - start:.1f}s")
+    return 1 if failed == len(results) else 0
+
+
+def cmd_optimize(args):
+    from image_pipeline import WEBP_QUALITY, convert_images_parallel, convert_webp_bytes, generate_variants, make_image_pool, variant_file_name
+    quality = args.quality or WEBP_QUALITY
+    files = expand_inputs(args.inputs, IMAGE_EXTENSIONS)
+    if not files:
+        log("No images found.")
+        return 1
+    start = time.perf_counter()
+    original = converted = failed = 0
+    # app.py র Image Optimizer এর একই batch ফাংশন (ক্যাশ ছাড়া)
+    if args.widths:
+        worker, options = generate_variants, {"widths": tuple(args.widths), "quality": quality}
+    else:
+        worker, options = convert_webp_bytes, {"quality": quality}
+    with make_image_pool(args.jobs) as pool:
+        for i, result in convert_images_parallel([(path, read_bytes(path)) for path in files], pool, worker=worker, **options):
+            path = files[i]
+            if "error" in result:
+                failed += 1
+                log(f"ERROR {path}: {result['error']}")
+                continue
+            original += result["original_size"]
+            if args.widths:
+                base = os.path.splitext(os.path.basename(path))[0]
+                os.makedirs(args.output, exist_ok=True)
+                for variant in result["variants"]:
+                    with open(os.path.join(args.output, variant_file_name(base, variant)), "wb") as f:
+                        f.write(variant["bytes"])
+                converted += result["nbytes"]
+            else:
+                with open(output_path(args.output, path, ".webp"), "wb") as f:
+                    f.write(result["webp"])
+                converted += result["webp_size"]
+            log(f"ok {path}")
+    saved = (1 - converted / original) * 100 if original else 0.0
+    log(f"{len(files) - failed} images, {original / 1024:,.0f} KB -> {converted / 1024:,.0f} KB ({saved:.0f}% saved) in {time.perf_counter() - start:.1f}s")
+    return 1 if failed == len(files) else 0
+
+
+def format_file(path, output_dir, style):
+    """Process pool worker: একটি Markdown/টেক্সট ফাইল -> .html। Returns (path, target বা None, error বা None)।"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            html = format_text_to_html(f.read(), style)
+        target = output_path(output_dir, path, ".html")
+        write_text(target, html)
+    except (OSError, UnicodeDecodeError) as e:
+        return path, None, str(e)
+    return path, target, None
+
+
+def cmd_format(args):
+    files = expand_inputs(args.inputs, TEXT_EXTENSIONS)
+    if not files:
+        log("No .md/.txt files found.")
+        return 1
+    start = time.perf_counter()
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        for path, target, error in pool.map(format_file, files, [args.output] * len(files), [args.style] * len(files), chunksize=max(1, len(files) // (args.jobs * 4))):
+            if error:
+                failed += 1
+                log(f"ERROR {path}: {error}")
+            else:
+                log(f"ok {target}")
+    log(f"{len(files) - failed} files formatted, {failed} failed in {time.perf_counter() - start:.1f}s")
+    return 1 if failed == len(files) else 0
+
+
+def cmd_ocr(args):
+    from image_pipeline import make_image_pool
+    from ocr_engine import run_ocr_batch
+    files = expand_inputs(args.inputs, OCR_EXTENSIONS)
+    if not files:
+        log("No images or PDFs found.")
+        return 1
+    start = time.perf_counter()
+    pages = {path: {} for path in files}
+    config = f"--psm {args.psm}"
+    # app.py র OCR ট্যাবের একই batch ফাংশন: বড় PDF এর পেজগুলো কয়েকটি করে worker এ
+    with make_image_pool(args.jobs) as pool:
+        for file_index, result in run_ocr_batch([(path, read_bytes(path)) for path in files], pool, config=config, lang=args.lang, workers=args.jobs):
+            path = files[file_index]
+            if "error" in result:
+                log(f"ERROR {path} page {result['page']}: {result['error']}")
+            else:
+                pages[path][result["page"]] = result["text"]
+    for path, texts in pages.items():
+        if texts:
+            target = output_path(args.output, path, ".txt")
+            write_text(target, "\n\n".join(texts[page] for page in sorted(texts)))
+            log(f"ok {target} ({len(texts)} pages)")
+    done = sum(1 for texts in pages.values() if texts)
+    log(f"{done} files, {sum(len(t) for t in pages.values())} pages in {time.perf_counter() - start:.1f}s")
+    return 0 if done else 1
+
+
+def schema_feed(path, types, defaults, compact, list_name):
+    """Process pool worker: একটি feed এর generate_bulk_schema ফল (dict), পড়া না গেলে {"error": ...}"""
+    from schema_builder import generate_bulk_schema
+    try:
+        df = read_feed(path)
+    except (OSError, ValueError) as e:
+        return {"error": str(e)}
+    snippets, issues, item_list_script, stats = generate_bulk_schema(df, types, defaults, compact=compact, list_name=list_name)
+    return {"snippets": snippets, "issues": issues, "item_list": item_list_script, "stats": stats}
+
+
+def cmd_schema(args):
+    from schema_builder import SCHEMA_TYPES
+    unknown = [t for t in args.types or [] if t not in SCHEMA_TYPES]
+    if unknown:
+        log(f"Unknown schema type(s): {', '.join(unknown)}. Available: {', '.join(SCHEMA_TYPES)}")
+        return 2
+    files = expand_inputs(args.feeds, FEED_EXTENSIONS)
+    if not files:
+        log("No CSV/JSON feeds found.")
+        return 1
+    types = args.types or [t for t in SCHEMA_TYPES if t != "ItemList"]
+    defaults = {'author': args.author, 'date_published': args.date or time.strftime("%Y-%m-%d"), 'rating': args.rating, 'currency': args.currency}
+    start = time.perf_counter()
+    snippets, item_lists = [], []
+    failed = rows = issue_count = 0
+    for path, result in map_files(schema_feed, files, args.jobs, types, defaults, not args.pretty, args.list_name):
+        if "error" in result:
+            failed += 1
+            log(f"ERROR {path}: {result['error']}")
+            continue
+        issues, stats = result["issues"], result["stats"]
+        snippets.extend(result["snippets"])
+        if result["item_list"]:
+            # একটি feed হলে আগের মতই item-list.html, একাধিক হলে প্রতিটি feed এর নামে
+            item_lists.append(("item-list" if len(files) == 1 else f"{os.path.splitext(os.path.basename(path))[0]}-item-list", result["item_list"]))
+        if len(issues):
+            log(issues.to_string(index=False, max_rows=50))
+        rows += stats['rows']
+        issue_count += len(issues)
+        log(f"{path}: {stats['rows']:,} products in {stats['seconds']:.2f}s ({stats['rows_per_sec']:,.0f} rows/sec, {stats['serializer']}), {len(issues)} issues")
+    if args.jsonl:
+        write_text(args.jsonl, "".join(json.dumps({"name": name, "script": script}, ensure_ascii=False) + "\n" for name, script in snippets))
+    if args.output:
+        write_named_files(args.output, snippets, "html")
+        for name, script in item_lists:
+            write_text(os.path.join(args.output, f"{name}.html"), script)
+    if not args.output and not args.jsonl:
+        print("\n".join([script for _, script in snippets] + [script for _, script in item_lists]))
+    if len(files) > 1:
+        log(f"{len(files) - failed} feeds, {rows:,} products, {issue_count} issues in {time.perf_counter() - start:.2f}s")
+    return 1 if failed == len(files) else 0
+
+
+def load_affiliate_templates(directory):
+    from affiliate_tools import AFFILIATE_TEMPLATES, load_template_files
+    return {**AFFILIATE_TEMPLATES, **load_template_files(directory)}
+
+
+def affiliate_feed(path, design, templates_dir, tag, disclosure):
+    """Process pool worker: একটি feed -> {"articles": [(নাম, html)], "issues", "boxes"}, পড়া না গেলে {"error": ...}।
+    টেমপ্লেট worker এ আবার লোড হয় (ফোল্ডার ধরে ক্যাশড), compiled টেমপ্লেট pickle করে পাঠাতে হয় না।"""
+    import pandas as pd
+    from affiliate_tools import amazon_results_to_feed, prepare_affiliate_feed, render_affiliate_feed
+    templates = load_affiliate_templates(templates_dir)
+    try:
+        if path.lower().endswith((".json", ".jsonl")):
+            items = read_items(path)
+            # Amazon স্ক্র্যাপের আউটপুট হলে app.py র মতই feed এ রূপান্তর
+            feed = amazon_results_to_feed(items, tag) if any(isinstance(item, dict) and 'gallery_images' in item for item in items) else pd.DataFrame(items)
+        else:
+            feed = read_feed(path)
+    except (OSError, ValueError) as e:
+        return {"error": str(e)}
+    clean, issues = prepare_affiliate_feed(feed)
+    by_name = {t.name: t for t in templates.values()}
+    articles = render_affiliate_feed(clean, by_name[design], templates, disclosure=disclosure)
+    return {"articles": list(articles.items()), "issues": issues, "boxes": len(clean)}
+
+
+def cmd_affiliate(args):
+    from affiliate_tools import AFFILIATE_TEMPLATE_DIR
+    templates_dir = args.templates or AFFILIATE_TEMPLATE_DIR
+    by_name = [t.name for t in load_affiliate_templates(templates_dir).values()]
+    if args.design not in by_name:
+        log(f"Unknown design '{args.design}'. Available: {', '.join(by_name)}")
+        return 2
+    files = expand_inputs(args.feeds, FEED_EXTENSIONS)
+    if not files:
+        log("No CSV/JSON feeds found.")
+        return 1
+    start = time.perf_counter()
+    articles = []
+    failed = boxes = issue_count = 0
+    for path, result in map_files(affiliate_feed, files, args.jobs, args.design, templates_dir, args.tag, not args.no_disclosure):
+        if "error" in result:
+            failed += 1
+            log(f"ERROR {path}: {result['error']}")
+            continue
+        issues = result["issues"]
+        if len(issues):
+            log(issues.to_string(index=False, max_rows=50))
+        articles.extend(result["articles"])
+        boxes += result["boxes"]
+        issue_count += len(issues)
+        log(f"ok {path}: {result['boxes']:,} product boxes in {len(result['articles'])} article(s), {len(issues)} issues")
+    write_named_files(args.output, articles, "html")
+    log(f"{boxes:,} product boxes in {len(articles)} article(s) in {(time.perf_counter() - start) * 1000:.0f} ms, {issue_count} issues")
+    return 1 if failed == len(files) else 0
+
+
+def read_keyword_file(path):
+    """Process pool worker: CSV হলে app এর মতই header বাদ দিয়ে "keyword" কলাম, না হলে প্রতি লাইনে একটি কিওয়ার্ড"""
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return {"keywords": parse_keyword_list(f.read(), is_csv=path.lower().endswith(".csv"))}
+    except (OSError, ValueError) as e:
+        return {"error": str(e)}
+
+
+def cmd_planner(args):
+    from planner_core import (CLUSTER_THRESHOLD, PLANNER_DB, PLANNER_FILE, PlannerDeduper, PlannerIndex, cluster_keywords,
+                              dedup_planner_import, import_planner_table, open_planner_store, planner_to_json)
+    files = expand_inputs(args.inputs, PLANNER_TABLE_EXTENSIONS if args.action == "import" else KEYWORD_EXTENSIONS)
+    if args.action != "export" and not files:
+        log(f"No input files found for planner {args.action}.")
+        return 1
+    store = open_planner_store(args.db or PLANNER_DB, PLANNER_FILE)
+    planner = PlannerIndex(store.list_clusters())
+    if args.action == "import":
+        # import একটি একটি করে: SQLite এ একসাথে একজনই লেখে, আর dedup আগের ফাইলগুলোর কিওয়ার্ডও দেখে
+        deduper = PlannerDeduper(planner, args.dedup_threshold)
+        for path in files:
+            try:
+                with open(path, "rb") as f:
+                    for stats in import_planner_table(f, planner, store, deduper):
+                        log(f"{path}: {stats['rows']:,} rows, {stats['clusters']:,} clusters, {stats['keywords']:,} keywords ({stats['rows_per_sec']:,.0f} rows/sec)")
+            except (OSError, ValueError) as e:
+                log(f"ERROR {path}: {e}")
+        log(f"{len(deduper.finish())} duplicate/near-duplicate keywords flagged")
+    elif args.action == "cluster":
+        keywords = []
+        for path, result in map_files(read_keyword_file, files, args.jobs):
+            if "error" in result:
+                log(f"ERROR {path}: {result['error']}")
+            else:
+                keywords.extend(result["keywords"])
+        start = time.perf_counter()
+        clusters = cluster_keywords(keywords, CLUSTER_THRESHOLD if args.threshold is None else args.threshold)
+        rows, report = dedup_planner_import([c for c in clusters if not planner.has_label(c['label'])], planner, args.dedup_threshold)
+        added = store.add_clusters(rows)
+        log(f"{len(keywords):,} keywords -> {len(clusters):,} clusters in {time.perf_counter() - start:.2f}s, {len(added):,} added, {len(report)} duplicates flagged")
+    if args.action == "export" or args.output:
+        data = planner_to_json(store.list_clusters())
+        if args.output:
+            write_text(args.output, data)
+        else:
+            print(data)
+    return 0
+
+
+def cmd_write(args):
+    """planner ক্লাস্টার থেকে ড্রাফট ZIP (Smart Writer এর Batch from Planner এর মতই)"""
+    from planner_core import PLANNER_DB, PLANNER_FILE, PlannerIndex, open_planner_store
+    from writer_engine import build_batch_drafts, build_drafts_bundle, generate_drafts, writer_product_from_scrape
+    start = time.perf_counter()
+    planner = PlannerIndex(open_planner_store(args.db or PLANNER_DB, PLANNER_FILE).list_clusters())
+    clusters = planner.filtered("All" if args.all else "Pending")[:args.limit or None]
+    if not clusters:
+        log("No planner clusters to write.")
+        return 1
+    products = [writer_product_from_scrape(item) for item in read_items(args.products) if item and "error" not in item] if args.products else None
+    drafts = build_batch_drafts(clusters, products=products, location=SERP_LOCATIONS[args.location] if args.location else None,
+                                audience=args.audience, price_type=args.price, rating=args.rating, max_supporting=args.supporting)
+    markdowns = [None] * len(drafts)
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        for index, markdown in generate_drafts(drafts, pool, workers=args.jobs):
+            markdowns[index] = markdown
+    with open(args.output, "wb") as f:
+        f.write(build_drafts_bundle(drafts, markdowns, None if args.style == "none" else args.style))
+    with_product = sum(1 for d in drafts if d.get('features'))
+    log(f"{len(drafts)} drafts ({with_product} with product data) -> {args.output} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="myarticletools", description="SEO & Amazon Tool - command line batch mode")
+    parser.add_argument("--metrics", metavar="FILE", help="write hot-path timings (p50/p95) and counters as JSON when done")
+    jobs = argparse.ArgumentParser(add_help=False)
+    jobs.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 2, help="parallel workers (default: CPU count)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("scrape", parents=[jobs], help="scrape Amazon products to JSONL")
+    p.add_argument("items", nargs="*", help="Amazon URLs or ASINs")
+    p.add_argument("-i", "--input", action="append", help="file with one URL/ASIN per line")
+    p.add_argument("-o", "--output", help="JSONL file (default: stdout)")
+    p.add_argument("--no-cache", action="store_true", help="ignore the on-disk page cache")
+    p.set_defaults(func=cmd_scrape)
+
+    p = sub.add_parser("optimize", parents=[jobs], help="convert images to WebP (or responsive variants)")
+    p.add_argument("inputs", nargs="+", help="image files or folders")
+    p.add_argument("-o", "--output", default="webp", help="output folder (default: webp)")
+    p.add_argument("-q", "--quality", type=int, help="WebP quality 1-100 (default: same as the app)")
+    p.add_argument("--widths", type=int, nargs="+", help="write a srcset ladder (e.g. 320 640 1280) instead of one WebP")
+    p.set_defaults(func=cmd_optimize)
+
+    p = sub.add_parser("format", parents=[jobs], help="convert Markdown/text files to styled HTML")
+    p.add_argument("inputs", nargs="+", help=".md/.txt files or folders")
+    p.add_argument("-o", "--output", default="html", help="output folder (default: html)")
+    p.add_argument("-s", "--style", default="Modern Clean", choices=list(FORMATTER_STYLES))
+    p.set_defaults(func=cmd_format)
+
+    p = sub.add_parser("ocr", parents=[jobs], help="extract text from images, TIFFs and PDFs")
+    p.add_argument("inputs", nargs="+", help="files or folders")
+    p.add_argument("-o", "--output", default="ocr", help="output folder for .txt files (default: ocr)")
+    p.add_argument("--lang", default="eng", help="tesseract language(s), e.g. eng+ben")
+    p.add_argument("--psm", type=int, default=3, help="tesseract page segmentation mode")
+    p.set_defaults(func=cmd_ocr)
+
+    p = sub.add_parser("schema", parents=[jobs], help="generate JSON-LD snippets from product feeds")
+    p.add_argument("feeds", nargs="+", help="CSV/JSON/JSONL product feeds or folders")
+    p.add_argument("-o", "--output", help="folder for one .html snippet per product")
+    p.add_argument("--jsonl", help="write {name, script} lines to this file")
+    p.add_argument("-t", "--types", nargs="+", help="Product, Review, FAQPage and/or ItemList (default: all but ItemList)")
+    p.add_argument("--author", default="")
+    p.add_argument("--date", help="default datePublished (default: today)")
+    p.add_argument("--rating", type=float, default=4.5)
+    p.add_argument("--currency", default="USD")
+    p.add_argument("--list-name", default="", help="ItemList name")
+    p.add_argument("--pretty", action="store_true", help="indented JSON instead of compact")
+    p.set_defaults(func=cmd_schema)
+
+    p = sub.add_parser("affiliate", parents=[jobs], help="render affiliate product boxes from feeds, one HTML file per article")
+    p.add_argument("feeds", nargs="+", help="CSV, JSON or scrape JSONL feeds or folders")
+    p.add_argument("-o", "--output", default="affiliate", help="output folder (default: affiliate)")
+    p.add_argument("-d", "--design", default="detailed_review", help="default template (detailed_review, benefit_badge, featured_deal, feature_callout, vertical_card or a custom file name)")
+    p.add_argument("--templates", help="folder with custom .html templates (default: affiliate_templates or $AFFILIATE_TEMPLATE_DIR)")
+    p.add_argument("--tag", default="", help="Amazon associate tag for scraped feeds")
+    p.add_argument("--no-disclosure", action="store_true", help="leave out the affiliate disclosure")
+    p.set_defaults(func=cmd_affiliate)
+
+    p = sub.add_parser("planner", parents=[jobs], help="import, cluster or export the content planner")
+    p.add_argument("action", choices=("import", "cluster", "export"))
+    p.add_argument("inputs", nargs="*", help="CSV/XLSX files or folders to import, or keyword lists (.txt one per line, or .csv) to cluster")
+    p.add_argument("--db", help="planner database (default: $PLANNER_DB or content_planner.db)")
+    p.add_argument("-o", "--output", help="write the planner as JSON to this file")
+    p.add_argument("--threshold", type=float, help="clustering similarity threshold (default: same as the app)")
+    p.add_argument("--dedup-threshold", type=float, default=0.7, help="near-duplicate threshold")
+    p.set_defaults(func=cmd_planner)
+
+    p = sub.add_parser("write", parents=[jobs], help="render article drafts from planner clusters into a ZIP")
+    p.add_argument("-o", "--output", default="drafts.zip", help="ZIP file (default: drafts.zip)")
+    p.add_argument("--db", help="planner database (default: $PLANNER_DB or content_planner.db)")
+    p.add_argument("--all", action="store_true", help="include completed clusters (default: pending only)")
+    p.add_argument("--limit", type=int, default=0, help="maximum number of drafts")
+    p.add_argument("--products", help="scrape JSONL/JSON to match products to clusters")
+    p.add_argument("--location", choices=list(SERP_LOCATIONS), help="add cached SERP FAQs for this location (no API calls)")
+    p.add_argument("--audience", default="everyday users")
+    p.add_argument("--price", default="Mid-Range", choices=("Budget-Friendly", "Mid-Range", "Premium/Expensive"))
+    p.add_argument("--rating", type=float, default=4.5)
+    p.add_argument("--supporting", type=int, default=6, help="supporting keywords per draft")
+    p.add_argument("-s", "--style", default="Modern Clean", choices=["none"] + list(FORMATTER_STYLES), help="HTML style in the bundle, or none for Markdown only")
+    p.set_defaults(func=cmd_write)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if getattr(args, "jobs", 1) < 1:
+        args.jobs = 1
+    if args.command == "planner" and args.action != "export" and not args.inputs:
+        log(f"planner {args.action} needs at least one input file.")
+        return 2
+    status = args.func(args)
+    if args.metrics:
+        write_text(args.metrics, to_json())
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+# Image to Text (OCR) ট্যাবের worker ফাংশন আর batch OCR (app.py আর CLI দুজনেই এখান থেকে)।
+# image_pipeline এর মতই: এগুলো process pool এ চলে, তাই Streamlit স্ক্রিপ্টের বাইরে আলাদা মডিউলে।
+import os
+import math
+import time
+import importlib.util
+from concurrent.futures import as_completed
+import numpy as np
+from PIL import Image, ImageOps
+
+import image_pipeline
+from image_pipeline import HARD_PIXEL_LIMIT, MAX_IMAGE_PIXELS, ImageTooLarge, content_hash, guarded_open, open_header, tiled_reduce
+from perf_metrics import incr, observe
+
+# pytesseract আর pypdfium2 import হতে সময় নেয়, তাই শুধু দরকারের সময় (worker এ) import হয়; এখানে শুধু আছে কিনা দেখা
+HAS_PDF = importlib.util.find_spec("pypdfium2") is not None
+
+OCR_DPI = 300  # Tesseract সবচেয়ে ভালো কাজ করে ~300 DPI তে
+MAX_OCR_WIDTH = 3500  # DPI জানা না থাকলে এর চেয়ে চওড়া ছবি ছোট করা হয়
+DESKEW_MAX_ANGLE = 5.0
+DESKEW_STEP = 0.5
+DEFAULT_PREPROCESS = ("grayscale", "binarize", "deskew", "downscale")
+PSM_MODES = {3: "3 - Auto", 4: "4 - Single column", 6: "6 - Single block", 11: "11 - Sparse text"}
+UPLOAD_TYPES = ("jpg", "png", "jpeg", "tif", "tiff") + (("pdf",) if HAS_PDF else ())
+
+
+def document_kind(file_name):
+    name = file_name.lower()
+    if name.endswith(".pdf"):
+        return "pdf"
+    if name.endswith((".tif", ".tiff")):
+        return "tiff"
+    return "image"
+
+
+def count_pages(data, kind):
+    if kind == "pdf":
+        if not HAS_PDF:
+            raise RuntimeError("PDF support needs the 'pypdfium2' package (pip install pypdfium2).")
+        import pypdfium2
+        return len(pypdfium2.PdfDocument(data))
+    if kind == "tiff":
+        with open_header(data) as image:
+            return getattr(image, "n_frames", 1)
+    return 1
+
+
+def _load_page(data, kind, index, pdf=None):
+    """একটি পেজ decode করে (image, dpi) ফেরত দেয়। PDF পেজ সরাসরি OCR_DPI তে render হয়।
+    PDF/TIFF পেজও guarded_open এর মতই image_pipeline.DECODE_SEMAPHORE নিয়ে decode হয় (pool এ worker দের শেয়ার্ড
+    semaphore, তাই module attribute হিসেবে পড়া); TIFF পেজ পুরো সাইজে decode হয়, তারপর tiled_reduce।"""
+    if kind == "pdf":
+        with image_pipeline.DECODE_SEMAPHORE:
+            page = pdf[index]
+            return page.render(scale=OCR_DPI / 72).to_pil(), OCR_DPI
+    if kind == "tiff":
+        with image_pipeline.DECODE_SEMAPHORE:
+            image = open_header(data)
+            image.seek(index)
+            if image.width * image.height > HARD_PIXEL_LIMIT:
+                raise ImageTooLarge(f"Page {index + 1} is {image.width}×{image.height}, too large to process.")
+            dpi = image.info.get("dpi", (0, 0))[0]
+            image.load()
+            if image.width * image.height > MAX_IMAGE_PIXELS:
+                image, _ = tiled_reduce(image, math.ceil(math.sqrt(image.width * image.height / MAX_IMAGE_PIXELS)))
+                dpi = 0
+        return image, dpi
+    image, info = guarded_open(data)
+    dpi = 0 if info["downscaled"] else image.info.get("dpi", (0, 0))[0]
+    return image, dpi
+
+
+def otsu_threshold(pixels):
+    """Grayscale numpy array এর জন্য Otsu threshold"""
+    hist = np.bincount(pixels.ravel(), minlength=256).astype(np.float64)
+    total = pixels.size
+    cum_count = np.cumsum(hist)
+    cum_sum = np.cumsum(hist * np.arange(256))
+    mean_bg = cum_sum / np.maximum(cum_count, 1)
+    mean_fg = (cum_sum[-1] - cum_sum) / np.maximum(total - cum_count, 1)
+    between = cum_count * (total - cum_count) * (mean_bg - mean_fg) ** 2
+    return int(np.argmax(between))
+
+
+def estimate_skew(binary_image):
+    """Projection profile: ছোট করা বাইনারি ছবি কয়েক ডিগ্রি ঘুরিয়ে দেখা হয় কোন কোণে লাইনগুলো সবচেয়ে 'ধারালো'
+    (row sum এর variance সর্বোচ্চ)। সেই কোণটাই skew।"""
+    small = binary_image.copy()
+    small.thumbnail((800, 800))
+    ink = ImageOps.invert(small)
+    best_angle, best_score = 0.0, -1.0
+    steps = int(DESKEW_MAX_ANGLE / DESKEW_STEP)
+    for i in range(-steps, steps + 1):
+        angle = i * DESKEW_STEP
+        rows = np.asarray(ink.rotate(angle, expand=False), dtype=np.float32).sum(axis=1)
+        score = float(np.var(rows))
+        if score > best_score:
+            best_angle, best_score = angle, score
+    return best_angle
+
+
+def preprocess_page(image, dpi=0, steps=DEFAULT_PREPROCESS):
+    """Grayscale -> optimal DPI তে downscale -> Otsu binarize -> deskew। Returns (image, skew angle)।"""
+    angle = 0.0
+    if "grayscale" in steps or "binarize" in steps or "deskew" in steps:
+        image = image.convert("L")
+    if "downscale" in steps:
+        scale = OCR_DPI / dpi if dpi and dpi > OCR_DPI else (MAX_OCR_WIDTH / image.width if not dpi and image.width > MAX_OCR_WIDTH else 1.0)
+        if scale < 1:
+            image = image.resize((max(1, round(image.width * scale)), max(1, round(image.height * scale))), Image.LANCZOS, reducing_gap=2.0)
+    if "binarize" in steps or "deskew" in steps:
+        threshold = otsu_threshold(np.asarray(image))
+        binary = image.point(lambda p: 255 if p > threshold else 0)
+        if "binarize" in steps:
+            image = binary
+        if "deskew" in steps:
+            angle = estimate_skew(binary)
+            if angle:
+                image = image.rotate(angle, resample=Image.BICUBIC, expand=True, fillcolor=255)
+    return image, angle
+
+
+def text_from_data(data):
+    """image_to_data এর আউটপুট থেকে লেখা আবার সাজানো (block/paragraph/line অনুযায়ী), যাতে
+    image_to_string এর জন্য tesseract দ্বিতীয়বার চালাতে না হয়।"""
+    lines = []
+    current_key, current_par, words = None, None, []
+    for i, word in enumerate(data["text"]):
+        if not word.strip():
+            continue
+        key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        if key != current_key:
+            if words:
+                lines.append(" ".join(words))
+            if current_par is not None and key[:2] != current_par:
+                lines.append("")
+            current_key, current_par, words = key, key[:2], []
+        words.append(word)
+    if words:
+        lines.append(" ".join(words))
+    return "\n".join(lines)
+
+
+def ocr_pages(data, kind, indices, config="", lang="eng", steps=DEFAULT_PREPROCESS):
+    """Process pool worker: একটি ফাইলের কয়েকটি পেজ OCR করে। প্রতিটি পেজের লেখা, গড় confidence আর সময় ফেরত দেয়।"""
+    import pytesseract
+    results = []
+    pdf = None
+    if kind == "pdf":
+        import pypdfium2
+        pdf = pypdfium2.PdfDocument(data)
+    for index in indices:
+        try:
+            start = time.perf_counter()
+            image, dpi = _load_page(data, kind, index, pdf)
+            image, angle = preprocess_page(image, dpi, steps)
+            prepared = time.perf_counter()
+            ocr_data = pytesseract.image_to_data(image, lang=lang, config=config, output_type=pytesseract.Output.DICT)
+            finished = time.perf_counter()
+            confidences = [float(c) for c, w in zip(ocr_data["conf"], ocr_data["text"]) if w.strip() and float(c) >= 0]
+            results.append({
+                "page": index + 1,
+                "text": text_from_data(ocr_data),
+                "confidence": sum(confidences) / len(confidences) if confidences else 0.0,
+                "words": len(confidences),
+                "skew": angle,
+                "size": image.size,
+                "preprocess_ms": (prepared - start) * 1000,
+                "ocr_ms": (finished - prepared) * 1000
+            })
+        except Exception as e:
+            results.append({"page": index + 1, "error": str(e)})
+    return results
+
+
+def safe_page_count(name, data):
+    try:
+        return count_pages(data, document_kind(name))
+    except Exception:
+        return 1
+
+
+def run_ocr_batch(files, pool, config="", lang="eng", steps=DEFAULT_PREPROCESS, cache=None, workers=None):
+    """files: [(name, bytes)]। প্রতিটি ফাইলের সব পেজ (PDF/TIFF) process pool এ OCR হয়; শেষ হওয়া মাত্র
+    (file_index, page_result) yield করে। ক্যাশ কী = image hash + পেজ + tesseract config + preprocessing।
+    workers: pool এর worker সংখ্যা (পেজ chunk এর সাইজ ঠিক করতে; না দিলে CPU সংখ্যা)।"""
+    options_key = (config, lang, tuple(steps))
+    workers = workers or os.cpu_count() or 2
+    futures = {}
+    for file_index, (name, data) in enumerate(files):
+        kind = document_kind(name)
+        try:
+            page_count = count_pages(data, kind)
+        except Exception as e:
+            yield file_index, {"page": 1, "error": str(e)}
+            continue
+        digest = content_hash(data)
+        pending = []
+        for page in range(page_count):
+            result = cache.get((digest, page, options_key)) if cache is not None else None
+            if result is not None:
+                yield file_index, result
+            else:
+                pending.append(page)
+        # বড় PDF এর প্রতিটি পেজের জন্য পুরো ফাইল আলাদা করে worker এ পাঠানো ব্যয়বহুল, তাই কয়েকটি করে পেজ একসাথে
+        chunk = max(1, math.ceil(len(pending) / (workers * 2)))
+        for start in range(0, len(pending), chunk):
+            future = pool.submit(ocr_pages, data, kind, pending[start:start + chunk], config, lang, tuple(steps))
+            futures[future] = (file_index, digest)
+    for future in as_completed(futures):
+        file_index, digest = futures[future]
+        for result in future.result():
+            if "error" in result:
+                incr("ocr.error")
+            else:
+                observe("ocr.preprocess", result["preprocess_ms"] / 1000)
+                observe("ocr.tesseract", result["ocr_ms"] / 1000)
+                if cache is not None:
+                    cache.put((digest, result["page"] - 1, options_key), result)
+            yield file_index, result
@@ -0,0 +1,225 @@
+# হট-পাথের টাইমার আর কাউন্টার, Prometheus / JSON exporter, আর একটি রানের opt-in প্রোফাইলার।
+# Streamlit ছাড়াই চলে (app, CLI আর মডিউলগুলো সবাই ব্যবহার করে), প্রতিটি প্রসেসে একটি registry।
+import io
+import json
+import os
+import time
+import marshal
+import pstats
+import cProfile
+import threading
+import functools
+import importlib.util
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_WINDOW = int(os.environ.get("METRICS_WINDOW", 1024))  # প্রতিটি timer এর শেষ কতগুলো মাপ থেকে p50/p95
+METRICS_PREFIX = "myarticletools"
+QUANTILES = (0.5, 0.95, 0.99)
+HAS_PYINSTRUMENT = importlib.util.find_spec("pyinstrument") is not None
+
+
+def quantile(sorted_values, q):
+    """Nearest-rank quantile (সাজানো লিস্ট থেকে)"""
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+class MetricsRegistry:
+    """নাম -> শেষ window টি সময় (seconds) আর মোট count/sum; নাম -> counter। সব মেথড thread-safe,
+    একটি observe মাত্র একটি lock আর deque append, তাই হট-পাথে রাখা যায়।"""
+
+    def __init__(self, window=METRICS_WINDOW):
+        self.window = window
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.samples = {}
+        self.totals = {}
+        self.counters = {}
+
+    def observe(self, name, seconds):
+        with self.lock:
+            if name not in self.samples:
+                self.samples[name] = deque(maxlen=self.window)
+                self.totals[name] = [0, 0.0]
+            self.samples[name].append(seconds)
+            total = self.totals[name]
+            total[0] += 1
+            total[1] += seconds
+
+    def incr(self, name, value=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def timed(self, name):
+        """ফাংশন decorator: প্রতিটি কলের সময় name এ (exception হলেও)"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        """{"uptime", "timers": {name: {count, sum, p50, p95, p99, max}} (seconds), "counters": {name: n}}"""
+        with self.lock:
+            samples = {name: sorted(values) for name, values in self.samples.items()}
+            totals = {name: tuple(total) for name, total in self.totals.items()}
+            counters = dict(self.counters)
+        timers = {}
+        for name, values in samples.items():
+            count, total = totals[name]
+            timers[name] = {"count": count, "sum": total, **{f"p{round(q * 100)}": quantile(values, q) for q in QUANTILES}, "max": values[-1]}
+        return {"uptime": time.time() - self.started, "timers": timers, "counters": counters}
+
+    def reset(self):
+        with self.lock:
+            self.samples.clear()
+            self.totals.clear()
+            self.counters.clear()
+            self.started = time.time()
+
+
+REGISTRY = MetricsRegistry()
+observe = REGISTRY.observe
+incr = REGISTRY.incr
+timer = REGISTRY.timer
+timed = REGISTRY.timed
+
+
+def to_json(snapshot=None):
+    return json.dumps(snapshot or REGISTRY.snapshot(), indent=2)
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_prometheus(snapshot=None):
+    """Prometheus text format: timer গুলো একটি summary (op label, quantile), counter গুলো একটি counter (event label)"""
+    snapshot = snapshot or REGISTRY.snapshot()
+    name = f"{METRICS_PREFIX}_operation_seconds"
+    lines = [f"# HELP {name} Hot-path durations; quantiles over the last {REGISTRY.window} calls.", f"# TYPE {name} summary"]
+    for op, t in sorted(snapshot["timers"].items()):
+        op = _label(op)
+        lines.extend(f'{name}{{op="{op}",quantile="{q}"}} {t[f"p{round(q * 100)}"]:.6f}' for q in QUANTILES)
+        lines.append(f'{name}_sum{{op="{op}"}} {t["sum"]:.6f}')
+        lines.append(f'{name}_count{{op="{op}"}} {t["count"]}')
+    events = f"{METRICS_PREFIX}_events_total"
+    lines += [f"# HELP {events} Hot-path event counters.", f"# TYPE {events} counter"]
+    lines.extend(f'{events}{{event="{_label(event)}"}} {value}' for event, value in sorted(snapshot["counters"].items()))
+    lines += [f"# HELP {METRICS_PREFIX}_uptime_seconds Seconds since the metrics were started or reset.",
+              f"# TYPE {METRICS_PREFIX}_uptime_seconds gauge", f"{METRICS_PREFIX}_uptime_seconds {snapshot['uptime']:.0f}"]
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/metrics":
+            body, content_type = to_prometheus(), "text/plain; version=0.0.4; charset=utf-8"
+        elif path == "/metrics.json":
+            body, content_type = to_json(), "application/json"
+        else:
+            self.send_error(404)
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass  # প্রতিটি scrape এ stderr এ লগ নয়
+
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """/metrics (Prometheus) আর /metrics.json একটি daemon thread এ। ডিফল্টে শুধু localhost থেকে দেখা যায়।"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+
+class ProfilerBusy(RuntimeError):
+    """প্রসেসে অন্য একটি রানের profiler এখনো চালু"""
+
+
+class RunProfiler:
+    """একটি রানের opt-in প্রোফাইল: cProfile (সবসময় আছে) অথবা pyinstrument (ইনস্টল থাকলে)।
+    শুধু যে থ্রেডে start হয়েছে সেটিই মাপা হয় (Streamlit এ স্ক্রিপ্টের থ্রেড)। প্রসেসে একসাথে একটিই চালু থাকে
+    (Python 3.12+ এ দ্বিতীয় cProfile চালু করা যায় না): অন্যটি চালু থাকলে ProfilerBusy, অন্যের profiler বন্ধ করা হয় না।"""
+
+    active = None
+    lock = threading.Lock()
+
+    def __init__(self, kind="cProfile"):
+        self.kind = kind
+        self.thread = threading.current_thread()
+        with RunProfiler.lock:
+            active = RunProfiler.active
+            if active is not None:
+                if active.thread.is_alive():
+                    raise ProfilerBusy(f"A {active.kind} profiler is already running in another run ({active.thread.name})")
+                RunProfiler._stop_locked()  # যে থ্রেড চালু করেছিল সেটি আর নেই (সেশন বন্ধ হয়ে গেছে), তাই কেউ বন্ধ করবে না
+            if kind == "pyinstrument":
+                from pyinstrument import Profiler
+                self.profiler = Profiler()
+                self.profiler.start()
+            else:
+                self.profiler = cProfile.Profile()
+                self.profiler.enable()
+            RunProfiler.active = self
+
+    @classmethod
+    def _stop_locked(cls):
+        profiler, cls.active = cls.active, None
+        if profiler is None:
+            return
+        if profiler.kind == "pyinstrument":
+            profiler.profiler.stop()
+        else:
+            profiler.profiler.disable()
+
+    def stop(self):
+        """শুধু নিজেকে বন্ধ করে (একাধিকবার ডাকা যায়)"""
+        with RunProfiler.lock:
+            if RunProfiler.active is self:
+                RunProfiler._stop_locked()
+
+    def top_functions(self, limit=25):
+        """cumulative সময় অনুযায়ী শীর্ষ ফাংশন (শুধু cProfile)"""
+        if self.kind == "pyinstrument":
+            return []
+        stats = pstats.Stats(self.profiler)
+        rows = []
+        for (file_name, line, function), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            rows.append({"function": f"{function} ({os.path.basename(file_name)}:{line})", "calls": calls, "own (ms)": tottime * 1000, "cumulative (ms)": cumtime * 1000})
+        return sorted(rows, key=lambda r: r["cumulative (ms)"], reverse=True)[:limit]
+
+    def text(self, limit=40):
+        if self.kind == "pyinstrument":
+            return self.profiler.output_text(unicode=True)
+        buffer = io.StringIO()
+        pstats.Stats(self.profiler, stream=buffer).sort_stats("cumulative").print_stats(limit)
+        return buffer.getvalue()
+
+    def export(self):
+        """(bytes, file name, mime): cProfile হলে .prof (pstats / snakeviz এ খোলা যায়), pyinstrument হলে HTML"""
+        if self.kind == "pyinstrument":
+            return self.profiler.output_html().encode("utf-8"), "rerun_profile.html", "text/html"
+        self.profiler.create_stats()
+        return marshal.dumps(self.profiler.stats), "rerun.prof", "application/octet-stream"
@@ -0,0 +1,691 @@
+# Content Planner এর স্টোরেজ (SQLite), ইন-মেমরি index, কিওয়ার্ড dedup, chunked import আর ক্লাস্টারিং।
+# Streamlit ছাড়া (CLI / cron থেকেও) ব্যবহার করা যায়, তাই app.py র বাইরে আলাদা মডিউলে।
+import re
+import json
+import os
+import sqlite3
+import time
+import random
+import threading
+import zlib
+import numpy as np
+from serp_tools import build_serp_params, get_serp_cache
+from perf_metrics import timed
+
+# --- Content Planner Storage ---
+# [UPDATED] JSON ফাইলের বদলে SQLite (WAL mode)। প্রতিটি ক্লিক এখন শুধু একটি row আপডেট করে, পুরো ফাইল আবার লেখে না।
+PLANNER_FILE = 'content_planner.json'  # পুরনো ফরম্যাট: প্রথমবার এখান থেকে import হয়, আর JSON export এও একই ফরম্যাট
+PLANNER_DB = os.environ.get("PLANNER_DB", 'content_planner.db')
+
+PLANNER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS clusters (
+    id INTEGER PRIMARY KEY,
+    label TEXT NOT NULL UNIQUE,
+    done INTEGER NOT NULL DEFAULT 0,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS keywords (
+    id INTEGER PRIMARY KEY,
+    cluster_id INTEGER NOT NULL REFERENCES clusters(id) ON DELETE CASCADE,
+    keyword TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    checked INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (cluster_id, keyword)
+);
+CREATE INDEX IF NOT EXISTS idx_keywords_cluster ON keywords (cluster_id, position);
+CREATE INDEX IF NOT EXISTS idx_clusters_position ON clusters (position);
+"""
+
+def split_keywords(keywords):
+    return [k.strip() for k in keywords.split(';') if k.strip()]
+
+class PlannerStore:
+    """ক্লাস্টার আর কিওয়ার্ড আলাদা indexed row হিসেবে রাখা হয়; প্রতিটি পরিবর্তন একটি ছোট transaction।"""
+
+    def __init__(self, path=PLANNER_DB):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(PLANNER_SCHEMA)
+        self.changes = 0  # এই connection দিয়ে হওয়া write এর সংখ্যা (PRAGMA data_version এগুলো গোনে না)
+
+    def version(self):
+        """DB এর বর্তমান সংস্করণ: (এই প্রসেসের write counter, PRAGMA data_version)। একই store শেয়ার করা অন্য সেশন
+        লিখলে প্রথমটি, অন্য প্রসেস (CLI) লিখলে দ্বিতীয়টি বদলায়; বদলালে in-memory index আবার লোড করতে হবে।"""
+        with self.lock:
+            return self.changes, self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    @timed("planner.save")
+    def _write(self, sql, params=()):
+        with self.lock:
+            self.conn.execute(sql, params)
+            self.changes += 1
+
+    def is_empty(self):
+        with self.lock:
+            return self.conn.execute("SELECT 1 FROM clusters LIMIT 1").fetchone() is None
+
+    @timed("planner.reload")
+    def list_clusters(self):
+        """পুরনো JSON এর মতো dict লিস্ট: label, keywords ("; " দিয়ে জোড়া), done, checked_keywords (+ id)"""
+        with self.lock:
+            clusters = self.conn.execute("SELECT id, label, done FROM clusters ORDER BY position").fetchall()
+            rows = self.conn.execute("SELECT cluster_id, keyword, checked FROM keywords ORDER BY cluster_id, position").fetchall()
+        keywords = {}
+        for cluster_id, keyword, checked in rows:
+            keywords.setdefault(cluster_id, []).append((keyword, checked))
+        return [{
+            'id': cluster_id,
+            'label': label,
+            'keywords': "; ".join(k for k, _ in keywords.get(cluster_id, [])),
+            'done': bool(done),
+            'checked_keywords': [k for k, c in keywords.get(cluster_id, []) if c]
+        } for cluster_id, label, done in clusters]
+
+    @timed("planner.save")
+    def add_clusters(self, items):
+        """নতুন ক্লাস্টার যোগ করে (একই label আগে থাকলে বাদ)। যোগ হওয়া ক্লাস্টারগুলো id সহ ফেরত দেয়।"""
+        added = []
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                position = self.conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM clusters").fetchone()[0]
+                for item in items:
+                    cursor = self.conn.execute("INSERT OR IGNORE INTO clusters (label, done, position) VALUES (?, ?, ?)", (item['label'], int(item.get('done', False)), position))
+                    if cursor.rowcount == 0:
+                        continue
+                    cluster_id = cursor.lastrowid
+                    position += 1
+                    checked = set(item.get('checked_keywords', []))
+                    keywords = list(dict.fromkeys(split_keywords(item.get('keywords', ''))))
+                    self.conn.executemany(
+                        "INSERT OR IGNORE INTO keywords (cluster_id, keyword, position, checked) VALUES (?, ?, ?, ?)",
+                        [(cluster_id, kw, i, int(kw in checked)) for i, kw in enumerate(keywords)]
+                    )
+                    added.append({'id': cluster_id, 'label': item['label'], 'keywords': "; ".join(keywords), 'done': bool(item.get('done', False)), 'checked_keywords': [k for k in keywords if k in checked]})
+                self.conn.execute("COMMIT")
+                self.changes += 1
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return added
+
+    @timed("planner.save")
+    def append_clusters(self, items):
+        """label অনুযায়ী কিওয়ার্ড যোগ করে: নতুন label হলে ক্লাস্টার তৈরি, আগে থাকলে তার শেষে append
+        (chunk ধরে import এ একই ক্লাস্টার কয়েক chunk এ আসতে পারে)। যোগ হওয়া অংশগুলো id সহ ফেরত দেয়।"""
+        added = []
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                position = self.conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM clusters").fetchone()[0]
+                for item in items:
+                    row = self.conn.execute("SELECT id FROM clusters WHERE label = ?", (item['label'],)).fetchone()
+                    if row is None:
+                        cluster_id = self.conn.execute("INSERT INTO clusters (label, done, position) VALUES (?, 0, ?)", (item['label'], position)).lastrowid
+                        position += 1
+                        start, existing = 0, set()
+                    else:
+                        cluster_id = row[0]
+                        start = self.conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM keywords WHERE cluster_id = ?", (cluster_id,)).fetchone()[0]
+                        existing = {kw for (kw,) in self.conn.execute("SELECT keyword FROM keywords WHERE cluster_id = ?", (cluster_id,))}
+                    keywords = [kw for kw in dict.fromkeys(split_keywords(item.get('keywords', ''))) if kw not in existing]
+                    self.conn.executemany(
+                        "INSERT INTO keywords (cluster_id, keyword, position, checked) VALUES (?, ?, ?, 0)",
+                        [(cluster_id, kw, start + i) for i, kw in enumerate(keywords)]
+                    )
+                    added.append({'id': cluster_id, 'label': item['label'], 'keywords': keywords, 'done': False, 'checked_keywords': []})
+                self.conn.execute("COMMIT")
+                self.changes += 1
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return added
+
+    def set_done(self, cluster_id, done):
+        self._write("UPDATE clusters SET done = ? WHERE id = ?", (int(done), cluster_id))
+
+    def set_keyword_checked(self, cluster_id, keyword, checked):
+        self._write("UPDATE keywords SET checked = ? WHERE cluster_id = ? AND keyword = ?", (int(checked), cluster_id, keyword))
+
+    @timed("planner.save")
+    def remove_keywords(self, cluster_id, keywords):
+        with self.lock:
+            self.conn.executemany("DELETE FROM keywords WHERE cluster_id = ? AND keyword = ?", [(cluster_id, kw) for kw in keywords])
+            self.changes += 1
+
+    @timed("planner.save")
+    def save_cluster_keywords(self, cluster_id, rows):
+        """একটি ক্লাস্টারের পুরো কিওয়ার্ড লিস্ট [(keyword, checked)] একটি transaction এ সেভ করে
+        (Compact টেবিল থেকে batched commit)। বাদ পড়া কিওয়ার্ড মুছে যায়, নতুনগুলো যোগ হয়।"""
+        keep = {kw for kw, _ in rows}
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                existing = self.conn.execute("SELECT keyword FROM keywords WHERE cluster_id = ?", (cluster_id,)).fetchall()
+                self.conn.executemany("DELETE FROM keywords WHERE cluster_id = ? AND keyword = ?", [(cluster_id, kw) for (kw,) in existing if kw not in keep])
+                self.conn.executemany(
+                    "INSERT INTO keywords (cluster_id, keyword, position, checked) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (cluster_id, keyword) DO UPDATE SET position = excluded.position, checked = excluded.checked",
+                    [(cluster_id, kw, i, int(checked)) for i, (kw, checked) in enumerate(rows)]
+                )
+                self.conn.execute("COMMIT")
+                self.changes += 1
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def delete_cluster(self, cluster_id):
+        self._write("DELETE FROM clusters WHERE id = ?", (cluster_id,))
+
+    @timed("planner.save")
+    def clear(self):
+        with self.lock:
+            self.conn.execute("BEGIN")
+            self.conn.execute("DELETE FROM keywords")
+            self.conn.execute("DELETE FROM clusters")
+            self.conn.execute("COMMIT")
+            self.changes += 1
+
+    def import_json(self, path=PLANNER_FILE):
+        with open(path, 'r', encoding='utf-8') as f:
+            return self.add_clusters(json.load(f))
+
+    def export_json(self):
+        return planner_to_json(self.list_clusters())
+
+def planner_to_json(data):
+    """content_planner.json এর ফরম্যাটে export (DB এর id বাদে)"""
+    return json.dumps([{k: v for k, v in item.items() if k != 'id'} for item in data], ensure_ascii=False, indent=4)
+
+def open_planner_store(path=PLANNER_DB, legacy_file=PLANNER_FILE):
+    store = PlannerStore(path)
+    # প্রথমবার চালালে পুরনো content_planner.json থেকে ডাটা নিয়ে আসা হয়
+    if store.is_empty() and legacy_file and os.path.exists(legacy_file):
+        try:
+            store.import_json(legacy_file)
+        except (OSError, ValueError):
+            pass
+    return store
+
+class PlannerIndex:
+    """Planner এর in-memory index। কিওয়ার্ড স্ট্রিং একবারই parse হয়; label→cluster, keyword→clusters ম্যাপ
+    আর total/completed counter প্রতিটি পরিবর্তনের সাথে আপডেট হয়, তাই rerun এ আবার গোনার দরকার নেই।"""
+
+    def __init__(self, records=()):
+        self.clusters = {}  # id -> cluster (insertion order = planner order)
+        self.by_label = {}
+        self.keyword_clusters = {}  # keyword -> {cluster id, ...}
+        self.total_keywords = 0
+        self.completed_keywords = 0
+        self.add(records)
+
+    @property
+    def pending_keywords(self):
+        return self.total_keywords - self.completed_keywords
+
+    def __len__(self):
+        return len(self.clusters)
+
+    def _link(self, cluster_id, keywords):
+        for kw in keywords:
+            self.keyword_clusters.setdefault(kw, set()).add(cluster_id)
+
+    def _unlink(self, cluster_id, keywords):
+        for kw in keywords:
+            ids = self.keyword_clusters.get(kw)
+            if ids is not None:
+                ids.discard(cluster_id)
+                if not ids:
+                    del self.keyword_clusters[kw]
+
+    def add(self, records):
+        """store থেকে আসা dict গুলো (keywords "; " স্ট্রিং বা লিস্ট) index এ যোগ করে"""
+        for record in records:
+            keywords = record.get('keywords', '')
+            keywords = list(dict.fromkeys(split_keywords(keywords) if isinstance(keywords, str) else keywords))
+            checked = set(record.get('checked_keywords', ())).intersection(keywords)
+            cluster = {'id': record['id'], 'label': record['label'], 'keywords': keywords, 'checked': checked, 'done': bool(record.get('done', False))}
+            self.clusters[cluster['id']] = cluster
+            self.by_label[cluster['label']] = cluster
+            self._link(cluster['id'], keywords)
+            self.total_keywords += len(keywords)
+            self.completed_keywords += len(checked)
+
+    def extend(self, records):
+        """append_clusters এর ফল: নতুন ক্লাস্টার যোগ, আগে থাকলে কিওয়ার্ডগুলো শেষে জোড়া"""
+        for record in records:
+            cluster = self.clusters.get(record['id'])
+            if cluster is None:
+                self.add([record])
+                continue
+            current = set(cluster['keywords'])
+            keywords = [kw for kw in record['keywords'] if kw not in current]
+            cluster['keywords'].extend(keywords)
+            self._link(cluster['id'], keywords)
+            self.total_keywords += len(keywords)
+
+    def has_label(self, label):
+        return label in self.by_label
+
+    def get(self, cluster_id):
+        return self.clusters.get(cluster_id)
+
+    def filtered(self, status="All"):
+        if status == "Pending":
+            return [c for c in self.clusters.values() if not c['done']]
+        if status == "Completed":
+            return [c for c in self.clusters.values() if c['done']]
+        return list(self.clusters.values())
+
+    def set_done(self, cluster_id, done):
+        self.clusters[cluster_id]['done'] = bool(done)
+
+    def set_keyword_checked(self, cluster_id, keyword, checked):
+        cluster = self.clusters[cluster_id]
+        if checked and keyword not in cluster['checked']:
+            cluster['checked'].add(keyword)
+            self.completed_keywords += 1
+        elif not checked and keyword in cluster['checked']:
+            cluster['checked'].discard(keyword)
+            self.completed_keywords -= 1
+
+    def remove_keywords(self, cluster_id, keywords):
+        cluster = self.clusters[cluster_id]
+        removed = set(keywords).intersection(cluster['keywords'])
+        if not removed:
+            return
+        cluster['keywords'] = [k for k in cluster['keywords'] if k not in removed]
+        self.total_keywords -= len(removed)
+        self.completed_keywords -= len(cluster['checked'] & removed)
+        cluster['checked'] -= removed
+        self._unlink(cluster_id, removed)
+
+    def replace_keywords(self, cluster_id, rows):
+        """[(keyword, checked)] দিয়ে পুরো কিওয়ার্ড লিস্ট বদলানো (Compact টেবিলের save)"""
+        cluster = self.clusters[cluster_id]
+        self._unlink(cluster_id, cluster['keywords'])
+        self.total_keywords -= len(cluster['keywords'])
+        self.completed_keywords -= len(cluster['checked'])
+        checked = {kw: done for kw, done in rows}
+        cluster['keywords'] = list(checked)
+        cluster['checked'] = {kw for kw, done in checked.items() if done}
+        self._link(cluster_id, cluster['keywords'])
+        self.total_keywords += len(cluster['keywords'])
+        self.completed_keywords += len(cluster['checked'])
+
+    def delete(self, cluster_id):
+        cluster = self.clusters.pop(cluster_id)
+        self.by_label.pop(cluster['label'], None)
+        self._unlink(cluster_id, cluster['keywords'])
+        self.total_keywords -= len(cluster['keywords'])
+        self.completed_keywords -= len(cluster['checked'])
+
+    def clear(self):
+        self.__init__()
+
+    def to_records(self):
+        """content_planner.json ফরম্যাটের dict লিস্ট"""
+        return [{
+            'label': c['label'],
+            'keywords': "; ".join(c['keywords']),
+            'done': c['done'],
+            'checked_keywords': [k for k in c['keywords'] if k in c['checked']]
+        } for c in self.clusters.values()]
+
+# [NEW] Keyword Dedup (exact + MinHash/LSH near-duplicate)
+DEDUP_STOPWORDS = frozenset("a an and the for with of to in on at by from or vs best top buy your my is are".split())
+DEDUP_SHINGLE = 3
+MINHASH_PERM = 64
+LSH_BANDS = 10  # 10 band × 6 row: S-curve ~0.68 Jaccard এ, তাই 0.7 threshold এর জোড়াগুলো candidate হয়
+MINHASH_PRIME = (1 << 31) - 1
+LSH_BUCKET_WINDOW = 10  # bucket এর প্রতিটি সদস্য শুধু পরের ৯ জনের সাথে জোড়া পায় (সাধারণ শব্দের বড় bucket এ O(n²) এড়াতে)
+
+def normalize_keyword(keyword):
+    """exact duplicate ধরার জন্য: ছোট হাতের, punctuation আর বাড়তি space বাদ"""
+    return " ".join(re.findall(r"\w+", keyword.lower()))
+
+def keyword_shingles(normalized):
+    """near-duplicate এর জন্য stopword বাদ দিয়ে character 3-gram সেট"""
+    tokens = [t for t in normalized.split() if t not in DEDUP_STOPWORDS] or normalized.split()
+    text = " ".join(tokens)
+    if len(text) <= DEDUP_SHINGLE:
+        return {text}
+    return {text[i:i + DEDUP_SHINGLE] for i in range(len(text) - DEDUP_SHINGLE + 1)}
+
+def minhash_signatures(shingle_sets, num_perm=MINHASH_PERM, seed=42):
+    """সব কিওয়ার্ডের MinHash একসাথে numpy তে। প্রতিটি আলাদা shingle এর (a*x + b) mod p একবারই হিসাব হয়;
+    তারপর কিওয়ার্ডগুলো দৈর্ঘ্য অনুযায়ী সাজিয়ে j-তম shingle কলাম ধরে np.minimum চালানো হয়।"""
+    vocabulary = {}
+    ids = [[vocabulary.setdefault(sh, len(vocabulary)) for sh in shingles] for shingles in shingle_sets]
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, MINHASH_PRIME, num_perm).astype(np.uint64)
+    b = rng.randint(0, MINHASH_PRIME, num_perm).astype(np.uint64)
+    hashes = np.fromiter((zlib.crc32(sh.encode('utf-8')) for sh in vocabulary), dtype=np.uint64, count=len(vocabulary))
+    table = ((hashes[:, None] * a + b) % MINHASH_PRIME).astype(np.uint32)
+
+    lengths = np.fromiter((len(chunk) for chunk in ids), dtype=np.int64, count=len(ids))
+    flat = np.fromiter((i for chunk in ids for i in chunk), dtype=np.int64, count=int(lengths.sum()))
+    order = np.argsort(-lengths, kind="stable")
+    starts = (np.cumsum(lengths) - lengths)[order]
+    sorted_lengths = lengths[order]
+    signatures = np.full((len(ids), num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+    for j in range(int(sorted_lengths[0]) if len(ids) else 0):
+        active = int(np.count_nonzero(sorted_lengths > j))
+        np.minimum(signatures[:active], table[flat[starts[:active] + j]], out=signatures[:active])
+    result = np.empty_like(signatures)
+    result[order] = signatures
+    return result
+
+def lsh_candidate_pairs(signatures, bands=LSH_BANDS, query_from=0):
+    """MinHash signature গুলোকে band এ ভাগ করে একই bucket এ পড়া জোড়াগুলো ফেরত দেয় ((k, 2) array, i < j, unique)।
+    প্রতিটি সদস্য bucket এর পরের LSH_BUCKET_WINDOW-1 জনের সাথে জোড়া পায়, তাই বড় bucket ও O(n)।
+    query_from দিলে শুধু সেই index বা তার পরের (নতুন) কিওয়ার্ড জড়িত জোড়া।"""
+    rows = signatures.shape[1] // bands
+    count = len(signatures)
+    found = []
+    for band in range(bands):
+        keys = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows]).view(f"V{rows * signatures.itemsize}").ravel()
+        _, inverse = np.unique(keys, return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        buckets = inverse[order]
+        for offset in range(1, LSH_BUCKET_WINDOW):
+            same = np.flatnonzero(buckets[offset:] == buckets[:-offset])
+            if not len(same):
+                break
+            left, right = order[same], order[same + offset]
+            found.append(np.minimum(left, right) * count + np.maximum(left, right))
+    if not found:
+        return np.empty((0, 2), dtype=np.int64)
+    codes = np.sort(np.concatenate(found))
+    codes = codes[np.concatenate(([True], codes[1:] != codes[:-1]))]
+    pairs = np.stack((codes // count, codes % count), axis=1)
+    return pairs[pairs[:, 1] >= query_from] if query_from else pairs
+
+def shingle_pair_overlap(shingle_sets, pairs, tfidf=False, chunk_size=100000):
+    """শুধু দেওয়া (i, j) জোড়াগুলোর shingle overlap, numpy তে sparse dot product (CSR এর মতো sorted (doc, gram)
+    কী আর searchsorted)। tfidf=False: Jaccard; tfidf=True: binary tf × smooth idf, L2 normalized cosine।"""
+    vocabulary = {}
+    ids = [sorted(vocabulary.setdefault(g, len(vocabulary)) for g in grams) for grams in shingle_sets]
+    lengths = np.fromiter((len(row) for row in ids), dtype=np.int64, count=len(ids))
+    indptr = np.concatenate(([0], np.cumsum(lengths)))
+    gram_ids = np.fromiter((g for row in ids for g in row), dtype=np.int64, count=int(indptr[-1]))
+    doc_ids = np.repeat(np.arange(len(ids)), lengths)
+    if tfidf:
+        doc_freq = np.bincount(gram_ids, minlength=len(vocabulary))
+        weights = (np.log((1 + len(ids)) / (1 + doc_freq)) + 1)[gram_ids]
+        weights /= np.sqrt(np.bincount(doc_ids, weights=weights ** 2))[doc_ids]
+    else:
+        weights = np.ones(len(gram_ids))
+    keys = doc_ids * len(vocabulary) + gram_ids  # doc অনুযায়ী, তারপর gram অনুযায়ী sorted
+
+    overlap = np.zeros(len(pairs))
+    for start in range(0, len(pairs), chunk_size):
+        left, right = pairs[start:start + chunk_size, 0], pairs[start:start + chunk_size, 1]
+        row_lengths = lengths[left]
+        pair_index = np.repeat(np.arange(len(left)), row_lengths)
+        positions = np.repeat(indptr[left] - np.cumsum(row_lengths) + row_lengths, row_lengths) + np.arange(int(row_lengths.sum()))
+        query = right[pair_index] * len(vocabulary) + gram_ids[positions]
+        found = np.minimum(np.searchsorted(keys, query), len(keys) - 1)
+        contribution = np.where(keys[found] == query, weights[positions] * weights[found], 0.0)
+        overlap[start:start + chunk_size] = np.bincount(pair_index, weights=contribution, minlength=len(left))
+    if not tfidf and len(pairs):
+        overlap /= lengths[pairs[:, 0]] + lengths[pairs[:, 1]] - overlap
+    return overlap
+
+def find_near_duplicates(shingle_sets, threshold=0.7, bands=LSH_BANDS, query_from=0):
+    """LSH candidate জোড়াগুলোর আসল Jaccard যাচাই। Returns [(i, j, similarity)], i < j।"""
+    if len(shingle_sets) < 2 or query_from >= len(shingle_sets):
+        return []
+    pairs = lsh_candidate_pairs(minhash_signatures(shingle_sets), bands, query_from)
+    similarities = shingle_pair_overlap(shingle_sets, pairs)
+    keep = similarities >= threshold
+    return list(zip(pairs[keep, 0].tolist(), pairs[keep, 1].tolist(), similarities[keep].tolist()))
+
+class PlannerDeduper:
+    """Import এর dedup অবস্থা: প্ল্যানের normalized কিওয়ার্ড একবারই হ্যাশ হয়, তাই chunk ধরে import এ প্রতিটি
+    chunk শুধু exact চেক (filter) পায়, আর শেষে একবার near-duplicate পাস (finish)।"""
+
+    def __init__(self, planner, threshold=0.7, drop_exact=True, scan_existing=False):
+        self.threshold = threshold
+        self.drop_exact = drop_exact
+        self.scan_existing = scan_existing
+        self.report = []
+        self.seen = {}  # normalized -> (keyword, cluster label)
+        self.entries = []  # near-dup চেকের জন্য: (normalized, keyword, cluster label, is_new)
+        for cluster in planner.clusters.values():
+            for kw in cluster['keywords']:
+                norm = normalize_keyword(kw)
+                if norm in self.seen:
+                    if scan_existing:
+                        self._exact(kw, cluster['label'], norm, "Remove duplicate")
+                    continue
+                self.seen[norm] = (kw, cluster['label'])
+                self.entries.append((norm, kw, cluster['label'], scan_existing))
+        self.existing_count = len(self.entries)
+
+    def _exact(self, keyword, label, norm, suggestion):
+        match, match_cluster = self.seen[norm]
+        self.report.append({'type': 'exact', 'keyword': keyword, 'cluster': label, 'match': match, 'match_cluster': match_cluster, 'similarity': 1.0, 'suggestion': suggestion})
+
+    def filter(self, rows):
+        """exact duplicate বাদ (drop_exact) বা ফ্ল্যাগ করে; কোনো কিওয়ার্ড না থাকা row বাদ পড়ে"""
+        clean_rows = []
+        for row in rows:
+            kept = []
+            keywords = row['keywords']
+            for kw in (split_keywords(keywords) if isinstance(keywords, str) else keywords):
+                norm = normalize_keyword(kw)
+                if norm in self.seen:
+                    self._exact(kw, row['label'], norm, "Dropped" if self.drop_exact else "Remove duplicate")
+                    if self.drop_exact:
+                        continue
+                else:
+                    self.seen[norm] = (kw, row['label'])
+                    self.entries.append((norm, kw, row['label'], True))
+                kept.append(kw)
+            if kept:
+                clean_rows.append({**row, 'keywords': "; ".join(kept)})
+        return clean_rows
+
+    def finish(self):
+        """near-duplicate পাস; নতুন কিওয়ার্ডগুলো entries এর শেষে, তাই scan_existing না হলে শুধু ওগুলো জড়িত জোড়া"""
+        shingle_sets = [keyword_shingles(norm) for norm, _, _, _ in self.entries]
+        query_from = 0 if self.scan_existing else self.existing_count
+        for i, j, similarity in find_near_duplicates(shingle_sets, self.threshold, query_from=query_from):
+            # পরে আসা কিওয়ার্ডটি আগেরটির সাথে merge করার প্রস্তাব
+            _, kw, label, _ = self.entries[j]
+            _, match, match_label, _ = self.entries[i]
+            suggestion = f"Merge into '{match_label}'" if label != match_label else "Keep one of the two"
+            self.report.append({'type': 'near', 'keyword': kw, 'cluster': label, 'match': match, 'match_cluster': match_label, 'similarity': round(similarity, 3), 'suggestion': suggestion})
+        return self.report
+
+def dedup_planner_import(rows, planner, threshold=0.7, drop_exact=True, scan_existing=False):
+    """Import এর আগে dedup: exact duplicate (normalize করে) বাদ/ফ্ল্যাগ, আর পুরো প্ল্যানের সাথে near-duplicate খুঁজে
+    merge suggestion। Returns (clean rows, report rows)।"""
+    deduper = PlannerDeduper(planner, threshold, drop_exact, scan_existing)
+    clean_rows = deduper.filter(rows)
+    return clean_rows, deduper.finish()
+
+# [NEW] Chunked Planner Import
+PLANNER_IMPORT_CHUNK = 5000
+
+def iter_table_chunks(uploaded_file, chunksize=PLANNER_IMPORT_CHUNK):
+    """CSV (read_csv chunksize) বা XLSX (openpyxl read-only) ফাইল DataFrame chunk হিসেবে পড়ে, পুরো ফাইল
+    মেমোরিতে না এনে। Yields (chunk, পড়া অংশের ভগ্নাংশ)।
+    pandas/openpyxl শুধু import এর সময় লোড হয় — planner এর বাকি অংশ (SQLite, index, clustering) এদের ছাড়াই চলে।"""
+    import pandas as pd
+    if uploaded_file.name.lower().endswith('.csv'):
+        # Streamlit upload এ .size থাকে; CLI থেকে সাধারণ ফাইল অবজেক্ট আসে
+        total = getattr(uploaded_file, 'size', None) or os.fstat(uploaded_file.fileno()).st_size or 1
+        for chunk in pd.read_csv(uploaded_file, chunksize=chunksize, dtype=str, keep_default_na=False, on_bad_lines='skip'):
+            yield chunk, min(uploaded_file.tell() / total, 1.0)
+        return
+    import openpyxl
+    workbook = openpyxl.load_workbook(uploaded_file, read_only=True, data_only=True)
+    try:
+        sheet = workbook.active
+        rows = sheet.iter_rows(values_only=True)
+        header = [str(c) if c is not None else f"column_{i}" for i, c in enumerate(next(rows, ()))]
+        total = max((sheet.max_row or 1) - 1, 1)
+        batch, done = [], 0
+        for row in rows:
+            batch.append(row[:len(header)])
+            if len(batch) == chunksize:
+                done += len(batch)
+                yield pd.DataFrame(batch, columns=header[:len(batch[0])]), min(done / total, 1.0)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header[:len(batch[0])]), 1.0
+    finally:
+        workbook.close()
+
+def detect_planner_columns(df):
+    """label/cluster আর keyword কলাম খুঁজে বের করে। keyword কলাম কয়েকটি হলে যেটিতে ';' বা লম্বা লেখা আছে সেটি।"""
+    label_cols = [c for c in df.columns if 'label' in str(c).lower() or 'cluster' in str(c).lower()]
+    kw_cols = [c for c in df.columns if 'keyword' in str(c).lower()]
+    label_col = label_cols[0] if label_cols else None
+    kw_col = None
+    for col in kw_cols:
+        sample = df[col].replace('', None).dropna()
+        if not sample.empty and isinstance(sample.iloc[0], str) and (';' in sample.iloc[0] or len(sample.iloc[0]) > 5):
+            kw_col = col
+            break
+    if kw_cols and not kw_col:
+        kw_col = kw_cols[0]
+    return label_col, kw_col
+
+def import_planner_table(uploaded_file, planner, store, deduper, chunksize=PLANNER_IMPORT_CHUNK):
+    """chunk ধরে import: কলাম একবার খোঁজা, প্রতি chunk এ vectorized normalize আর label অনুযায়ী গ্রুপ (এক রো তে
+    একটি ক্লাস্টার বা এক রো তে একটি কিওয়ার্ড, দুটোই চলে), exact dedup, তারপর store এ এক transaction এ append।
+    প্রতি chunk শেষে progress dict yield করে।"""
+    import pandas as pd
+    preexisting = set(planner.by_label)
+    label_col = kw_col = None
+    rows_done = clusters_added = keywords_added = 0
+    start = time.perf_counter()
+    for chunk, fraction in iter_table_chunks(uploaded_file, chunksize):
+        if label_col is None:
+            label_col, kw_col = detect_planner_columns(chunk)
+            if not (label_col and kw_col):
+                raise ValueError("Could not identify 'Cluster Label' and 'Keywords' columns. Ensure CSV headers are correct.")
+        labels = chunk[label_col].fillna('').astype(str).str.strip()
+        keywords = chunk[kw_col].fillna('').astype(str).str.strip()
+        mask = (labels != '') & (keywords != '') & ~labels.isin(preexisting)
+        grouped = pd.DataFrame({'label': labels[mask], 'keywords': keywords[mask]}).groupby('label', sort=False)['keywords'].agg("; ".join)
+        rows = deduper.filter([{'label': label, 'keywords': kws} for label, kws in grouped.items()])
+        added = store.append_clusters(rows)
+        clusters_added += sum(1 for item in added if not planner.get(item['id']))
+        keywords_added += sum(len(item['keywords']) for item in added)
+        planner.extend(added)
+        rows_done += len(chunk)
+        elapsed = time.perf_counter() - start
+        yield {
+            "rows": rows_done,
+            "clusters": clusters_added,
+            "keywords": keywords_added,
+            "fraction": fraction,
+            "seconds": elapsed,
+            "rows_per_sec": rows_done / elapsed if elapsed else 0.0
+        }
+
+# [NEW] Offline Keyword Clustering
+CLUSTER_BANDS = 21  # 21 band × 3 row: ~0.36 Jaccard থেকেই candidate, ক্লাস্টারিং এর জন্য ঢিলা
+CLUSTER_THRESHOLD = 0.5
+CLUSTER_BENCH_HEADS = ("walking cane", "dog food", "running shoes", "office chair", "coffee maker", "air fryer", "yoga mat",
+                       "electric bike", "baby monitor", "gaming mouse", "water bottle", "standing desk", "hiking backpack",
+                       "led strip", "air purifier", "kitchen knife", "wireless earbuds", "camping tent", "hair dryer", "phone case")
+CLUSTER_BENCH_MODIFIERS = ("best", "cheap", "top rated", "for seniors", "for kids", "for women", "for men", "review", "vs",
+                           "under 50", "under 100", "2025", "how to choose", "reddit", "amazon", "lightweight", "heavy duty",
+                           "portable", "waterproof", "buying guide")
+
+def serp_overlap_urls(keywords, location):
+    """ক্যাশে থাকা SerpApi রেজাল্ট থেকে কিওয়ার্ড -> প্রথম ১০টি organic URL সেট (কোনো API কল হয় না)"""
+    cache = get_serp_cache()
+    urls = {}
+    for keyword in keywords:
+        results = cache.lookup(build_serp_params(keyword, location, ""))
+        if results:
+            links = {res.get('link') for res in results.get("organic_results", [])[:10] if res.get('link')}
+            if links:
+                urls[keyword] = links
+    return urls
+
+def cluster_keywords(keywords, threshold=CLUSTER_THRESHOLD, serp_urls=None, serp_weight=0.5, bands=CLUSTER_BANDS):
+    """ফ্ল্যাট কিওয়ার্ড লিস্ট থেকে planner ক্লাস্টার। MinHash/LSH দিয়ে approximate neighbour জোড়া, সেগুলোর
+    char 3-gram TF-IDF cosine (SERP URL থাকলে overlap মিশিয়ে), তারপর leader pass। Returns [{'label', 'keywords'}]।"""
+    keywords = list(dict.fromkeys(k.strip() for k in keywords if k and k.strip()))
+    if not keywords:
+        return []
+    shingle_sets = [keyword_shingles(normalize_keyword(k)) for k in keywords]
+    pairs = lsh_candidate_pairs(minhash_signatures(shingle_sets), bands)
+    serp_urls = serp_urls or {}
+    if serp_urls:
+        # একই URL র‍্যাঙ্ক করা কিওয়ার্ডগুলোও candidate (লেখায় মিল না থাকলেও)
+        index = {k: i for i, k in enumerate(keywords)}
+        by_url = {}
+        for keyword, urls in serp_urls.items():
+            if keyword in index:
+                for url in urls:
+                    by_url.setdefault(url, []).append(index[keyword])
+        extra = [(members[x], members[y]) for members in (sorted(m)[:LSH_BUCKET_WINDOW] for m in by_url.values())
+                 for x in range(len(members)) for y in range(x + 1, len(members))]
+        if extra:
+            pairs = np.unique(np.vstack((pairs, np.array(extra, dtype=np.int64))), axis=0)
+
+    similarities = shingle_pair_overlap(shingle_sets, pairs, tfidf=True)
+    if serp_urls:
+        for n, (i, j) in enumerate(pairs.tolist()):
+            urls_i, urls_j = serp_urls.get(keywords[i]), serp_urls.get(keywords[j])
+            if urls_i and urls_j:
+                similarities[n] = (1 - serp_weight) * similarities[n] + serp_weight * len(urls_i & urls_j) / len(urls_i | urls_j)
+
+    neighbours = [[] for _ in keywords]
+    strength = np.zeros(len(keywords))
+    keep = similarities >= threshold
+    np.add.at(strength, pairs[keep, 0], similarities[keep])
+    np.add.at(strength, pairs[keep, 1], similarities[keep])
+    for i, j in pairs[keep].tolist():
+        neighbours[i].append(j)
+        neighbours[j].append(i)
+
+    # Leader pass: সবচেয়ে বেশি সংযুক্ত কিওয়ার্ড আগে leader হয়, তার সরাসরি neighbour গুলো ওই ক্লাস্টারে যায়।
+    # পুরো connected component নিলে modifier ("best", "for kids") এর মাধ্যমে সব এক ক্লাস্টারে জুড়ে যায়।
+    assigned = [False] * len(keywords)
+    clusters = []
+    for head in sorted(range(len(keywords)), key=lambda i: (-strength[i], len(keywords[i]))):
+        if assigned[head]:
+            continue
+        members = [head] + [j for j in neighbours[head] if not assigned[j]]
+        for j in members:
+            assigned[j] = True
+        clusters.append({'label': keywords[head], 'keywords': "; ".join(keywords[j] for j in sorted(members))})
+    clusters.sort(key=lambda c: -c['keywords'].count(";"))
+    return clusters
+
+def benchmark_keyword_list(count=20000, seed=7):
+    """বেঞ্চমার্কের জন্য নির্দিষ্ট (seeded) count টি আলাদা কিওয়ার্ড: head term × modifier × কিছু ভিন্নতা।
+    ডুপ্লিকেট বাদ, তাই "keywords" আর keywords/sec সত্যিই count টি কিওয়ার্ডের মাপ।"""
+    rng = random.Random(seed)
+    keywords = {}
+    while len(keywords) < count:
+        head = rng.choice(CLUSTER_BENCH_HEADS) + rng.choice(("", "", "s", f" {rng.randint(1, 400)}"))
+        parts = rng.sample(CLUSTER_BENCH_MODIFIERS, rng.randint(1, 2))
+        keywords.setdefault(" ".join(parts[:1] + [head] + parts[1:]), None)
+    return list(keywords)
+
+def benchmark_keyword_clustering(count=20000, threshold=CLUSTER_THRESHOLD):
+    keywords = benchmark_keyword_list(count)
+    start = time.perf_counter()
+    clusters = cluster_keywords(keywords, threshold)
+    elapsed = time.perf_counter() - start
+    return {
+        "keywords": len(keywords),
+        "clusters": len(clusters),
+        "seconds": elapsed,
+        "keywords_per_sec": len(keywords) / elapsed if elapsed else 0.0,
+        "clusters_per_sec": len(clusters) / elapsed if elapsed else 0.0
+    }
@@ -0,0 +1,237 @@
+# Schema Gen ট্যাবের JSON-LD বিল্ডার, validator আর serializer।
+# Streamlit ছাড়া (CLI / cron থেকেও) ব্যবহার করা যায়, তাই app.py র বাইরে আলাদা মডিউলে।
+import re
+import json
+import time
+import pandas as pd
+from comparison_table import NUMBER_RE
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# [NEW] Bulk JSON-LD Schema
+SCHEMA_CONTEXT = "https://schema.org/"
+SCHEMA_TYPES = ("Product", "Review", "FAQPage", "ItemList")
+SCHEMA_FIELDS = ('name', 'sku', 'brand', 'image', 'description', 'rating', 'review_body', 'author', 'date_published', 'url', 'price', 'currency', 'faqs')
+SCHEMA_FEED_ALIASES = {
+    'title': 'name', 'product': 'name', 'product_name': 'name',
+    'asin': 'sku', 'link': 'url', 'product_url': 'url', 'affiliate_link': 'url',
+    'image_url': 'image', 'img': 'image', 'summary': 'description', 'description_text': 'description',
+    'stars': 'rating', 'review': 'review_body', 'reviewbody': 'review_body',
+    'reviewer': 'author', 'date': 'date_published', 'review_date': 'date_published',
+    'faq': 'faqs', 'questions': 'faqs', 'cost': 'price', 'price_currency': 'currency'
+}
+ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+AMAZON_DP_RE = re.compile(r"/dp/([A-Z0-9]{10})")
+
+def prepare_schema_feed(df, defaults):
+    """কলামের নাম মিলিয়ে নেওয়া আর খালি ঘরে ডিফল্ট (author, date, rating, currency, brand) বসানো — কলাম ধরে"""
+    df = df.rename(columns=lambda c: str(c).strip().lower().replace(' ', '_')).rename(columns=SCHEMA_FEED_ALIASES)
+    df = df.loc[:, ~df.columns.duplicated()].reset_index(drop=True)
+    for field in SCHEMA_FIELDS:
+        if field not in df.columns:
+            df[field] = ""
+    text_fields = [f for f in SCHEMA_FIELDS if f != 'faqs']
+    df[text_fields] = df[text_fields].fillna("").astype(str).apply(lambda col: col.str.strip())
+    for field, value in defaults.items():
+        if value not in (None, ""):
+            df[field] = df[field].mask(df[field] == "", str(value))
+    # "$1,299.00" -> "1299.00": schema.org এর price এ শুধু সংখ্যা
+    df['price'] = df['price'].str.replace(",", "", regex=False).str.extract(NUMBER_RE, expand=False).fillna("")
+    # Amazon লিংক থেকে ASIN = SKU
+    missing_sku = df['sku'] == ""
+    df.loc[missing_sku, 'sku'] = df.loc[missing_sku, 'url'].str.extract(AMAZON_DP_RE, expand=False).fillna("")
+    return df
+
+def parse_faqs(value):
+    """[(question, answer)] — লিস্ট/JSON অথবা প্রতি লাইনে "Question? | Answer" টেক্সট"""
+    if isinstance(value, (list, tuple)):
+        return [(q, a) for q, a in value]
+    if not isinstance(value, str) or not value.strip():
+        return []
+    pairs = []
+    for line in value.splitlines():
+        question, _, answer = line.partition("|")
+        if question.strip():
+            pairs.append((question.strip(), answer.strip()))
+    return pairs
+
+def build_json_ld(row, types):
+    """একটি রো থেকে JSON-LD নোড(গুলো): Product (ভেতরে Review/Offer), অথবা আলাদা Review, আর FAQPage।
+    কিছুই তৈরি না হলে (যেমন শুধু FAQPage কিন্তু FAQ নেই) None।"""
+    nodes = []
+    review = None
+    if "Review" in types:
+        review = {
+            "@type": "Review",
+            "reviewRating": {"@type": "Rating", "ratingValue": row['rating'], "bestRating": "5"},
+            "author": {"@type": "Person", "name": row['author']},
+        }
+        if row['date_published']:
+            review["datePublished"] = row['date_published']
+        if row['review_body'] or row['description']:
+            review["reviewBody"] = row['review_body'] or row['description']
+    if "Product" in types:
+        product = {"@type": "Product", "name": row['name']}
+        for key, field in (("image", 'image'), ("description", 'description'), ("sku", 'sku'), ("url", 'url')):
+            if row[field]:
+                product[key] = row[field]
+        if row['brand']:
+            product["brand"] = {"@type": "Brand", "name": row['brand']}
+        if row['price']:
+            product["offers"] = {"@type": "Offer", "price": row['price'], "priceCurrency": row['currency']}
+            if row['url']:
+                product["offers"]["url"] = row['url']
+        if review:
+            product["review"] = review
+        nodes.append(product)
+    elif review:
+        review["itemReviewed"] = {"@type": "Product", "name": row['name']}
+        nodes.append(review)
+    if "FAQPage" in types:
+        faqs = parse_faqs(row['faqs'])
+        if faqs:
+            nodes.append({"@type": "FAQPage", "mainEntity": [
+                {"@type": "Question", "name": q, "acceptedAnswer": {"@type": "Answer", "text": a}} for q, a in faqs
+            ]})
+    if not nodes:
+        return None
+    if len(nodes) == 1:
+        return {"@context": SCHEMA_CONTEXT, **nodes[0]}
+    return {"@context": SCHEMA_CONTEXT, "@graph": nodes}
+
+def build_item_list(rows, name=""):
+    """পুরো feed এর জন্য একটি ItemList (carousel / "best of" লিস্ট পেজ)"""
+    elements = []
+    for position, row in enumerate(rows, start=1):
+        element = {"@type": "ListItem", "position": position, "name": row['name']}
+        if row['url']:
+            element["url"] = row['url']
+        elements.append(element)
+    item_list = {"@context": SCHEMA_CONTEXT, "@type": "ItemList", "itemListElement": elements}
+    if name:
+        item_list["name"] = name
+    return item_list
+
+def validate_json_ld(node, nested=False):
+    """schema.org / Google rich result এর আবশ্যক ফিল্ড যাচাই (লোকালি)। Returns [(type, field, problem)]।"""
+    if "@graph" in node:
+        return [issue for child in node["@graph"] for issue in validate_json_ld(child)]
+    kind = node.get("@type", "")
+    issues = []
+    if kind == "Product":
+        if not node.get("name"):
+            issues.append((kind, "name", "missing"))
+        if not any(key in node for key in ("review", "aggregateRating", "offers")):
+            issues.append((kind, "review/offers", "needs review, aggregateRating or offers"))
+        for key in ("image", "url"):
+            if node.get(key) and not str(node[key]).startswith(("http://", "https://")):
+                issues.append((kind, key, "not an absolute URL"))
+        if "offers" in node:
+            issues.extend(validate_json_ld(node["offers"], nested=True))
+        if "review" in node:
+            issues.extend(validate_json_ld(node["review"], nested=True))
+    elif kind == "Review":
+        rating = node.get("reviewRating", {})
+        try:
+            value = float(rating.get("ratingValue"))
+            if not float(rating.get("worstRating", 1)) <= value <= float(rating.get("bestRating", 5)):
+                issues.append((kind, "ratingValue", "outside worstRating..bestRating"))
+        except (TypeError, ValueError):
+            issues.append((kind, "ratingValue", "missing or not a number"))
+        if not node.get("author", {}).get("name"):
+            issues.append((kind, "author.name", "missing"))
+        if not nested and not node.get("itemReviewed", {}).get("name"):
+            issues.append((kind, "itemReviewed", "missing"))
+        if node.get("datePublished") and not ISO_DATE_RE.fullmatch(str(node["datePublished"])[:10]):
+            issues.append((kind, "datePublished", "not an ISO date (YYYY-MM-DD)"))
+    elif kind == "Offer":
+        try:
+            float(str(node.get("price", "")).replace(",", "").lstrip("$€£"))
+        except ValueError:
+            issues.append((kind, "price", "not a number"))
+        if not node.get("priceCurrency"):
+            issues.append((kind, "priceCurrency", "missing"))
+    elif kind == "FAQPage":
+        questions = node.get("mainEntity") or []
+        if not questions:
+            issues.append((kind, "mainEntity", "no questions"))
+        for question in questions:
+            if not question.get("name"):
+                issues.append((kind, "Question.name", "missing"))
+            if not question.get("acceptedAnswer", {}).get("text"):
+                issues.append((kind, "acceptedAnswer.text", f"missing for '{str(question.get('name', ''))[:60]}'"))
+    elif kind == "ItemList":
+        elements = node.get("itemListElement") or []
+        if not elements:
+            issues.append((kind, "itemListElement", "empty"))
+        for element in elements:
+            if "position" not in element or not (element.get("url") or element.get("item")):
+                issues.append((kind, "ListItem", f"position {element.get('position', '?')} needs url or item"))
+    return issues
+
+def serialize_json_ld(data, compact=False):
+    """compact হলে orjson (থাকলে) বা separator ছাড়া json; না হলে আগের মতো indent=4"""
+    if compact and HAS_ORJSON:
+        return orjson.dumps(data).decode("utf-8")
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps(data, indent=4, ensure_ascii=False)
+
+def json_ld_script(data, compact=False):
+    # লেখার ভেতরে "</script>" থাকলে যেন ট্যাগ ভেঙে না যায়
+    body = serialize_json_ld(data, compact).replace("</", "<\\/")
+    return f'<script type="application/ld+json">\n{body}\n</script>'
+
+def generate_bulk_schema(df, types, defaults, compact=True, list_name=""):
+    """এক পাসে প্রতিটি রোর JSON-LD তৈরি, যাচাই আর serialize। Returns (snippets [(name, script)], issues DataFrame,
+    ItemList script বা None, stats)।"""
+    start = time.perf_counter()
+    feed = prepare_schema_feed(df, defaults)
+    # to_dict('records') সেল ধরে বক্স করে (ধীর); কলাম ধরে tolist করে zip অনেক দ্রুত
+    rows = [dict(zip(SCHEMA_FIELDS, values)) for values in zip(*(feed[field].tolist() for field in SCHEMA_FIELDS))]
+    row_types = [t for t in types if t != "ItemList"]
+    snippets, issues = [], []
+    for index, row in enumerate(rows, start=1):
+        if row_types:
+            document = build_json_ld(row, row_types)
+            if document is None:
+                issues.append({'row': index, 'name': row['name'][:60], 'type': "FAQPage", 'field': "faqs", 'problem': "no FAQs for this row (skipped)"})
+                continue
+            issues.extend({'row': index, 'name': row['name'][:60], 'type': t, 'field': f, 'problem': p} for t, f, p in validate_json_ld(document))
+            snippets.append((row['name'] or f"product-{index}", json_ld_script(document, compact)))
+    item_list_script = None
+    if "ItemList" in types and rows:
+        item_list = build_item_list(rows, list_name)
+        issues.extend({'row': 0, 'name': list_name, 'type': t, 'field': f, 'problem': p} for t, f, p in validate_json_ld(item_list))
+        item_list_script = json_ld_script(item_list, compact)
+    elapsed = time.perf_counter() - start
+    return snippets, pd.DataFrame(issues, columns=['row', 'name', 'type', 'field', 'problem']), item_list_script, {
+        "rows": len(rows),
+        "seconds": elapsed,
+        "rows_per_sec": len(rows) / elapsed if elapsed else 0.0,
+        "kb": (sum(len(script) for _, script in snippets) + len(item_list_script or "")) / 1024,
+        "serializer": "orjson" if compact and HAS_ORJSON else "json"
+    }
+
+def benchmark_bulk_schema(count=10000):
+    """count টি প্রোডাক্টের Product+Review+FAQPage+ItemList, pretty json বনাম compact (orjson থাকলে orjson)"""
+    df = pd.DataFrame({
+        'name': [f"Sample Product {i}" for i in range(count)],
+        'url': [f"https://www.amazon.com/dp/B0{i:08d}" for i in range(count)],
+        'image': [f"https://m.media-amazon.com/images/I/{i}.jpg" for i in range(count)],
+        'description': "Lightweight frame with adjustable height.",
+        'price': [f"{20 + i % 80}.99" for i in range(count)],
+        'rating': [f"{3.5 + (i % 15) / 10:.1f}" for i in range(count)],
+        'faqs': "Is it adjustable? | Yes, in 10 steps.\nDoes it fold? | Yes."
+    })
+    defaults = {'author': "Editor", 'date_published': "2024-01-01", 'currency': "USD", 'brand': "Generic"}
+    results = []
+    for compact in (False, True):
+        snippets, issues, _, stats = generate_bulk_schema(df, SCHEMA_TYPES, defaults, compact=compact)
+        results.append({"serializer": stats['serializer'] + (" (compact)" if compact else " (indent=4)"), "rows": count, "seconds": stats['seconds'],
+                        "rows_per_sec": stats['rows_per_sec'], "kb": stats['kb'], "issues": len(issues)})
+    return results
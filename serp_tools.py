@@ -0,0 +1,255 @@
+# SEO Research ট্যাবের SerpApi ক্যাশ আর bulk রিসার্চ।
+# Streamlit ছাড়া (CLI / cron থেকেও) ব্যবহার করা যায়, তাই app.py র বাইরে আলাদা মডিউলে।
+import re
+import json
+import os
+import io
+import time
+import hashlib
+import threading
+import functools
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from amazon_scraper import atomic_write
+from perf_metrics import incr, timed
+
+# [NEW] SerpApi Result Cache
+SERP_CACHE_DIR = os.environ.get("SERP_CACHE_DIR", os.path.join(".cache", "serp"))
+SERP_CACHE_DEFAULT_HOURS = 24
+# সাইডবারের দেশ -> SerpApi প্যারামিটার আর ক্যাশের মেয়াদ
+SERP_LOCATIONS = {
+    "United States": {"gl": "us", "loc": "United States", "domain": "google.com", "cache_hours": 12},
+    "United Kingdom": {"gl": "uk", "loc": "United Kingdom", "domain": "google.co.uk", "cache_hours": 24},
+    "Bangladesh": {"gl": "bd", "loc": "Bangladesh", "domain": "google.com.bd", "cache_hours": 72},
+    "India": {"gl": "in", "loc": "India", "domain": "google.co.in", "cache_hours": 48}
+}
+
+def serp_cache_key(params):
+    """api_key বাদ দিয়ে normalized params থেকে কী বানায়, যাতে ভিন্ন ইউজারের একই সার্চ একই কী পায়"""
+    normalized = {k: str(v).strip() for k, v in params.items() if k != "api_key"}
+    if "q" in normalized:
+        normalized["q"] = " ".join(normalized["q"].lower().split())
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True).encode("utf-8")).hexdigest()
+
+class SerpCache:
+    """SerpApi রেজাল্টের disk ক্যাশ। একই কী এর জন্য একসাথে একাধিক সেশন চাইলে শুধু একটি upstream কল যায়,
+    বাকিরা সেই কলের রেজাল্টের জন্য অপেক্ষা করে।"""
+
+    def __init__(self, directory=SERP_CACHE_DIR):
+        self.directory = directory
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.counters = {"hits": 0, "misses": 0, "shared": 0, "errors": 0}
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+        incr(f"serp.{name}")
+
+    def _load(self, key, ttl):
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("fetched_at", 0) > ttl:
+            return None
+        return entry["results"]
+
+    def get_or_fetch(self, params, fetch, ttl=SERP_CACHE_DEFAULT_HOURS * 3600, force_refresh=False):
+        """Returns (results, status) — status: "hit", "miss" অথবা "shared" """
+        key = serp_cache_key(params)
+        if not force_refresh:
+            results = self._load(key, ttl)
+            if results is not None:
+                self._count("hits")
+                return results, "hit"
+
+        with self.lock:
+            future = self.in_flight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self.in_flight[key] = future
+        if not is_owner:
+            self._count("shared")
+            return future.result(), "shared"
+
+        try:
+            # lock নেওয়ার আগেই অন্য কেউ ফেচ শেষ করে থাকলে ডিস্কেই পাওয়া যাবে
+            results = None if force_refresh else self._load(key, ttl)
+            if results is not None:
+                self._count("hits")
+                future.set_result(results)
+                return results, "hit"
+            self._count("misses")
+            results = fetch(params)
+            if "error" not in results:
+                atomic_write(self._path(key), json.dumps({"fetched_at": time.time(), "results": results}, ensure_ascii=False).encode("utf-8"))
+            future.set_result(results)
+            return results, "miss"
+        except Exception as e:
+            self._count("errors")
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.in_flight.pop(key, None)
+
+    def lookup(self, params, ttl=None):
+        """শুধু ক্যাশে থাকলে রেজাল্ট (কোনো API কল বা counter আপডেট নেই), না থাকলে None"""
+        return self._load(serp_cache_key(params), float("inf") if ttl is None else ttl)
+
+    def stats(self):
+        with self.lock:
+            counters = dict(self.counters)
+        lookups = counters["hits"] + counters["misses"] + counters["shared"]
+        counters["hit_rate"] = (counters["hits"] + counters["shared"]) / lookups if lookups else 0.0
+        counters["entries"] = len([f for f in os.scandir(self.directory) if f.name.endswith(".json")])
+        return counters
+
+@functools.lru_cache(maxsize=None)
+def get_serp_cache():
+    return SerpCache()
+
+@timed("serp.api")
+def fetch_serp_results(params):
+    from serpapi import GoogleSearch  # শুধু আসল API কলের সময় import (ক্যাশ hit এ দরকার নেই)
+    return GoogleSearch(params).get_dict()
+
+def cached_serp_search(params, ttl_hours=SERP_CACHE_DEFAULT_HOURS, force_refresh=False):
+    return get_serp_cache().get_or_fetch(params, fetch_serp_results, ttl=ttl_hours * 3600, force_refresh=force_refresh)
+
+def build_serp_params(keyword, location, api_key):
+    return {
+        "engine": "google",
+        "q": keyword,
+        "location": location["loc"],
+        "google_domain": location["domain"],
+        "gl": location["gl"],
+        "hl": "en",
+        "api_key": api_key
+    }
+
+def summarize_serp_results(results):
+    """SerpApi রেজাল্ট থেকে snippet, LSI, FAQ আর প্রথম ১০টি competitor (title, link) বের করে"""
+    snippet_content = "No direct snippet found."
+    if "answer_box" in results:
+        box = results["answer_box"]
+        if "snippet" in box: snippet_content = box["snippet"]
+        elif "answer" in box: snippet_content = box["answer"]
+        elif "list" in box: snippet_content = "\n".join(box["list"])
+
+    return {
+        "snippet": snippet_content,
+        "lsi": [i['query'] for i in results.get("related_searches", [])],
+        "faqs": [q['question'] for q in results.get("related_questions", [])],
+        "competitors": [(res.get('title'), res.get('link')) for res in results.get("organic_results", [])[:10]]
+    }
+
+# [NEW] Bulk SERP Research
+SERP_JOBS_DIR = os.path.join(".cache", "serp_jobs")
+
+class RateLimiter:
+    """সব থ্রেড মিলিয়ে প্রতি সেকেন্ডে rate_per_sec টির বেশি কল যেতে দেয় না"""
+
+    def __init__(self, rate_per_sec):
+        self.interval = 1.0 / rate_per_sec
+        self.lock = threading.Lock()
+        self.next_time = time.monotonic()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            wait_for = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+        if wait_for > 0:
+            time.sleep(wait_for)
+
+def parse_keyword_list(text, is_csv=False):
+    if is_csv:
+        import pandas as pd  # শুধু CSV লিস্টের জন্য
+        df = pd.read_csv(io.StringIO(text))
+        kw_cols = [c for c in df.columns if 'keyword' in str(c).lower()] or [df.columns[0]]
+        return [str(k).strip() for k in df[kw_cols[0]].dropna() if str(k).strip()]
+    return [line.strip() for line in re.split(r"[\n;]", text) if line.strip()]
+
+def serp_job_path(keywords, location):
+    """একই কিওয়ার্ড লিস্ট + লোকেশনের জন্য সবসময় একই job ফাইল, তাই সেশন কেটে গেলে আবার চালালে resume হয়"""
+    job_id = hashlib.sha256(json.dumps([location["gl"], sorted(keywords)]).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(SERP_JOBS_DIR, f"{job_id}.jsonl")
+
+def load_serp_job(job_path):
+    rows = {}
+    if os.path.exists(job_path):
+        with open(job_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue  # crash এর সময় অর্ধেক লেখা লাইন
+                if row.get("status") != "error":
+                    rows[row["keyword"]] = row
+    return rows
+
+def serp_row(keyword, summary, status):
+    return {
+        "keyword": keyword,
+        "snippet": summary["snippet"],
+        "lsi": ", ".join(summary["lsi"]),
+        "faqs": " | ".join(summary["faqs"]),
+        "competitors": " | ".join([link for _, link in summary["competitors"] if link]),
+        "status": status
+    }
+
+def bulk_serp_research(keywords, location, api_key, job_path, max_workers=4, rate_per_sec=2.0, force_refresh=False):
+    """কিওয়ার্ডগুলো bounded থ্রেড পুলে রিসার্চ করে, প্রতিটি রো শেষ হওয়া মাত্র yield করে আর job ফাইলে append করে।
+    আগের রানে শেষ হওয়া কিওয়ার্ড (job ফাইলে থাকা) আবার কল করা হয় না।"""
+    os.makedirs(os.path.dirname(job_path), exist_ok=True)
+    done = {} if force_refresh else load_serp_job(job_path)
+    for keyword in keywords:
+        if keyword in done:
+            yield {**done[keyword], "status": "resumed"}
+    pending = [k for k in keywords if k not in done]
+
+    limiter = RateLimiter(rate_per_sec)
+    write_lock = threading.Lock()
+
+    def limited_fetch(params):
+        limiter.wait()
+        return fetch_serp_results(params)
+
+    def worker(keyword):
+        try:
+            params = build_serp_params(keyword, location, api_key)
+            results, status = get_serp_cache().get_or_fetch(params, limited_fetch, ttl=location["cache_hours"] * 3600, force_refresh=force_refresh)
+            if "error" in results:
+                return {**serp_row(keyword, summarize_serp_results({}), "error"), "snippet": results["error"]}
+            return serp_row(keyword, summarize_serp_results(results), status)
+        except Exception as e:
+            return {**serp_row(keyword, summarize_serp_results({}), "error"), "snippet": str(e)}
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = [executor.submit(worker, k) for k in pending]
+        for future in as_completed(futures):
+            row = future.result()
+            with write_lock, open(job_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            yield row
+    finally:
+        # consumer আগেই থামলে (rerun/Stop, Ctrl-C) বাকি keyword এর API কল নয়: queue তে থাকাগুলো বাতিল,
+        # যেগুলো শেষ হয়নি সেগুলো পরের resume এ আবার চলবে
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def dataframe_to_parquet(df):
+    """pyarrow/fastparquet ইনস্টল থাকলে Parquet bytes, না থাকলে None"""
+    try:
+        buffer = io.BytesIO()
+        df.to_parquet(buffer, index=False)
+        return buffer.getvalue()
+    except ImportError:
+        return None
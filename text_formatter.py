@@ -0,0 +1,413 @@
+# Formatter ট্যাবের Markdown -> HTML রেন্ডারার (পুরো লেখা আর ব্লক-ক্যাশড incremental)।
+# Streamlit ছাড়া (CLI / cron থেকেও) ব্যবহার করা যায়, তাই app.py র বাইরে আলাদা মডিউলে।
+import re
+import time
+
+# --- Text Formatter ---
+# স্টাইলগুলো মডিউল লেভেলে: প্রতি কলে dict আর opening tag আবার বানাতে হয় না
+FORMATTER_STYLES = {
+    "Modern Clean": {
+        "div": "font-family: 'Inter', 'Segoe UI', sans-serif; line-height: 1.7; color: #333; max-width: 100%;",
+        "h1": "color: #111; font-weight: 800; margin-top: 0.5em; margin-bottom: 0.5em; font-size: 2.2em;",
+        "h2": "color: #111; font-weight: 700; margin-top: 1.5em; border-bottom: 2px solid #f0f0f0; padding-bottom: 10px; font-size: 1.8em;",
+        "h3": "color: #444; font-weight: 600; margin-top: 1.2em; font-size: 1.4em;",
+        "p": "margin-bottom: 1.2em; font-size: 17px; color: #333;",
+        "ul": "margin-bottom: 1.2em; padding-left: 20px;",
+        "ol": "margin-bottom: 1.2em; padding-left: 24px;",
+        "li": "margin-bottom: 8px;",
+        "img": "max-width: 100%; height: auto; border-radius: 8px; margin: 20px 0; display: block;",
+        "strong": "color: #000; font-weight: 700;",
+        "em": "font-style: italic;",
+        "a": "color: #2563eb; text-decoration: underline;",
+        "blockquote": "margin: 1.5em 0; padding: 10px 20px; border-left: 4px solid #2563eb; background: #f8fafc; color: #444;",
+        "code": "font-family: 'SFMono-Regular', Consolas, monospace; background: #f3f4f6; padding: 2px 5px; border-radius: 4px; font-size: 0.9em;",
+        "pre": "font-family: 'SFMono-Regular', Consolas, monospace; background: #1f2937; color: #f9fafb; padding: 16px; border-radius: 8px; overflow-x: auto; font-size: 14px; line-height: 1.5;",
+        "table": "width: 100%; border-collapse: collapse; margin-bottom: 1.2em; font-size: 16px;",
+        "th": "background: #f3f4f6; font-weight: 700; padding: 10px; border: 1px solid #e5e7eb; text-align: left;",
+        "td": "padding: 10px; border: 1px solid #e5e7eb;",
+        "hr": "border: 0; border-top: 1px solid #e5e7eb; margin: 2em 0;"
+    },
+    "Classic Serif": {
+        "div": "font-family: 'Georgia', 'Cambria', serif; line-height: 1.8; color: #2a2a2a; font-size: 18px; max-width: 100%;",
+        "h1": "font-family: 'Georgia', serif; color: #000; margin-top: 40px; font-size: 32px; font-weight: normal;",
+        "h2": "font-family: 'Georgia', serif; color: #000; margin-top: 40px; font-size: 28px; font-weight: normal; border-bottom: 1px solid #ccc; padding-bottom: 5px;",
+        "h3": "font-family: 'Georgia', serif; color: #333; margin-top: 30px; font-style: italic; font-size: 24px;",
+        "p": "margin-bottom: 24px;",
+        "ul": "margin-bottom: 24px; padding-left: 25px;",
+        "ol": "margin-bottom: 24px; padding-left: 30px;",
+        "li": "margin-bottom: 10px;",
+        "img": "max-width: 100%; height: auto; border: 1px solid #ddd; padding: 5px; margin: 20px auto; display: block;",
+        "strong": "font-weight: bold; color: #000;",
+        "em": "font-style: italic;",
+        "a": "color: #8b0000; text-decoration: underline;",
+        "blockquote": "margin: 30px 0; padding: 0 25px; border-left: 3px solid #ccc; font-style: italic; color: #555;",
+        "code": "font-family: 'Courier New', monospace; background: #f5f5f5; padding: 1px 4px; font-size: 0.9em;",
+        "pre": "font-family: 'Courier New', monospace; background: #f5f5f5; border: 1px solid #ddd; padding: 15px; overflow-x: auto; font-size: 15px; line-height: 1.5;",
+        "table": "width: 100%; border-collapse: collapse; margin-bottom: 24px;",
+        "th": "font-weight: bold; padding: 8px 10px; border-bottom: 2px solid #333; text-align: left;",
+        "td": "padding: 8px 10px; border-bottom: 1px solid #ddd;",
+        "hr": "border: 0; border-top: 1px solid #ccc; margin: 40px auto; width: 50%;"
+    },
+    "Magazine Focus": {
+        "div": "font-family: 'Merriweather', serif; line-height: 1.9; color: #222; max-width: 100%; background: #fff; padding: 20px; box-sizing: border-box;",
+        "h1": "font-family: 'Montserrat', sans-serif; text-transform: uppercase; letter-spacing: 1px; color: #2c3e50; margin-top: 20px; font-size: 36px;",
+        "h2": "font-family: 'Montserrat', sans-serif; text-transform: uppercase; letter-spacing: 1px; color: #d35400; border-left: 5px solid #d35400; padding-left: 15px; margin-top: 40px; font-size: 26px;",
+        "h3": "font-family: 'Montserrat', sans-serif; color: #2c3e50; margin-top: 30px; font-size: 22px;",
+        "p": "margin-bottom: 20px; font-size: 18px;",
+        "ul": "list-style-type: square; color: #d35400; margin-bottom: 20px; padding-left: 20px;",
+        "ol": "color: #d35400; margin-bottom: 20px; padding-left: 25px;",
+        "li": "margin-bottom: 10px; color: #222;",
+        "img": "width: 100%; height: auto; margin: 30px 0; box-shadow: 0 4px 15px rgba(0,0,0,0.1);",
+        "strong": "font-weight: bold; color: #222;",
+        "em": "font-style: italic;",
+        "a": "color: #d35400; font-weight: bold; text-decoration: none; border-bottom: 2px solid #d35400;",
+        "blockquote": "margin: 30px 0; padding: 20px 25px; border-left: 5px solid #d35400; background: #fdf2e9; font-size: 20px; font-style: italic;",
+        "code": "font-family: 'Fira Code', Consolas, monospace; background: #f4f4f4; color: #c0392b; padding: 2px 5px; font-size: 0.9em;",
+        "pre": "font-family: 'Fira Code', Consolas, monospace; background: #2c3e50; color: #ecf0f1; padding: 18px; overflow-x: auto; font-size: 14px; line-height: 1.6;",
+        "table": "width: 100%; border-collapse: collapse; margin-bottom: 20px; font-family: 'Montserrat', sans-serif;",
+        "th": "background: #2c3e50; color: #fff; padding: 10px; text-align: left;",
+        "td": "padding: 10px; border-bottom: 1px solid #eee;",
+        "hr": "border: 0; border-top: 3px solid #d35400; margin: 40px 0; width: 80px;"
+    }
+}
+# প্রতিটি স্টাইলের opening tag আগেই তৈরি; "css" এ কাঁচা স্টাইল (img/a তে style এর আগে অন্য attribute বসে)
+FORMATTER_TAGS = {name: {**{tag: f'<{tag} style="{css}">' for tag, css in style.items()}, "css": style} for name, style in FORMATTER_STYLES.items()}
+TEXT_ALIGN_RE = re.compile(r"\s*text-align:\s*[\w-]+;")
+HEADING_RE = re.compile(r"(#{1,6}) (.*)")
+BULLET_RE = re.compile(r"[-*+] (.*)")
+ORDERED_RE = re.compile(r"(\d{1,9})[.)] (.*)")
+IMAGE_LINE_RE = re.compile(r"!\[([^\]]*)\]\(([^)\s]+)\)")
+TABLE_SEPARATOR_RE = re.compile(r"\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?")
+TABLE_CELL_SPLIT_RE = re.compile(r"(?<!\\)\|")
+HR_LINES = {"---", "***", "___"}
+# এই অক্ষরগুলোর কোনোটি দিয়ে শুরু না হলে লাইনটি সরাসরি প্যারাগ্রাফ — বাকি চেকগুলো চালাতেই হয় না
+BLOCK_START_CHARS = frozenset("`#>-*+_|!0123456789")
+# একটাই inline regex: `code` | ![img](src) | [link](href) | **bold** | *italic* | _italic_
+# শুরুর lookahead এর ফলে regex engine trigger অক্ষর ছাড়া অন্য জায়গায় ছয়টি বিকল্প চেষ্টাই করে না
+INLINE_RE = re.compile(
+    r"(?=[`!\[*_])(?:"
+    r"`([^`]+)`"
+    r"|!\[([^\]]*)\]\(([^)\s]+)\)"
+    r"|\[([^\]]+)\]\(([^)\s]+)\)"
+    r"|\*\*(.+?)\*\*"
+    r"|(?<![\w*])\*(?![\s*])(.+?)(?<![\s*])\*(?![\w*])"
+    r"|(?<![\w/])_(?![\s_])(.+?)(?<![\s_])_(?![\w/])"
+    r")"
+)
+CODE_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+def _attr(value):
+    return value.replace('"', "&quot;")
+
+def _render_inline(text, tags):
+    """এক লাইনের inline markup এক পাসে; bold/italic/link এর ভেতরের লেখা আবার inline হিসেবে রেন্ডার হয়"""
+    # বেশিরভাগ লাইনে কোনো markup নেই: চারটি str `in` (C লুপ) একটি regex search এর চেয়ে ~5 গুণ দ্রুত
+    if "*" not in text and "`" not in text and "[" not in text and "_" not in text:
+        return text
+
+    def replace(m):
+        code, alt, src, label, href, bold, star_em, underscore_em = m.groups()
+        if code is not None:
+            return f'{tags["code"]}{code.translate(CODE_ESCAPES)}</code>'
+        if src is not None:
+            return f'<img src="{_attr(src)}" alt="{_attr(alt)}" style="{tags["css"]["img"]}">'
+        if href is not None:
+            return f'<a href="{_attr(href)}" style="{tags["css"]["a"]}">{_render_inline(label, tags)}</a>'
+        if bold is not None:
+            return f'{tags["strong"]}{_render_inline(bold, tags)}</strong>'
+        return f'{tags["em"]}{_render_inline(star_em or underscore_em, tags)}</em>'
+
+    return INLINE_RE.sub(replace, text)
+
+def _table_cells(line):
+    line = line.strip()
+    if line.startswith("|"):
+        line = line[1:]
+    if line.endswith("|") and not line.endswith("\\|"):
+        line = line[:-1]
+    return [cell.strip().replace("\\|", "|") for cell in TABLE_CELL_SPLIT_RE.split(line)]
+
+def _cell_tag(tags, tag, align):
+    """কলামের alignment সহ <th>/<td>। inline CSS আলাদা align attribute কে override করে, তাই style এর ভেতরেই।"""
+    if not align:
+        return tags[tag]
+    css = TEXT_ALIGN_RE.sub("", tags["css"][tag]).rstrip()
+    return f'<{tag} style="{css} text-align: {align};">'
+
+def _render_blocks(lines, tags, out):
+    """লাইন ধরে এক পাসের tokenizer: প্রতিটি লাইন একবারই দেখা হয়, প্রথম অক্ষর দেখে সরাসরি ঠিক ব্লকে যায়,
+    আর আউটপুট out লিস্টে append হয়"""
+    emit, inline = out.append, _render_inline
+    p_open = tags["p"]
+    i, n = 0, len(lines)
+    while i < n:
+        line = lines[i].strip()
+        i += 1
+        if not line:
+            continue
+        first = line[0]
+        if first not in BLOCK_START_CHARS:
+            emit(f'{p_open}{inline(line, tags)}</p>\n')
+            continue
+
+        if first == "`" and line.startswith("```"):
+            code = []
+            while i < n and not lines[i].strip().startswith("```"):
+                code.append(lines[i].rstrip())
+                i += 1
+            i += 1
+            code_text = "\n".join(code).translate(CODE_ESCAPES)
+            emit(f'{tags["pre"]}<code>{code_text}</code></pre>\n')
+            continue
+
+        if first == "#":
+            m = HEADING_RE.match(line)
+            if m:
+                level = min(len(m.group(1)), 3)
+                emit(f'{tags[f"h{level}"]}{inline(m.group(2), tags)}</h{level}>\n')
+                continue
+
+        elif first == ">":
+            quoted = [line[1:]]
+            while i < n:
+                stripped = lines[i].strip()
+                if not stripped.startswith(">"):
+                    break
+                quoted.append(stripped[1:])
+                i += 1
+            emit(f'{tags["blockquote"]}\n')
+            _render_blocks(quoted, tags, out)
+            emit("</blockquote>\n")
+            continue
+
+        elif first == "|":
+            if i < n and TABLE_SEPARATOR_RE.fullmatch(lines[i].strip()):
+                aligns = []
+                for cell in _table_cells(lines[i]):
+                    left, right = cell.startswith(":"), cell.endswith(":")
+                    aligns.append("center" if left and right else ("right" if right else ("left" if left else "")))
+                th_tags = [_cell_tag(tags, "th", align) for align in aligns]
+                td_tags = [_cell_tag(tags, "td", align) for align in aligns]
+                emit(f'{tags["table"]}\n<thead><tr>')
+                out.extend(f'{th_tags[c] if c < len(th_tags) else tags["th"]}{inline(cell, tags)}</th>' for c, cell in enumerate(_table_cells(line)))
+                emit("</tr></thead>\n<tbody>\n")
+                i += 1
+                while i < n and lines[i].strip().startswith("|"):
+                    emit("<tr>")
+                    out.extend(f'{td_tags[c] if c < len(td_tags) else tags["td"]}{inline(cell, tags)}</td>' for c, cell in enumerate(_table_cells(lines[i])))
+                    emit("</tr>\n")
+                    i += 1
+                emit("</tbody></table>\n")
+                continue
+
+        elif first == "!":
+            m = IMAGE_LINE_RE.fullmatch(line)
+            if m:
+                emit(f'<img src="{_attr(m.group(2))}" alt="{_attr(m.group(1))}" style="{tags["css"]["img"]}">\n')
+                continue
+
+        elif line in HR_LINES:
+            emit(f'{tags["hr"]}\n')
+            continue
+
+        else:
+            # - * + বা 1. 1) লিস্ট: একই ধরনের পরপর লাইনগুলো একটি লিস্ট
+            # প্রতিটি আইটেম লাইন একবারই match হয় (প্রথম লাইনের match টিই প্রথম আইটেম)
+            bullet = first in "-*+" and BULLET_RE.match(line)
+            m = bullet or (first.isdigit() and ORDERED_RE.match(line))
+            if m:
+                item_re = BULLET_RE if bullet else ORDERED_RE
+                if bullet:
+                    emit(f'{tags["ul"]}\n')
+                else:
+                    start = int(m.group(1))
+                    emit(f'{tags["ol"][:-1]} start="{start}">\n' if start != 1 else f'{tags["ol"]}\n')
+                li_open = tags["li"]
+                while m:
+                    emit(f'{li_open}{inline(m.group(m.lastindex), tags)}</li>\n')
+                    m = item_re.match(lines[i].strip()) if i < n else None
+                    if m:
+                        i += 1
+                emit("</ul>\n" if bullet else "</ol>\n")
+                continue
+
+        emit(f'{p_open}{inline(line, tags)}</p>\n')
+    return out
+
+def format_text_to_html(text, style_name):
+    """Markdown লেখা -> inline-style HTML। সমর্থিত: # হেডার, - / 1. লিস্ট, ![ছবি](), [লিংক](), **bold**, *italic*,
+    > quote, `code`, ``` code block, | টেবিল |, ---। প্রতিটি লাইন একবারই প্রসেস হয়, তাই সময় লেখার দৈর্ঘ্যের সমানুপাতিক।"""
+    tags = FORMATTER_TAGS.get(style_name, FORMATTER_TAGS["Modern Clean"])
+    out = [f'{tags["div"]}\n']
+    _render_blocks(text.split("\n"), tags, out)
+    out.append("</div>")
+    return "".join(out)
+
+# [NEW] Incremental Formatting
+BLANK_LINES_RE = re.compile(r"\n(?:[ \t\r\f\v]*\n)+")
+
+def split_format_blocks(text):
+    """ফাঁকা লাইনে ভাগ করা ব্লক (``` code block এর ভেতরের ফাঁকা লাইনে নয়)। ফাঁকা লাইনে লিস্ট/quote/টেবিল এমনিতেই
+    শেষ হয়, তাই ব্লকগুলো আলাদা রেন্ডার করে জোড়া দিলে পুরো লেখা একসাথে রেন্ডারের সমান HTML হয়।"""
+    if "```" not in text:
+        return [block for block in BLANK_LINES_RE.split(text) if block.strip()]
+    blocks, current, in_fence = [], [], False
+    for line in text.split("\n"):
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            in_fence = not in_fence
+        elif not stripped and not in_fence:
+            if current:
+                blocks.append("\n".join(current))
+                current = []
+            continue
+        current.append(line)
+    if current:
+        blocks.append("\n".join(current))
+    return blocks
+
+class IncrementalFormatter:
+    """format_text_to_html এর মতই আউটপুট, কিন্তু আগের রেন্ডারের প্রতিটি ব্লকের HTML (স্টাইল + ব্লক, key হিসেবে
+    ব্লকের hash) মনে রাখে — পরের rerun এ শুধু নতুন বা বদলানো ব্লকগুলো রেন্ডার হয়। ক্যাশে শুধু বর্তমান লেখার ব্লক
+    থাকে, তাই এটি লেখার চেয়ে বড় হয় না।"""
+
+    def __init__(self):
+        self.blocks = {}
+
+    def render(self, text, style_name):
+        """Returns (html, stats)"""
+        start = time.perf_counter()
+        if style_name not in FORMATTER_TAGS:
+            style_name = "Modern Clean"
+        tags = FORMATTER_TAGS[style_name]
+        previous, current = self.blocks, {}
+        out = [f'{tags["div"]}\n']
+        blocks = split_format_blocks(text)
+        for block in blocks:
+            key = (style_name, block)
+            html = previous.get(key)
+            if html is None:
+                html = current.get(key) or "".join(_render_blocks(block.split("\n"), tags, []))
+            current[key] = html
+            out.append(html)
+        out.append("</div>")
+        rendered = sum(1 for key in current if key not in previous)
+        self.blocks = current
+        html = "".join(out)
+        return html, {
+            "blocks": len(blocks),
+            "rendered": rendered,
+            "reused": len(blocks) - rendered,
+            "ms": (time.perf_counter() - start) * 1000,
+            "kb": len(html.encode("utf-8")) / 1024
+        }
+
+def benchmark_text_formatter(words=50000, style_name="Modern Clean", repeat=3):
+    """পুরনো আর নতুন ফরম্যাটারের সময় তুলনা, এমন লেখায় যা পুরনোটাও বোঝে (তাই আউটপুট মিলিয়েও দেখা যায়)"""
+    section = ("## Section Heading\n\nThis paragraph has **bold words** and plain text about the product and how it is used every day.\n"
+               "- First benefit of the product\n- Second benefit of the product\n\n![Product photo](https://example.com/photo.jpg)\n"
+               "Another paragraph closes the section with a short summary of the points above.\n\n")
+    section_words = len(section.split())
+    results = []
+    for size in (words // 10, words):
+        text = "# Article Title\n\n" + section * max(1, size // section_words)
+        timings, outputs = {}, {}
+        for name, formatter in (("legacy", format_text_to_html_legacy), ("new", format_text_to_html)):
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                outputs[name] = formatter(text, style_name)
+                best = min(best, time.perf_counter() - start)
+            timings[name] = best
+        results.append({
+            "words": len(text.split()),
+            "legacy_ms": timings["legacy"] * 1000,
+            "new_ms": timings["new"] * 1000,
+            "speedup": timings["legacy"] / timings["new"] if timings["new"] else 0.0,
+            "identical": outputs["legacy"] == outputs["new"]
+        })
+    return results
+
+def format_text_to_html_legacy(text, style_name):
+    # পুরনো ফরম্যাটার — শুধু benchmark এ নতুনটির সাথে তুলনার জন্য রাখা হয়েছে
+    styles = {
+        "Modern Clean": {
+            "div": "font-family: 'Inter', 'Segoe UI', sans-serif; line-height: 1.7; color: #333; max-width: 100%;",
+            "h1": "color: #111; font-weight: 800; margin-top: 0.5em; margin-bottom: 0.5em; font-size: 2.2em;",
+            "h2": "color: #111; font-weight: 700; margin-top: 1.5em; border-bottom: 2px solid #f0f0f0; padding-bottom: 10px; font-size: 1.8em;",
+            "h3": "color: #444; font-weight: 600; margin-top: 1.2em; font-size: 1.4em;",
+            "p": "margin-bottom: 1.2em; font-size: 17px; color: #333;",
+            "ul": "margin-bottom: 1.2em; padding-left: 20px;",
+            "li": "margin-bottom: 8px;",
+            "img": "max-width: 100%; height: auto; border-radius: 8px; margin: 20px 0; display: block;",
+            "strong": "color: #000; font-weight: 700;"
+        },
+        "Classic Serif": {
+            "div": "font-family: 'Georgia', 'Cambria', serif; line-height: 1.8; color: #2a2a2a; font-size: 18px; max-width: 100%;",
+            "h1": "font-family: 'Georgia', serif; color: #000; margin-top: 40px; font-size: 32px; font-weight: normal;",
+            "h2": "font-family: 'Georgia', serif; color: #000; margin-top: 40px; font-size: 28px; font-weight: normal; border-bottom: 1px solid #ccc; padding-bottom: 5px;",
+            "h3": "font-family: 'Georgia', serif; color: #333; margin-top: 30px; font-style: italic; font-size: 24px;",
+            "p": "margin-bottom: 24px;",
+            "ul": "margin-bottom: 24px; padding-left: 25px;",
+            "li": "margin-bottom: 10px;",
+            "img": "max-width: 100%; height: auto; border: 1px solid #ddd; padding: 5px; margin: 20px auto; display: block;",
+            "strong": "font-weight: bold; color: #000;"
+        },
+        "Magazine Focus": {
+            "div": "font-family: 'Merriweather', serif; line-height: 1.9; color: #222; max-width: 100%; background: #fff; padding: 20px; box-sizing: border-box;",
+            "h1": "font-family: 'Montserrat', sans-serif; text-transform: uppercase; letter-spacing: 1px; color: #2c3e50; margin-top: 20px; font-size: 36px;",
+            "h2": "font-family: 'Montserrat', sans-serif; text-transform: uppercase; letter-spacing: 1px; color: #d35400; border-left: 5px solid #d35400; padding-left: 15px; margin-top: 40px; font-size: 26px;",
+            "h3": "font-family: 'Montserrat', sans-serif; color: #2c3e50; margin-top: 30px; font-size: 22px;",
+            "p": "margin-bottom: 20px; font-size: 18px;",
+            "ul": "list-style-type: square; color: #d35400; margin-bottom: 20px; padding-left: 20px;",
+            "li": "margin-bottom: 10px; color: #222;",
+            "img": "width: 100%; height: auto; margin: 30px 0; box-shadow: 0 4px 15px rgba(0,0,0,0.1);",
+            "strong": "font-weight: bold; color: #222;"
+        }
+    }
+    
+    current_style = styles.get(style_name, styles["Modern Clean"])
+    
+    html_content = f'<div style="{current_style["div"]}">\n'
+    
+    lines = text.split('\n')
+    in_list = False
+    
+    for line in lines:
+        line = line.strip()
+        if not line:
+            if in_list:
+                html_content += "</ul>\n"
+                in_list = False
+            continue
+            
+        if line.startswith('### '):
+            html_content += f'<h3 style="{current_style["h3"]}">{line[4:]}</h3>\n'
+        elif line.startswith('## '):
+            html_content += f'<h2 style="{current_style["h2"]}">{line[3:]}</h2>\n'
+        elif line.startswith('# '):
+            html_content += f'<h1 style="{current_style["h1"]}">{line[2:]}</h1>\n'
+        elif line.startswith('- ') or line.startswith('* '):
+            if not in_list:
+                html_content += f'<ul style="{current_style["ul"]}">\n'
+                in_list = True
+            html_content += f'<li style="{current_style["li"]}">{line[2:]}</li>\n'
+        elif line.startswith('![') and '](' in line:
+            try:
+                alt = line.split('![')[1].split('](')[0]
+                src = line.split('](')[1].split(')')[0]
+                html_content += f'<img src="{src}" alt="{alt}" style="{current_style["img"]}">\n'
+            except:
+                html_content += f'<p style="{current_style["p"]}">{line}</p>\n'
+        else:
+            if in_list:
+                html_content += "</ul>\n"
+                in_list = False
+            line = re.sub(r'\*\*(.*?)\*\*', f'<strong style="{current_style["strong"]}">\\1</strong>', line)
+            html_content += f'<p style="{current_style["p"]}">{line}</p>\n'
+            
+    if in_list:
+        html_content += "</ul>\n"
+
+    html_content += "</div>"
+    return html_content
@@ -0,0 +1,247 @@
+# Smart Writer ট্যাবের আর্টিকেল টেমপ্লেট, batch worker আর planner ক্লাস্টার থেকে batch ড্রাফট (app.py আর CLI দুজনেই)।
+# ocr_engine এর মতই: batch রেন্ডার process pool এ চলে, তাই Streamlit স্ক্রিপ্টের বাইরে আলাদা মডিউলে।
+import re
+import os
+import math
+import time
+import string
+from concurrent.futures import as_completed
+
+from planner_core import DEDUP_STOPWORDS, normalize_keyword
+from serp_tools import build_serp_params, get_serp_cache
+from text_formatter import format_text_to_html
+
+WRITER_POOL_MIN = 2000  # সরাসরি রেন্ডার ~২০k ড্রাফট/সেকেন্ড; এর কম ড্রাফটে process pool এ পাঠানোর (pickle) খরচই বেশি
+WRITER_FAQ_LIMIT = 5
+
+ARTICLE_TEMPLATE = """# {product} Review: The Best Choice for {keyword}?
+
+## Introduction
+Finding the **{keyword}** can be a daunting task, especially with so many options available in the market today. Whether you are looking for comfort, durability, or style, making the right choice is crucial.
+
+Today, we are diving deep into the **{product}**. This product has been gaining attention among {audience} for its impressive build quality and features. In this review, we will analyze why this might be the perfect solution for your needs.
+
+---
+
+## At a Glance
+* **Product Name:** {product}
+* **Rating:** {rating}/5 Stars
+* **Price Category:** {price_type}
+* **Best For:** {audience} looking for {keyword}
+
+---
+
+## In-Depth Features Analysis
+Why should you consider buying the {product}? Let's look at the key features that set it apart from the competition.
+
+{expanded_features}
+
+These features combined make the {product} a top contender in the {keyword} category.
+
+---
+
+## Pros and Cons
+No product is perfect. Here is a transparent look at what we liked and what could be improved.
+
+### ✅ What We Like (Pros)
+{pros_section}
+
+### ❌ What We Don't Like (Cons)
+{cons_section}
+
+---
+
+## Who is this for?
+If you are **{audience}**, then the **{product}** is designed specifically with you in mind. Its {price_type} price point makes it an attractive option without compromising on quality.
+
+If you prioritize {priority_1} and {priority_2}, this is an investment worth making.
+
+---
+{extra_sections}
+## Final Verdict
+To conclude, the **{product}** offers excellent value for money. With a rating of **{rating}/5**, it delivers on its promises.
+
+For anyone searching for a reliable **{keyword}**, we highly recommend checking this out. It checks all the boxes for comfort, usability, and durability.
+
+**[Check Latest Price of {product} on Amazon]({link})**"""
+
+# টেমপ্লেট একবারই parse হয়: (লিটারাল, ফিল্ড) জোড়া, তাই প্রতিটি রেন্ডার শুধু একটি join
+COMPILED_ARTICLE = tuple((literal, field) for literal, field, _, _ in string.Formatter().parse(ARTICLE_TEMPLATE))
+FEATURE_STARTERS = (
+    "First and foremost, the **{product}** comes with {feature}.",
+    "Another significant aspect is the {feature}, which makes it stand out.",
+    "Users will also appreciate the {feature}, ensuring a great experience.",
+    "Furthermore, the inclusion of {feature} adds tremendous value."
+)
+SUPPORTING_STARTERS = (
+    "Many readers searching for **{keyword}** want to know how the {product} fits their needs.",
+    "If **{keyword}** is on your list, the {product} is worth a close look.",
+    "When it comes to **{keyword}**, the {product} holds its own against pricier options."
+)
+
+
+def expand_features(product, features, audience):
+    """প্রতিটি ফিচার ঘুরিয়ে ফিরিয়ে একটি বাক্যে (Sentence Expansion)"""
+    return "\n".join(
+        f"- {FEATURE_STARTERS[i % len(FEATURE_STARTERS)].format(product=product, feature=feature)} "
+        f"This is particularly useful for {audience} because it solves common daily struggles."
+        for i, feature in enumerate(features)
+    ) + ("\n" if features else "")
+
+
+def extra_sections(draft):
+    """ক্লাস্টারের supporting কিওয়ার্ড আর ক্যাশড SERP FAQ থেকে বাড়তি সেকশন (না থাকলে খালি)"""
+    parts = []
+    supporting = draft.get("supporting") or []
+    if supporting:
+        parts.append("\n## More Things to Know\n")
+        parts.extend(f"### {keyword[:1].upper()}{keyword[1:]}\n"
+                     f"{SUPPORTING_STARTERS[i % len(SUPPORTING_STARTERS)].format(keyword=keyword, product=draft['product'])}\n"
+                     for i, keyword in enumerate(supporting))
+        parts.append("\n---\n")
+    faqs = draft.get("faqs") or []
+    if faqs:
+        parts.append("\n## Frequently Asked Questions\n")
+        parts.extend(f"### {question}\n{answer or 'Add your answer here.'}\n" for question, answer in faqs)
+        parts.append("\n---\n")
+    return "".join(parts)
+
+
+def render_draft(draft):
+    """draft: product, keyword, audience, rating, price_type, features, pros, cons (+ ঐচ্ছিক supporting, faqs, link)।
+    Markdown ফেরত দেয়। audience কী না থাকলেই শুধু "everyday users"; ফাঁকা দিলে ফাঁকাই থাকে (একক ড্রাফট ফর্মের মতো)।"""
+    features = draft.get("features") or []
+    audience = draft.get("audience", "everyday users")
+    context = {
+        "product": draft["product"],
+        "keyword": draft["keyword"],
+        "audience": audience,
+        "rating": draft.get("rating", 4.5),
+        "price_type": draft.get("price_type") or "Mid-Range",
+        "link": draft.get("link") or "#",
+        "expanded_features": expand_features(draft["product"], features, audience),
+        "pros_section": "\n".join(f"* **{p}**: This is a major advantage for daily use." for p in draft.get("pros") or []),
+        "cons_section": "\n".join(f"* {c}: While not a dealbreaker, it is something to keep in mind." for c in draft.get("cons") or []),
+        "priority_1": features[0] if features else "quality",
+        "priority_2": features[1] if len(features) > 1 else "performance",
+        "extra_sections": extra_sections(draft)
+    }
+    return "".join(literal + (str(context[field]) if field is not None else "") for literal, field in COMPILED_ARTICLE)
+
+
+def render_drafts(drafts):
+    """Process pool worker: কয়েকটি ড্রাফট একসাথে রেন্ডার করে (IPC খরচ কমাতে)"""
+    return [render_draft(draft) for draft in drafts]
+
+
+# --- Batch drafts ---
+def writer_product_from_scrape(item):
+    """Amazon স্ক্র্যাপ ডেটা -> ড্রাফটের প্রোডাক্ট ফিল্ড (নাম, ফিচার, pros, লিংক)"""
+    title = item.get('title', '')
+    name = re.split(r"\s[-–|]\s|,", title)[0].strip()[:70] or title[:70]
+    features = []
+    for bullet in item.get('bullet_points') or []:
+        # "LIGHTWEIGHT DESIGN: ..." ধরনের bullet এর হেডিংটুকুই ফিচার
+        head = bullet.split(':')[0] if ':' in bullet[:80] else bullet[:100]
+        head = head.strip().rstrip('.')
+        if head:
+            features.append(head.lower() if head.isupper() else head)
+    return {"product": name, "features": features[:5], "pros": features[:2], "link": item.get('url', '')}
+
+
+def match_products_to_clusters(clusters, products):
+    """প্রতিটি ক্লাস্টারের জন্য যে প্রোডাক্টের টাইটেলের সাথে মূল কিওয়ার্ডের সবচেয়ে বেশি শব্দ মেলে (না মিললে None)"""
+    product_tokens = [set(normalize_keyword(p['product']).split()) - DEDUP_STOPWORDS for p in products]
+    matches = []
+    for cluster in clusters:
+        tokens = set(normalize_keyword(cluster['label']).split()) - DEDUP_STOPWORDS
+        scores = [len(tokens & pt) for pt in product_tokens]
+        best = max(range(len(scores)), key=scores.__getitem__) if scores else None
+        matches.append(products[best] if best is not None and scores[best] else None)
+    return matches
+
+
+def cached_serp_faqs(keyword, location, limit=WRITER_FAQ_LIMIT):
+    """SEO ট্যাবে আগে রিসার্চ করা কিওয়ার্ডের ক্যাশড "People also ask" (কোনো API কল হয় না)"""
+    results = get_serp_cache().lookup(build_serp_params(keyword, location, ""))
+    if not results:
+        return []
+    return [(q['question'], q.get('snippet', '')) for q in results.get("related_questions", [])[:limit] if q.get('question')]
+
+
+def build_batch_drafts(clusters, products=None, location=None, audience="", price_type="Mid-Range", rating=4.5, max_supporting=6):
+    """planner ক্লাস্টার (মূল কিওয়ার্ড + supporting) থেকে ড্রাফট ইনপুট। products দিলে মিলিয়ে প্রোডাক্ট ডেটা,
+    location দিলে ক্যাশড SERP FAQ যোগ হয়।"""
+    matched = match_products_to_clusters(clusters, products) if products else [None] * len(clusters)
+    drafts = []
+    for cluster, product in zip(clusters, matched):
+        label = cluster['label']
+        main = normalize_keyword(label)
+        draft = {
+            "keyword": label,
+            "product": label.title(),
+            "audience": audience or "everyday users",
+            "price_type": price_type,
+            "rating": rating,
+            "supporting": [k for k in cluster['keywords'] if normalize_keyword(k) != main][:max_supporting],
+            "faqs": cached_serp_faqs(label, location) if location else []
+        }
+        if product:
+            draft.update(product)
+        drafts.append(draft)
+    return drafts
+
+
+def generate_drafts(drafts, pool=None, use_pool=None, workers=None):
+    """ড্রাফটগুলো chunk করে process pool এ রেন্ডার; শেষ হওয়া মাত্র (index, markdown) yield করে।
+    pool না দিলে বা অল্প ড্রাফট হলে (WRITER_POOL_MIN এর কম) সরাসরি এখানেই। workers: pool এর worker সংখ্যা
+    (chunk সাইজের জন্য; না দিলে CPU সংখ্যা)।"""
+    if use_pool is None:
+        use_pool = len(drafts) >= WRITER_POOL_MIN
+    if pool is None or not use_pool:
+        for index, draft in enumerate(drafts):
+            yield index, render_draft(draft)
+        return
+    workers = workers or os.cpu_count() or 2
+    chunk = max(1, math.ceil(len(drafts) / (workers * 4)))
+    futures = {pool.submit(render_drafts, drafts[start:start + chunk]): start for start in range(0, len(drafts), chunk)}
+    for future in as_completed(futures):
+        start = futures[future]
+        for offset, markdown in enumerate(future.result()):
+            yield start + offset, markdown
+
+
+def build_drafts_bundle(drafts, markdowns, style_name=None):
+    """প্রতিটি ড্রাফটের .md (আর style দিলে ফরম্যাট করা .html) ফাইলসহ ZIP"""
+    from affiliate_tools import build_articles_zip  # pandas নির্ভর মডিউল, শুধু ZIP বানানোর সময়
+    articles = {}
+    for draft, markdown in zip(drafts, markdowns):
+        files = {"md": markdown}
+        if style_name:
+            files["html"] = format_text_to_html(markdown, style_name)
+        articles[draft['keyword']] = files
+    return build_articles_zip(articles)
+
+
+def benchmark_writer_drafts(pool, count=1000, workers=None):
+    """একই ড্রাফটগুলো সরাসরি আর process pool এ রেন্ডার করে drafts/sec তুলনা"""
+    drafts = [{
+        "keyword": f"best walking cane model {i}",
+        "product": f"Hugo Adjustable Cane {i}",
+        "audience": "seniors",
+        "rating": 4.5,
+        "price_type": "Mid-Range",
+        "features": ["lightweight aluminum body", "ergonomic cushion handle", "adjustable height settings", "non-slip rubber tip"],
+        "pros": ["Easy to carry", "Very durable"],
+        "cons": ["Limited color options"],
+        "supporting": [f"walking cane for seniors {i}", f"adjustable cane {i}", f"folding cane {i}"],
+        "faqs": [("Is a cane good for balance?", "Yes, a cane widens your base of support.")]
+    } for i in range(count)]
+    results = []
+    workers = workers or os.cpu_count() or 2
+    for label, use_pool in (("direct", False), (f"process pool ({workers} workers)", True)):
+        start = time.perf_counter()
+        words = sum(len(markdown.split()) for _, markdown in generate_drafts(drafts, pool, use_pool=use_pool, workers=workers))
+        elapsed = time.perf_counter() - start
+        results.append({"mode": label, "drafts": count, "seconds": elapsed, "drafts_per_sec": count / elapsed if elapsed else 0.0, "words": words})
+    return results